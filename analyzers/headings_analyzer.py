@@ -2,6 +2,10 @@ import re
 from bs4 import BeautifulSoup
 from config.settings import HIDDEN_CSS_CLASSES, INVISIBLE_COLORS, HIDDEN_STYLES, SUSPICIOUS_POSITIONING, RGB_LIGHT_THRESHOLD
 from utils.constants import HIERARCHY_MESSAGES, PROBLEM_TYPE_EMPTY, PROBLEM_TYPE_HIDDEN, GRAVITY_CRITICAL, GRAVITY_MEDIUM
+from utils.dom_visitor import visit_once
+
+
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
 
 
 class HeadingsAnalyzer:
@@ -14,6 +18,13 @@ class HeadingsAnalyzer:
     
     def analyze_hierarchy_corrected(self, soup, url):
         """🔥 CORRIGIDO: Usa niveis_todos para detectar saltos reais de hierarquia"""
+        return self.analyze_hierarchy_from_headings(soup.find_all(HEADING_TAGS), url)
+    
+    def analyze_hierarchy_from_headings(self, headings, url):
+        """🚶 Hierarquia a partir dos headings já coletados
+        
+        ``headings``: elementos h1..h6 em ordem do documento (coletados pelo visitor).
+        """
         hierarchy_info = {
             'hierarquia_correta': True,
             'problemas_hierarquia': [],
@@ -29,8 +40,6 @@ class HeadingsAnalyzer:
         }
         
         try:
-            headings = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-            
             if not headings:
                 hierarchy_info['problemas_hierarquia'].append(HIERARCHY_MESSAGES['no_headings'])
                 hierarchy_info['heading_issues'].append('Sem headings')
@@ -319,17 +328,66 @@ class HeadingsAnalyzer:
             return h1_tag.get_text().strip()
         return ''
     
+    def get_h1_text_from_headings(self, headings):
+        """Texto do primeiro H1 entre os headings já coletados"""
+        for heading in headings:
+            if heading.name == 'h1':
+                return heading.get_text().strip()
+        return ''
+    
+    def visit_headings(self, visitor, url, head_only=False):
+        """🚶 Inscreve os headings no visitor da página; devolve a função que monta as métricas
+        
+        Com ``head_only`` só o primeiro H1 interessa (ver ``analyze_first_h1``).
+        """
+        if head_only:
+            h1s = visitor.collect(tags=('h1',))
+            return lambda: self._first_h1_metrics(h1s)
+        
+        headings = visitor.collect(tags=HEADING_TAGS)
+        return lambda: self._all_headings_metrics(headings, url)
+    
     def analyze_all_headings(self, soup, url):
         """Método principal de análise completa"""
-        hierarchy_info = self.analyze_hierarchy_corrected(soup, url)
+        return visit_once(soup, lambda visitor: self.visit_headings(visitor, url))
+    
+    def analyze_first_h1(self, soup, url):
+        """⚡ Modo head-only: só o primeiro H1 (o resto da página não foi baixado)
+        
+        Hierarquia, H1 múltiplo e headings ocultos dependem da página inteira e
+        não são avaliados.
+        """
+        return visit_once(soup, lambda visitor: self.visit_headings(visitor, url, head_only=True))
+    
+    def _all_headings_metrics(self, headings, url):
+        hierarchy_info = self.analyze_hierarchy_from_headings(headings, url)
         
         metrics = self.extract_heading_metrics(hierarchy_info)
         
-        metrics['h1_text'] = self.get_h1_text(soup)
+        metrics['h1_text'] = self.get_h1_text_from_headings(headings)
         
         metrics['headings_problematicos'] = hierarchy_info.get('headings_problematicos', [])
         
         return metrics
+    
+    def _first_h1_metrics(self, h1s):
+        h1_text = self.get_h1_text_from_headings(h1s)
+        h1_found = bool(h1s)
+        
+        hierarchy_info = {
+            'h1_count': int(h1_found),
+            'h1_ausente': not h1_found
+        }
+        if not h1_found:
+            hierarchy_info['problemas_hierarquia'] = [HIERARCHY_MESSAGES['h1_absent']]
+            hierarchy_info['heading_issues'] = ['H1 ausente']
+            hierarchy_info['total_problemas'] = 1
+        
+        metrics = self.extract_heading_metrics(hierarchy_info)
+        metrics['h1_text'] = h1_text
+        metrics['headings_problematicos'] = []
+        
+        return metrics
 
 
 class HeadingsScoreCalculator:
@@ -435,6 +493,8 @@ class HeadingsReportGenerator:
 
 def test_hierarchy_fix():
     """🧪 Teste específico para verificar a correção da hierarquia"""
+    from core.parser_backend import parse_html, resolve_parser_backend
+    
     print("🧪 TESTANDO CORREÇÃO DE HIERARQUIA (niveis_todos)")
     print("=" * 60)
     
@@ -453,7 +513,7 @@ def test_hierarchy_fix():
     </html>
     """
     
-    soup = BeautifulSoup(html_test, 'html.parser')
+    soup = parse_html(html_test, resolve_parser_backend())
     analyzer = HeadingsAnalyzer({'detect_invisible_colors': True})
     
     resultado = analyzer.analyze_all_headings(soup, "https://test.com")
@@ -498,6 +558,8 @@ def test_hierarchy_fix():
 
 def test_simple_jump():
     """🧪 Teste simples: H2 direto para H6"""
+    from core.parser_backend import parse_html, resolve_parser_backend
+    
     print("\n" + "="*60)
     print("🧪 TESTE SIMPLES: H2 → H6")
     print("="*60)
@@ -512,7 +574,7 @@ def test_simple_jump():
     </html>
     """
     
-    soup = BeautifulSoup(html_simple, 'html.parser')
+    soup = parse_html(html_simple, resolve_parser_backend())
     analyzer = HeadingsAnalyzer()
     
     resultado = analyzer.analyze_all_headings(soup, "https://test.com")
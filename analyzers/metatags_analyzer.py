@@ -12,6 +12,11 @@ from utils.constants import (
     STATUS_OK, STATUS_ABSENT, STATUS_TOO_SHORT, STATUS_TOO_LONG,
     MSG_ANALYSIS_START, MSG_ANALYSIS_COMPLETE
 )
+from utils.stats import StatsCollector
+from utils.dom_visitor import visit_once, first_with_attr
+
+
+METATAGS_COUNTERS = ['urls_processadas', 'titles_analisados', 'descriptions_analisadas', 'duplicados_encontrados']
 
 
 class MetatagsAnalyzer:
@@ -28,49 +33,96 @@ class MetatagsAnalyzer:
         self.titles_encontrados = {}
         self.descriptions_encontradas = {}
         
-        self.stats = {
-            'urls_processadas': 0,
-            'titles_analisados': 0,
-            'descriptions_analisadas': 0,
-            'duplicados_encontrados': 0
-        }
+        self.stats = StatsCollector(METATAGS_COUNTERS)
     
     def analyze(self, soup, url):
         """🎯 Método principal que integra análises de metatags e headings"""
+        resultado = self.analyze_page(soup, url)
+        
+        if not resultado.get('processed'):
+            return resultado
+        
+        return self.finalize(resultado, url)
+    
+    def analyze_page(self, soup, url, head_only=False):
+        """📄 Parte por página da análise: só depende do soup (pode rodar em outro processo)
+        
+        Duplicados, score e problemas críticos dependem do histórico do crawl e
+        ficam para ``finalize``, executado no processo principal. Com
+        ``head_only`` (página baixada até o primeiro H1) os headings se
+        resumem ao H1.
+        """
+        return visit_once(soup, lambda visitor: self.visit_page(visitor, url, head_only))
+    
+    def visit_page(self, visitor, url, head_only=False):
+        """🚶 Inscreve headings, title, metas e links no visitor; devolve a função que monta a análise"""
+        finish_headings = self.headings_analyzer.visit_headings(visitor, url, head_only)
+        elements = {
+            'title': visitor.collect(tags=('title',)),
+            'meta': visitor.collect(tags=('meta',), attrs=('name', 'property')),
+            'link': visitor.collect(tags=('link',), attrs=('rel',))
+        }
+        
+        def finish():
+            try:
+                resultado = {
+                    'url': url,
+                    'processed': True
+                }
+                
+                # 🔥 1. ANÁLISE DE HEADINGS (COM TODAS AS CORREÇÕES)
+                resultado.update(finish_headings())
+                
+                # 2. ANÁLISE DE TITLE
+                title_data = self._analyze_title(elements, url)
+                resultado.update(title_data)
+                
+                # 3. ANÁLISE DE DESCRIPTION
+                description_data = self._analyze_description(elements, url)
+                resultado.update(description_data)
+                
+                # 4. OUTRAS METATAGS
+                other_meta_data = self._analyze_other_metatags(elements, url)
+                resultado.update(other_meta_data)
+                
+                return resultado
+                
+            except Exception as e:
+                print(f"Erro analisando {url}: {e}")
+                return self._create_error_result(url, str(e))
+        
+        return finish
+    
+    def restore(self, resultado, url=None):
+        """♻️ Re-registra uma página já finalizada (resume de crawl) no histórico de duplicados"""
+        url = url or resultado.get('url')
+        self._track_title_duplicate(resultado.get('title', ''), url)
+        self._track_description_duplicate(resultado.get('meta_description', ''), url)
+        
+        self.stats.incr('titles_analisados')
+        self.stats.incr('descriptions_analisadas')
+        self.stats.incr('urls_processadas')
+    
+    def finalize(self, resultado, url):
+        """🔗 Parte com estado: duplicados, score, problemas e campos do Excel"""
         try:
-            resultado = {
-                'url': url,
-                'processed': True
-            }
-            
-            # 🔥 1. ANÁLISE DE HEADINGS (COM TODAS AS CORREÇÕES)
-            headings_data = self.headings_analyzer.analyze_all_headings(soup, url)
-            resultado.update(headings_data)
+            # 5. DUPLICADOS (histórico de todo o crawl)
+            self._apply_duplicates(resultado, url)
             
-            # 2. ANÁLISE DE TITLE
-            title_data = self._analyze_title(soup, url)
-            resultado.update(title_data)
-            
-            # 3. ANÁLISE DE DESCRIPTION
-            description_data = self._analyze_description(soup, url)
-            resultado.update(description_data)
-            
-            # 4. OUTRAS METATAGS
-            other_meta_data = self._analyze_other_metatags(soup, url)
-            resultado.update(other_meta_data)
-            
-            # 5. SCORE CONSOLIDADO
+            # 6. SCORE CONSOLIDADO
             score_data = self._calculate_final_score(resultado)
             resultado.update(score_data)
             
-            # 6. IDENTIFICAÇÃO DE PROBLEMAS CRÍTICOS
+            # 7. IDENTIFICAÇÃO DE PROBLEMAS CRÍTICOS
             issues_data = self._identify_critical_issues(resultado)
             resultado.update(issues_data)
             
-            # 7. 🔥 CAMPOS PADRONIZADOS PARA EXCEL (CORREÇÃO DO BUG)
+            # 8. 🔥 CAMPOS PADRONIZADOS PARA EXCEL (CORREÇÃO DO BUG)
             resultado = self._standardize_excel_fields(resultado)
             
-            self.stats['urls_processadas'] += 1
+            self.stats.incr('titles_analisados')
+            self.stats.incr('descriptions_analisadas')
+            self.stats.incr('urls_processadas')
             
             return resultado
             
@@ -78,9 +130,9 @@ class MetatagsAnalyzer:
             print(f"Erro analisando {url}: {e}")
             return self._create_error_result(url, str(e))
     
-    def _analyze_title(self, soup, url):
+    def _analyze_title(self, elements, url):
         """Análise completa do title"""
-        title_tag = soup.find('title')
+        title_tag = elements['title'][0] if elements['title'] else None
         title_text = title_tag.get_text().strip() if title_tag else ''
         title_length = len(title_text)
         
@@ -94,10 +146,7 @@ class MetatagsAnalyzer:
         else:
             title_status = STATUS_OK
         
-        # Verifica duplicação
-        title_duplicado = self._track_title_duplicate(title_text, url)
-        
-        # Lista de problemas
+        # Lista de problemas (duplicação é verificada em finalize)
         title_issues = []
         if title_status == STATUS_ABSENT:
             title_issues.append('Title ausente')
@@ -106,22 +155,17 @@ class MetatagsAnalyzer:
         elif title_status == STATUS_TOO_LONG:
             title_issues.append(f'Title muito longo ({title_length} chars)')
         
-        if title_duplicado:
-            title_issues.append('Title duplicado')
-        
-        self.stats['titles_analisados'] += 1
-        
         return {
             'title': title_text,
             'title_length': title_length,
             'title_status': title_status,
-            'title_duplicado': title_duplicado,
+            'title_duplicado': False,
             'title_issues': title_issues
         }
     
-    def _analyze_description(self, soup, url):
+    def _analyze_description(self, elements, url):
         """Análise completa da meta description"""
-        desc_tag = soup.find('meta', attrs={'name': 'description'})
+        desc_tag = first_with_attr(elements['meta'], 'name', 'description')
         desc_text = desc_tag.get('content', '').strip() if desc_tag else ''
         desc_length = len(desc_text)
         
@@ -135,10 +179,7 @@ class MetatagsAnalyzer:
         else:
             desc_status = STATUS_OK
         
-        # Verifica duplicação
-        desc_duplicada = self._track_description_duplicate(desc_text, url)
-        
-        # Lista de problemas
+        # Lista de problemas (duplicação é verificada em finalize)
         description_issues = []
         if desc_status == STATUS_ABSENT:
             description_issues.append('Meta description ausente')
@@ -147,43 +188,38 @@ class MetatagsAnalyzer:
         elif desc_status == STATUS_TOO_LONG:
             description_issues.append(f'Description muito longa ({desc_length} chars)')
         
-        if desc_duplicada:
-            description_issues.append('Description duplicada')
-        
-        self.stats['descriptions_analisadas'] += 1
-        
         return {
             'meta_description': desc_text,
             'description_length': desc_length,
             'description_status': desc_status,
-            'description_duplicada': desc_duplicada,
+            'description_duplicada': False,
             'description_issues': description_issues
         }
     
-    def _analyze_other_metatags(self, soup, url):
+    def _analyze_other_metatags(self, elements, url):
         """Análise de outras metatags importantes"""
         other_data = {}
         
         # Meta keywords
-        keywords_tag = soup.find('meta', attrs={'name': 'keywords'})
+        keywords_tag = first_with_attr(elements['meta'], 'name', 'keywords')
         other_data['meta_keywords'] = keywords_tag.get('content', '').strip() if keywords_tag else ''
         
         # Meta robots
-        robots_tag = soup.find('meta', attrs={'name': 'robots'})
+        robots_tag = first_with_attr(elements['meta'], 'name', 'robots')
         other_data['meta_robots'] = robots_tag.get('content', '').strip() if robots_tag else ''
         
         # Meta viewport
-        viewport_tag = soup.find('meta', attrs={'name': 'viewport'})
+        viewport_tag = first_with_attr(elements['meta'], 'name', 'viewport')
         other_data['meta_viewport'] = viewport_tag.get('content', '').strip() if viewport_tag else ''
         
         # Canonical
-        canonical_tag = soup.find('link', attrs={'rel': 'canonical'})
+        canonical_tag = first_with_attr(elements['link'], 'rel', 'canonical')
         other_data['canonical_url'] = canonical_tag.get('href', '').strip() if canonical_tag else ''
         
         # Open Graph
-        og_title = soup.find('meta', attrs={'property': 'og:title'})
-        og_description = soup.find('meta', attrs={'property': 'og:description'})
-        og_image = soup.find('meta', attrs={'property': 'og:image'})
+        og_title = first_with_attr(elements['meta'], 'property', 'og:title')
+        og_description = first_with_attr(elements['meta'], 'property', 'og:description')
+        og_image = first_with_attr(elements['meta'], 'property', 'og:image')
         
         other_data['og_title'] = og_title.get('content', '').strip() if og_title else ''
         other_data['og_description'] = og_description.get('content', '').strip() if og_description else ''
@@ -193,6 +229,18 @@ class MetatagsAnalyzer:
         
         return other_data
     
+    def _apply_duplicates(self, resultado, url):
+        """Marca title/description duplicados com base nas páginas já vistas"""
+        resultado['title_duplicado'] = self._track_title_duplicate(resultado.get('title', ''), url)
+        if resultado['title_duplicado']:
+            resultado['title_issues'].append('Title duplicado')
+        
+        resultado['description_duplicada'] = self._track_description_duplicate(
+            resultado.get('meta_description', ''), url
+        )
+        if resultado['description_duplicada']:
+            resultado['description_issues'].append('Description duplicada')
+    
     def _track_title_duplicate(self, title, url):
         """Rastreia títulos duplicados"""
         if not title:
@@ -206,7 +254,7 @@ class MetatagsAnalyzer:
         is_duplicate = len(self.titles_encontrados[title]) > 1
         
         if is_duplicate:
-            self.stats['duplicados_encontrados'] += 1
+            self.stats.incr('duplicados_encontrados')
         
         return is_duplicate
     
@@ -223,7 +271,7 @@ class MetatagsAnalyzer:
         is_duplicate = len(self.descriptions_encontradas[description]) > 1
         
         if is_duplicate:
-            self.stats['duplicados_encontrados'] += 1
+            self.stats.incr('duplicados_encontrados')
         
         return is_duplicate
     
@@ -406,15 +454,16 @@ class MetatagsAnalyzer:
     def get_stats(self):
         """📊 Estatísticas completas do analisador"""
         duplicates_report = self.get_duplicates_report()
+        counters = self.stats.counters()
         
         return {
-            'processing': self.stats.copy(),
+            'processing': counters,
             'duplicates': duplicates_report,
             'summary': {
-                'urls_processadas': self.stats['urls_processadas'],
-                'titles_ok': self.stats['titles_analisados'],
-                'descriptions_ok': self.stats['descriptions_analisadas'],
-                'duplicados_encontrados': self.stats['duplicados_encontrados'],
+                'urls_processadas': counters['urls_processadas'],
+                'titles_ok': counters['titles_analisados'],
+                'descriptions_ok': counters['descriptions_analisadas'],
+                'duplicados_encontrados': counters['duplicados_encontrados'],
                 'duplicate_titles_unique': duplicates_report['total_duplicate_titles'],
                 'duplicate_descriptions_unique': duplicates_report['total_duplicate_descriptions']
             }
@@ -424,12 +473,7 @@ class MetatagsAnalyzer:
         """Reset das estatísticas e dados"""
         self.titles_encontrados.clear()
         self.descriptions_encontradas.clear()
-        self.stats = {
-            'urls_processadas': 0,
-            'titles_analisados': 0,
-            'descriptions_analisadas': 0,
-            'duplicados_encontrados': 0
-        }
+        self.stats.reset()
 
 
 class MetatagsAnalyzerBatch(MetatagsAnalyzer):
@@ -498,6 +542,8 @@ def create_metatags_analyzer(analyzer_type='default', config=None):
 
 def test_metatags_analyzer():
     """🧪 Teste completo do analisador integrado"""
+    from core.parser_backend import parse_html, resolve_parser_backend
+    
     print("🧪 Testando MetatagsAnalyzer INTEGRADO com correções de headings...")
     
     # HTML de teste com vários problemas
@@ -521,7 +567,7 @@ def test_metatags_analyzer():
     </html>
     """
     
-    soup = BeautifulSoup(html_test, 'html.parser')
+    soup = parse_html(html_test, resolve_parser_backend())
     analyzer = MetatagsAnalyzer()
     
     # Executa análise
@@ -4,56 +4,110 @@ from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 import re
 
+from utils.stats import StatsCollector
+from utils.dom_visitor import visit_once
+
+
+REDIRECT_STATUS_CODES = [301, 302, 303, 307, 308]
+STATUS_COUNTERS = ['urls_processadas', 'status_errors', 'mixed_content_found', 'redirects_found']
+
+# Elementos que podem carregar recursos HTTP: (chave, tags, atributos exigidos)
+MIXED_CONTENT_ELEMENTS = [
+    ('img', ('img',), ('src',)),
+    ('script', ('script',), ('src',)),
+    ('link', ('link',), ('href',)),
+    ('iframe', ('iframe',), ('src',)),
+    ('media', ('video', 'audio', 'source'), None),
+    ('style', ('style',), None),
+    ('style_attr', None, ('style',)),
+    ('form', ('form',), ('action',))
+]
+
 
 class StatusAnalyzer:
     """🚨 Analisador de Status HTTP e Mixed Content"""
     
+    # Precisa do response (status, headers) além do soup
+    receives_response = True
+    
     def __init__(self, config=None):
         self.config = config or {}
         
-        self.stats = {
-            'urls_processadas': 0,
-            'status_errors': 0,
-            'mixed_content_found': 0,
-            'redirects_found': 0
-        }
+        self.stats = StatsCollector(STATUS_COUNTERS)
     
     def analyze(self, soup, url, response=None):
         """🎯 Análise principal de status e mixed content"""
-        try:
-            result = {
-                'url': url,
-                'processed': True
+        return self.finalize(self.analyze_page(soup, url, response), url)
+    
+    def analyze_page(self, soup, url, response=None):
+        """📄 Análise sem estado (pode rodar em outro processo); stats ficam em finalize"""
+        return visit_once(soup, lambda visitor: self.visit_page(visitor, url, response))
+    
+    def visit_page(self, visitor, url, response=None):
+        """🚶 Inscreve os elementos de mixed content no visitor; devolve a função que monta a análise
+        
+        Só páginas HTTPS completas são inspecionadas (head-only: o <body> não foi baixado).
+        """
+        elements = None
+        if url.startswith('https://') and not getattr(response, 'body_partial', False):
+            elements = {
+                key: visitor.collect(tags=tags, attrs=attrs)
+                for key, tags, attrs in MIXED_CONTENT_ELEMENTS
             }
-            
-            # 1. ANÁLISE DE STATUS HTTP
-            status_data = self._analyze_status(response, url)
-            result.update(status_data)
-            
-            # 2. ANÁLISE DE MIXED CONTENT  
-            mixed_content_data = self._analyze_mixed_content(soup, url)
-            result.update(mixed_content_data)
-            
-            # 3. OUTRAS VERIFICAÇÕES DE STATUS
-            other_status_data = self._analyze_other_status_issues(response, url)
-            result.update(other_status_data)
+        
+        def finish():
+            try:
+                result = {
+                    'url': url,
+                    'processed': True
+                }
+                
+                # 1. ANÁLISE DE STATUS HTTP
+                status_data = self._analyze_status(response, url)
+                result.update(status_data)
+                
+                # 2. ANÁLISE DE MIXED CONTENT (head-only: o <body> não foi baixado)
+                mixed_content_data = self._analyze_mixed_content(elements, url)
+                result.update(mixed_content_data)
+                
+                # 3. OUTRAS VERIFICAÇÕES DE STATUS
+                other_status_data = self._analyze_other_status_issues(response, url)
+                result.update(other_status_data)
 
-            # 4. CÁLCULO DO NÍVEL DE RISCO
-            risk_data = self._calculate_risk_level(mixed_content_data, other_status_data)
-            result.update(risk_data)
-            
-            self.stats['urls_processadas'] += 1
-            
+                # 4. CÁLCULO DO NÍVEL DE RISCO
+                risk_data = self._calculate_risk_level(mixed_content_data, other_status_data)
+                result.update(risk_data)
+                
+                return result
+                
+            except Exception as e:
+                print(f"Erro analisando status de {url}: {e}")
+                return {
+                    'url': url,
+                    'processed': False,
+                    'error': str(e),
+                    'Status_Code': 'ERROR'
+                }
+        
+        return finish
+    
+    def finalize(self, result, url=None):
+        """📊 Contabiliza a página nas estatísticas do analisador"""
+        if not result.get('processed'):
             return result
-            
-        except Exception as e:
-            print(f"Erro analisando status de {url}: {e}")
-            return {
-                'url': url,
-                'processed': False,
-                'error': str(e),
-                'Status_Code': 'ERROR'
-            }
+        
+        status_code = result.get('Status_Code')
+        if isinstance(status_code, int) and status_code != 200:
+            self.stats.incr('status_errors')
+            if status_code in REDIRECT_STATUS_CODES:
+                self.stats.incr('redirects_found')
+        
+        if result.get('mixed_content_resources'):
+            self.stats.incr('mixed_content_found')
+        
+        self.stats.incr('urls_processadas')
+        
+        return result
     
     def _analyze_status(self, response, url):
         """🚨 Análise do código de status HTTP"""
@@ -83,12 +137,10 @@ class StatusAnalyzer:
             # Warnings para status diferentes de 200
             if response.status_code != 200:
                 status_data['Warnings'].append(f"Página retornou código de status {response.status_code}")
-                self.stats['status_errors'] += 1
                 
                 # Detalhes específicos por tipo de erro
-                if response.status_code in [301, 302, 303, 307, 308]:
+                if response.status_code in REDIRECT_STATUS_CODES:
                     status_data['Warnings'].append(f"Redirect {response.status_code}: {url} → {response.url}")
-                    self.stats['redirects_found'] += 1
                 elif response.status_code == 404:
                     status_data['Warnings'].append("Página não encontrada (404)")
                 elif response.status_code >= 500:
@@ -108,8 +160,11 @@ class StatusAnalyzer:
         except Exception:
             return False
     
-    def _analyze_mixed_content(self, soup, url):
-        """🔒 Análise de Mixed Content (recursos HTTP em páginas HTTPS)"""
+    def _analyze_mixed_content(self, elements, url):
+        """🔒 Análise de Mixed Content (recursos HTTP em páginas HTTPS)
+        
+        ``elements``: coletas de ``MIXED_CONTENT_ELEMENTS`` feitas pelo visitor, ou None.
+        """
         mixed_content_data = {
             'mixed_content_resources': [],
             'has_mixed_content': False,
@@ -122,7 +177,7 @@ class StatusAnalyzer:
         if not url.startswith('https://'):
             return mixed_content_data
         
-        if not soup:
+        if elements is None:
             return mixed_content_data
         
         try:
@@ -131,7 +186,7 @@ class StatusAnalyzer:
             passive_count = 0
             
             # 1. IMAGENS com src HTTP
-            for img in soup.find_all('img', src=True):
+            for img in elements['img']:
                 src = img.get('src', '').strip()
                 if self._is_insecure_url(src):
                     full_url = urljoin(url, src)
@@ -146,7 +201,7 @@ class StatusAnalyzer:
                     passive_count += 1
             
             # 2. SCRIPTS com src HTTP
-            for script in soup.find_all('script', src=True):
+            for script in elements['script']:
                 src = script.get('src', '').strip()
                 if self._is_insecure_url(src):
                     full_url = urljoin(url, src)
@@ -161,7 +216,7 @@ class StatusAnalyzer:
                     critical_count += 1
             
             # 3. LINKS (CSS) com href HTTP
-            for link in soup.find_all('link', href=True):
+            for link in elements['link']:
                 href = link.get('href', '').strip()
                 if self._is_insecure_url(href):
                     full_url = urljoin(url, href)
@@ -176,7 +231,7 @@ class StatusAnalyzer:
                     critical_count += 1
             
             # 4. IFRAMES com src HTTP
-            for iframe in soup.find_all('iframe', src=True):
+            for iframe in elements['iframe']:
                 src = iframe.get('src', '').strip()
                 if self._is_insecure_url(src):
                     full_url = urljoin(url, src)
@@ -191,7 +246,7 @@ class StatusAnalyzer:
                     critical_count += 1
             
             # 5. OUTROS recursos com URLs HTTP
-            for tag in soup.find_all(['video', 'audio', 'source']):
+            for tag in elements['media']:
                 for attr in ['src', 'poster']:
                     if tag.has_attr(attr):
                         url_attr = tag.get(attr, '').strip()
@@ -208,7 +263,7 @@ class StatusAnalyzer:
                             passive_count += 1
 
             # 6. <style> contendo url(http://...)
-            for style_tag in soup.find_all('style'):
+            for style_tag in elements['style']:
                 content = style_tag.string or ''
                 for match in re.findall(r'url\(\s*["\']?(http://[^)"\']+)', content, re.IGNORECASE):
                     if self._is_insecure_url(match):
@@ -224,7 +279,7 @@ class StatusAnalyzer:
                         passive_count += 1
 
             # 7. Atributo style com url(http://...)
-            for element in soup.find_all(style=True):
+            for element in elements['style_attr']:
                 style_attr = element.get('style', '')
                 for match in re.findall(r'url\(\s*["\']?(http://[^)"\']+)', style_attr, re.IGNORECASE):
                     if self._is_insecure_url(match):
@@ -240,7 +295,7 @@ class StatusAnalyzer:
                         passive_count += 1
 
             # 8. Formulários com action HTTP
-            for form in soup.find_all('form', action=True):
+            for form in elements['form']:
                 action = form.get('action', '').strip()
                 if self._is_insecure_url(action):
                     full_url = urljoin(url, action)
@@ -260,9 +315,6 @@ class StatusAnalyzer:
             mixed_content_data['critical_mixed_count'] = critical_count
             mixed_content_data['passive_mixed_count'] = passive_count
             
-            if mixed_resources:
-                self.stats['mixed_content_found'] += 1
-            
         except Exception as e:
             print(f"Erro analisando mixed content em {url}: {e}")
         
@@ -354,15 +406,17 @@ class StatusAnalyzer:
     
     def get_stats(self):
         """📊 Estatísticas do analisador de status"""
+        counters = self.stats.counters()
+        
         return {
-            'processing': self.stats.copy(),
+            'processing': counters,
             'summary': {
-                'urls_processadas': self.stats['urls_processadas'],
-                'status_errors': self.stats['status_errors'],
-                'mixed_content_found': self.stats['mixed_content_found'], 
-                'redirects_found': self.stats['redirects_found'],
-                'error_rate': (self.stats['status_errors'] / max(self.stats['urls_processadas'], 1)) * 100,
-                'mixed_content_rate': (self.stats['mixed_content_found'] / max(self.stats['urls_processadas'], 1)) * 100
+                'urls_processadas': counters['urls_processadas'],
+                'status_errors': counters['status_errors'],
+                'mixed_content_found': counters['mixed_content_found'], 
+                'redirects_found': counters['redirects_found'],
+                'error_rate': (counters['status_errors'] / max(counters['urls_processadas'], 1)) * 100,
+                'mixed_content_rate': (counters['mixed_content_found'] / max(counters['urls_processadas'], 1)) * 100
             }
         }
     
@@ -376,12 +430,7 @@ class StatusAnalyzer:
     
     def reset_stats(self):
         """🔄 Reset das estatísticas"""
-        self.stats = {
-            'urls_processadas': 0,
-            'status_errors': 0,
-            'mixed_content_found': 0,
-            'redirects_found': 0
-        }
+        self.stats.reset()
 
 
 def create_status_analyzer(config=None):
@@ -391,6 +440,8 @@ def create_status_analyzer(config=None):
 
 def test_status_analyzer():
     """🧪 Teste do StatusAnalyzer"""
+    from core.parser_backend import parse_html, resolve_parser_backend
+    
     print("🧪 Testando StatusAnalyzer...")
     
     # HTML de teste com mixed content
@@ -409,7 +460,7 @@ def test_status_analyzer():
     </html>
     """
     
-    soup = BeautifulSoup(html_test_mixed, 'html.parser')
+    soup = parse_html(html_test_mixed, resolve_parser_backend())
     analyzer = StatusAnalyzer()
     
     # Mock response object
@@ -0,0 +1,106 @@
+# benchmarks/bench_fetch_engines.py - Threads (requests) vs asyncio (aiohttp)
+
+"""
+⏱️ Benchmark dos motores de fetch contra um site local (http.server)
+
+Sobe um servidor local com latência artificial por página e compara o
+SEOCrawler (threads + requests) com o AsyncSEOCrawler (aiohttp).
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_fetch_engines --pages 2000 --latency 0.2
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import update_config
+from core.crawler import create_crawler
+
+
+def start_stand_in_server(pages, latency, links_per_page=8):
+    """Sobe site sintético: /p/<n> com links para outras páginas"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            time.sleep(latency)
+            try:
+                n = int(self.path.rstrip('/').split('/')[-1])
+            except ValueError:
+                n = 0
+            links = ''.join(
+                f'<a href="/p/{(n * links_per_page + k) % pages}">link</a>'
+                for k in range(1, links_per_page + 1)
+            )
+            body = (
+                f'<html><head><title>Página {n} do site de benchmark</title>'
+                f'<meta name="description" content="Página {n}"></head>'
+                f'<body><h1>Página {n}</h1>{links}</body></html>'
+            ).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_engine(crawler_type, start_url, pages, threads, concurrency):
+    config = update_config({
+        'crawler': {
+            'max_urls': pages,
+            'max_depth': 50,
+            'max_threads': threads,
+            'max_concurrency': concurrency
+        }
+    })
+    crawler = create_crawler(crawler_type, config)
+
+    start = time.perf_counter()
+    results = crawler.crawl(start_url, pages)
+    elapsed = time.perf_counter() - start
+
+    return len(results), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark threads vs asyncio')
+    parser.add_argument('--pages', type=int, default=1000)
+    parser.add_argument('--latency', type=float, default=0.2, help='Latência por página (s)')
+    parser.add_argument('--threads', type=int, default=25)
+    parser.add_argument('--concurrency', type=int, default=200)
+    args = parser.parse_args()
+
+    server = start_stand_in_server(args.pages, args.latency)
+    start_url = f'http://127.0.0.1:{server.server_address[1]}/p/0'
+
+    rows = []
+    for crawler_type in ['default', 'async']:
+        total, elapsed = run_engine(crawler_type, start_url, args.pages, args.threads, args.concurrency)
+        rows.append((crawler_type, total, elapsed))
+
+    server.shutdown()
+
+    print("\n" + "=" * 60)
+    print(f"{'motor':<10}{'páginas':>10}{'tempo (s)':>12}{'páginas/s':>12}")
+    for crawler_type, total, elapsed in rows:
+        print(f"{crawler_type:<10}{total:>10}{elapsed:>12.2f}{total / max(elapsed, 1e-9):>12.1f}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# benchmarks/bench_parser_backends.py - Tempo de parse por backend do BeautifulSoup
+
+"""
+⏱️ Benchmark dos backends de parse (lxml, html.parser, html5lib)
+
+Parseia o mesmo corpus de páginas reais com cada backend instalado, mede o
+tempo de ``parse_html`` e confere se a análise por página
+(IntegratedAnalyzer) sai igual à do backend de referência (o primeiro da
+lista). Marcação sintética não serve de medida: o custo de parse depende de
+scripts, atributos e HTML malformado das páginas de verdade.
+
+Corpus (só páginas reais), na ordem:
+- ``--corpus``: pasta com arquivos .html (padrão ``benchmarks/corpus``,
+  fora do git); ``--collect URL`` faz um crawl curto do site e salva as
+  páginas HTML baixadas nela
+- corpos HTML do cache HTTP em disco (``--cache-dir``, preenchido com ``--cache``)
+
+Uso (na raiz do projeto):
+    python -m benchmarks.bench_parser_backends --collect https://www.exemplo.com.br/ --collect-pages 200
+    python -m benchmarks.bench_parser_backends --repeat 3
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import sys
+import time
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import update_config
+from core.crawler import create_crawler
+from core.http_cache import HTTPCache
+from core.parser_backend import available_backends, parse_html
+from core.session_manager import FetchedResponse
+from main import IntegratedAnalyzer
+
+
+DEFAULT_CORPUS_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+
+
+def load_corpus_folder(folder):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(folder, '**', '*.htm*'), recursive=True)):
+        with open(path, 'rb') as page_file:
+            pages.append((path, page_file.read()))
+    return pages
+
+
+def load_http_cache(folder):
+    """Corpos do cache HTTP (zlib) que parecem HTML"""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(folder, 'bodies', '*', '*.z'))):
+        try:
+            with open(path, 'rb') as body_file:
+                body = zlib.decompress(body_file.read())
+        except (OSError, zlib.error):
+            continue
+        if looks_like_html(body):
+            pages.append((path, body))
+    return pages
+
+
+def looks_like_html(body):
+    return b'<html' in body[:4096].lower()
+
+
+def collect_pages(start_url, count, folder):
+    """Crawl curto de ``start_url`` com cache HTTP; salva as páginas HTML em ``folder``"""
+    cache_dir = os.path.join(folder, '.http')
+    config = update_config({'crawler': {'max_urls': count, 'http_cache': True, 'http_cache_dir': cache_dir}})
+    results = create_crawler('default', config).crawl(start_url, count)
+
+    cache = HTTPCache(cache_dir)
+    saved = 0
+    for result in results:
+        entry = cache.lookup(result['url'])
+        body = cache.load_body(entry) if entry else None
+        if not body or not looks_like_html(body):
+            continue
+        name = hashlib.sha1(result['url'].encode()).hexdigest()[:16] + '.html'
+        with open(os.path.join(folder, name), 'wb') as page_file:
+            page_file.write(body)
+        saved += 1
+    cache.close()
+
+    print(f"💾 {saved} páginas de {start_url} salvas em {folder}")
+
+
+def as_response(name, content):
+    return FetchedResponse(
+        status_code=200,
+        url=f'https://exemplo.com/{os.path.basename(name)}',
+        headers={'Content-Type': 'text/html; charset=utf-8'},
+        content=content
+    )
+
+
+def time_backend(backend, responses, repeat):
+    """Melhor tempo total (s) entre ``repeat`` rodadas e os soups da última"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        soups = [parse_html(response.text, backend) for response in responses]
+        best = min(best, time.perf_counter() - start)
+    return best, soups
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dos backends de parse HTML')
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS_FOLDER, help='Pasta com arquivos .html de páginas reais')
+    parser.add_argument('--cache-dir', default=os.path.join('cache', 'http'), help='Cache HTTP usado como corpus')
+    parser.add_argument('--collect', metavar='URL', help='Antes de medir, baixa páginas reais do site para --corpus')
+    parser.add_argument('--collect-pages', type=int, default=100, help='Páginas baixadas por --collect')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.collect:
+        os.makedirs(args.corpus, exist_ok=True)
+        collect_pages(args.collect, args.collect_pages, args.corpus)
+
+    pages, source = load_corpus_folder(args.corpus), args.corpus
+    if not pages:
+        pages, source = load_http_cache(args.cache_dir), args.cache_dir
+    if not pages:
+        print(f"❌ Nenhuma página real em {args.corpus} nem em {args.cache_dir}")
+        print("   Use --collect URL (ou --corpus com páginas salvas) para montar o corpus")
+        return 1
+
+    responses = [as_response(name, content) for name, content in pages]
+    total_mb = sum(len(content) for _, content in pages) / 1024 ** 2
+    print(f"📚 Corpus: {len(pages)} páginas ({total_mb:.1f} MB) - {source}")
+
+    analyzer = IntegratedAnalyzer()
+    reference = None
+    rows = []
+    for backend in available_backends():
+        elapsed, soups = time_backend(backend, responses, args.repeat)
+        analyses = [analyzer.analyze_page(soup, response.url, response) for soup, response in zip(soups, responses)]
+        if reference is None:
+            reference = analyses
+        differing = sum(1 for analysis, expected in zip(analyses, reference) if analysis != expected)
+        rows.append((backend, elapsed, differing))
+
+    # Referência de velocidade: html.parser (stdlib, sempre instalado)
+    baseline = dict((backend, elapsed) for backend, elapsed, _ in rows)['html.parser']
+    print("\n" + "=" * 72)
+    print(f"{'backend':<14}{'tempo (s)':>12}{'ms/página':>12}{'páginas/s':>12}{'vs stdlib':>10}{'análise ≠':>12}")
+    for backend, elapsed, differing in rows:
+        print(f"{backend:<14}{elapsed:>12.3f}{elapsed * 1000 / len(pages):>12.2f}"
+              f"{len(pages) / max(elapsed, 1e-9):>12.1f}{baseline / max(elapsed, 1e-9):>9.1f}x{differing:>12}")
+    print("=" * 72)
+    print(f"análise ≠: páginas cuja análise difere da feita com {rows[0][0]}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
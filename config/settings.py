@@ -9,14 +9,28 @@ URL_INICIAL = "https://www.ccgsaude.com.br/"
 MAX_URLS_DEFAULT = 10000
 MAX_DEPTH_DEFAULT = 10
 MAX_THREADS_DEFAULT = 25
+MAX_CONCURRENCY_DEFAULT = 200      # Requisições em voo no modo async
+PARSE_PROCESSES_DEFAULT = 0        # 0 = parse/análise nas próprias threads de I/O
+FRONTIER_MEMORY_URLS_DEFAULT = 0   # URLs da fila em memória; excedente vai para disco (0 = sem limite)
+
+# ========================
+# 🗄️ CACHE HTTP EM DISCO
+# ========================
+
+HTTP_CACHE_FOLDER = os.path.join("cache", "http")
+HTTP_CACHE_MAX_MB = 500
+HTTP_CACHE_TTL_HOURS = 168         # 7 dias
+REVALIDATE_STORE_FILE = os.path.join("cache", "validators.sqlite")  # ETag/Last-Modified + última análise
+INCREMENTAL_FOLDER = "cache"       # <domínio>_cache.json: hash md5 + última análise por URL
 
 # ========================
 # ⏱️ TIMEOUTS E CONEXÕES
 # ========================
 
-REQUEST_TIMEOUT = 15
+REQUEST_TIMEOUT = 15              # Prazo total de cada requisição (conexão + corpo)
 CONNECTION_TIMEOUT = 10
-READ_TIMEOUT = 30
+READ_TIMEOUT = 30                 # Silêncio máximo entre dois blocos (limitado ao prazo total)
+MAX_BODY_MB = 10                  # Corpo HTML acima disso é truncado; não-HTML nem é baixado
 
 # ========================
 # 📁 PASTAS DE SAÍDA
@@ -205,7 +219,48 @@ DEFAULT_CONFIG = {
         'max_urls': MAX_URLS_DEFAULT,
         'max_depth': MAX_DEPTH_DEFAULT,
         'max_threads': MAX_THREADS_DEFAULT,
+        'max_concurrency': MAX_CONCURRENCY_DEFAULT,
+        'parse_processes': PARSE_PROCESSES_DEFAULT,
+        'frontier_memory_urls': FRONTIER_MEMORY_URLS_DEFAULT,
+        'frontier_dir': None,              # None = pasta temporária do sistema
+        'journal_file': None,              # Journal de checkpoint (None = desativado)
+        'resume': False,                   # Retoma o crawl a partir do journal
+        'result_sink': 'memory',           # memory | jsonl | sqlite | parquet
+        'result_sink_path': None,          # None = output/crawl_results_<timestamp>.<ext>
+        'http_cache': False,               # Cache de respostas em disco (--cache)
+        'http_cache_dir': HTTP_CACHE_FOLDER,
+        'http_cache_max_mb': HTTP_CACHE_MAX_MB,
+        'http_cache_ttl_hours': HTTP_CACHE_TTL_HOURS,
+        'revalidate': False,               # GET condicional entre crawls (--revalidate)
+        'revalidate_store': REVALIDATE_STORE_FILE,
+        'incremental': False,              # Recrawl incremental por hash de conteúdo (--incremental)
+        'incremental_dir': INCREMENTAL_FOLDER,
+        'requests_per_second': 0,          # Token bucket por host; 0 = sem limite (--rate)
+        'rate_burst': None,                # Rajada máxima; None = igual ao rate (--burst)
+        'rate_per_host': True,
+        'adaptive_concurrency': False,     # Limite AIMD de requisições em voo por host (--adaptive)
+        'adaptive_min_limit': 1,
+        'adaptive_initial_limit': 4,
+        'adaptive_latency_factor': 3.0,    # p50 da janela acima de N x p50 base = congestionamento
+        'max_retries': 3,                  # Retries com backoff fora do pool (--retries)
+        'retry_backoff_base': 0.5,         # Segundos; dobra a cada tentativa (com jitter)
+        'retry_backoff_max': 30.0,
+        'retry_statuses': [429, 500, 502, 503, 504],
+        'circuit_breaker': False,          # Fast-fail de hosts fora do ar (--circuit-breaker)
+        'circuit_failure_threshold': 5,    # Falhas seguidas que abrem o circuito
+        'circuit_reset_seconds': 30.0,     # Espera até a requisição de prova (dobra a cada prova falha)
+        'circuit_max_reset_seconds': 300.0,
+        'circuit_scope': 'host',           # host | path (host + primeiro segmento do caminho)
         'timeout': REQUEST_TIMEOUT,
+        'connect_timeout': CONNECTION_TIMEOUT,
+        'read_timeout': READ_TIMEOUT,
+        'time_budget': 0,                  # Segundos de crawl; 0 = sem limite (--time-budget)
+        'max_body_bytes': MAX_BODY_MB * 1024 * 1024,  # 0 = sem limite (--max-body-mb)
+        'parser_backend': 'lxml',          # lxml | html.parser | html5lib; cai para o próximo instalado (--parser)
+        'stream_parse': False,             # Monta a árvore do HTML durante o download, só crawlers com threads (--stream-parse)
+        'head_only': False,                # Baixa só até </head> + primeiro </h1> (--head-only)
+        'content_probe': False,            # HEAD antes do GET em URLs com cara de arquivo (--probe)
+        'probe_non_html_ratio': 0.2,       # Fração de não-HTML no template que passa a exigir sonda
         'headers': DEFAULT_HEADERS
     },
     'analysis': {
@@ -1,21 +1,67 @@
 # core/__init__.py - Módulo principal do sistema
 
-from .session_manager import SessionManager, RateLimitedSessionManager, MultiDomainSessionManager, create_session_manager
+from .session_manager import SessionManager, RateLimitedSessionManager, MultiDomainSessionManager, AsyncSessionManager, create_session_manager
 from .url_manager import URLManager, SmartURLManager, BatchURLManager, create_url_manager  
-from .crawler import SEOCrawler, SmartSEOCrawler, BatchSEOCrawler, create_crawler
+from .url_filters import URLFilter
+from .frontier import SpillingFrontier, create_frontier
+from .journal import CrawlJournal
+from .http_cache import HTTPCache, create_http_cache
+from .revalidation import ValidatorStore, create_validator_store
+from .content_hashes import ContentHashStore, create_content_hash_store
+from .concurrency import AdaptiveConcurrencyController, create_concurrency_controller
+from .rate_limiter import TokenBucketRateLimiter, create_rate_limiter
+from .retry_policy import RetryPolicy, create_retry_policy
+from .circuit_breaker import CircuitBreaker, CircuitOpenError, create_circuit_breaker
+from .content_probe import ContentTypeProber, create_content_prober
+from .parser_backend import resolve_parser_backend, parse_html, create_parser_backend
+from .streaming_parser import StreamingSoupParser, create_streaming_parser
+from .result_sink import JSONLResultSink, SQLiteResultSink, ParquetResultSink, create_result_sink
+from .crawler import SEOCrawler, SmartSEOCrawler, BatchSEOCrawler, AsyncSEOCrawler, create_crawler
 
 __all__ = [
     'SessionManager',
     'RateLimitedSessionManager',
     'MultiDomainSessionManager', 
+    'AsyncSessionManager',
     'create_session_manager',
     'URLManager',
     'SmartURLManager',
     'BatchURLManager',
     'create_url_manager',
+    'URLFilter',
+    'SpillingFrontier',
+    'create_frontier',
+    'CrawlJournal',
+    'HTTPCache',
+    'create_http_cache',
+    'ValidatorStore',
+    'create_validator_store',
+    'ContentHashStore',
+    'create_content_hash_store',
+    'AdaptiveConcurrencyController',
+    'create_concurrency_controller',
+    'TokenBucketRateLimiter',
+    'create_rate_limiter',
+    'RetryPolicy',
+    'create_retry_policy',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'create_circuit_breaker',
+    'ContentTypeProber',
+    'create_content_prober',
+    'resolve_parser_backend',
+    'parse_html',
+    'create_parser_backend',
+    'StreamingSoupParser',
+    'create_streaming_parser',
+    'JSONLResultSink',
+    'SQLiteResultSink',
+    'ParquetResultSink',
+    'create_result_sink',
     'SEOCrawler',
     'SmartSEOCrawler', 
     'BatchSEOCrawler',
+    'AsyncSEOCrawler',
     'create_crawler'
 ]
 
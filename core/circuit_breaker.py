@@ -0,0 +1,153 @@
+# core/circuit_breaker.py - Circuit breaker por host (ou prefixo de caminho)
+
+"""
+⚡ Circuit breaker para origens fora do ar
+
+Estados por circuito (host, ou host + primeiro segmento do caminho):
+- closed: requisições normais; ``failure_threshold`` falhas seguidas
+  (erro de rede/timeout ou status 5xx) abrem o circuito
+- open: requisições falham na hora com ``CircuitOpenError`` (sem ocupar
+  uma thread pelo timeout inteiro) até passar ``reset_seconds``
+- half_open: uma única requisição de prova passa; sucesso fecha o circuito,
+  falha reabre com espera dobrada (até ``max_reset_seconds``)
+
+O crawler trata ``CircuitOpenError`` como falha transitória: a URL volta
+para a fila de retries com atraso até a próxima prova e, esgotadas as
+tentativas, termina com status ``CIRCUIT_OPEN``.
+"""
+
+import threading
+import time
+from urllib.parse import urlparse
+
+from utils.stats import StatsCollector
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+CIRCUIT_OPEN_STATUS = 'CIRCUIT_OPEN'
+
+
+class CircuitOpenError(Exception):
+    """Circuito aberto: a requisição nem foi enviada"""
+
+    def __init__(self, key, retry_after):
+        super().__init__(f"Circuito aberto para {key} (nova prova em {retry_after:.1f}s)")
+        self.key = key
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Circuit breakers independentes por host ou prefixo de caminho"""
+
+    def __init__(self, failure_threshold=5, reset_seconds=30.0, max_reset_seconds=300.0, scope='host'):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.max_reset_seconds = max_reset_seconds
+        self.scope = scope
+
+        self._lock = threading.Lock()
+        self._circuits = {}
+        self.stats = StatsCollector(['fast_failed', 'trips', 'probes', 'recoveries'])
+
+    def circuit_key(self, url):
+        parsed = urlparse(url)
+        if self.scope == 'path':
+            segment = parsed.path.strip('/').split('/', 1)[0]
+            return f"{parsed.netloc}/{segment}"
+        return parsed.netloc
+
+    def _circuit(self, key):
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = {
+                'state': CLOSED,
+                'failures': 0,
+                'opened_at': 0.0,
+                'reset_seconds': self.reset_seconds,
+                'probe_started': 0.0,
+                'trips': 0
+            }
+            self._circuits[key] = circuit
+        return circuit
+
+    def before_request(self, url):
+        """Libera a requisição ou levanta ``CircuitOpenError`` (fast-fail)"""
+        key = self.circuit_key(url)
+        now = time.monotonic()
+
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None or circuit['state'] == CLOSED:
+                return
+
+            reopen_at = circuit['opened_at'] + circuit['reset_seconds']
+            if circuit['state'] == OPEN and now >= reopen_at:
+                circuit['state'] = HALF_OPEN
+                circuit['probe_started'] = 0.0
+
+            # Half-open: uma prova por vez (prova perdida libera outra após reset_seconds)
+            if circuit['state'] == HALF_OPEN and now - circuit['probe_started'] >= circuit['reset_seconds']:
+                circuit['probe_started'] = now
+                self.stats.incr('probes')
+                return
+
+            retry_after = max(reopen_at - now, 0) if circuit['state'] == OPEN else circuit['reset_seconds']
+
+        self.stats.incr('fast_failed')
+        raise CircuitOpenError(key, retry_after)
+
+    def record(self, url, status_code=None, error=False):
+        """Resultado da requisição: erro de rede ou 5xx conta como falha"""
+        failed = error or (isinstance(status_code, int) and status_code >= 500)
+        key = self.circuit_key(url)
+
+        with self._lock:
+            circuit = self._circuit(key)
+
+            if not failed:
+                if circuit['state'] != CLOSED:
+                    self.stats.incr('recoveries')
+                circuit.update(state=CLOSED, failures=0, reset_seconds=self.reset_seconds)
+                return
+
+            circuit['failures'] += 1
+            if circuit['state'] == HALF_OPEN:
+                # Prova falhou: reabre com espera dobrada
+                circuit['reset_seconds'] = min(circuit['reset_seconds'] * 2, self.max_reset_seconds)
+                self._open(circuit)
+            elif circuit['state'] == CLOSED and circuit['failures'] >= self.failure_threshold:
+                self._open(circuit)
+
+    def _open(self, circuit):
+        circuit['state'] = OPEN
+        circuit['opened_at'] = time.monotonic()
+        circuit['trips'] += 1
+        self.stats.incr('trips')
+
+    def get_stats(self):
+        with self._lock:
+            circuits = {
+                key: {'state': circuit['state'], 'failures': circuit['failures'], 'trips': circuit['trips']}
+                for key, circuit in self._circuits.items()
+                if circuit['trips'] or circuit['state'] != CLOSED
+            }
+
+        counters = self.stats.counters()
+        counters['circuits'] = circuits
+        return counters
+
+
+def create_circuit_breaker(config):
+    """CircuitBreaker a partir da config do crawler, ou None se ``circuit_breaker`` estiver desligado"""
+    if not config.get('circuit_breaker'):
+        return None
+
+    return CircuitBreaker(
+        failure_threshold=config.get('circuit_failure_threshold', 5),
+        reset_seconds=config.get('circuit_reset_seconds', 30.0),
+        max_reset_seconds=config.get('circuit_max_reset_seconds', 300.0),
+        scope=config.get('circuit_scope', 'host')
+    )
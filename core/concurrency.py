@@ -0,0 +1,202 @@
+# core/concurrency.py - Concorrência adaptativa por host (AIMD)
+
+"""
+📶 Controle adaptativo de requisições em voo por host
+
+Cada host tem um limite de requisições simultâneas que se ajusta sozinho:
+- aumento aditivo: a cada janela de respostas saudáveis o limite sobe +1
+- redução multiplicativa: 429/503, taxa de erros alta ou p50 da janela
+  muito acima da latência base do host multiplicam o limite por ``decrease``
+
+A latência base é o menor p50 de janela já visto no host; ``latency_factor``
+define quanto o p50 pode se afastar dela antes de contar como
+congestionamento (fila no servidor desloca a mediana; uma página lenta
+isolada não). Diferenças abaixo de ``LATENCY_FLOOR_MS`` são ruído.
+Depois de uma redução, novas reduções esperam uma janela (as respostas que
+já estavam em voo não derrubam o limite de novo).
+
+O SessionManager alimenta o controlador (``record``) com o netloc de cada
+URL e o scheduler do crawler consulta ``limit(host)`` com o domínio base
+(sem "www."): os dois passam por ``host_key`` e caem no mesmo estado.
+"""
+
+import threading
+from collections import deque
+
+
+# Respostas que indicam que o servidor pediu para desacelerar
+CONGESTION_STATUS = {429, 503}
+
+MIN_WINDOW = 10            # Respostas mínimas entre duas decisões
+LATENCY_SAMPLES = 100      # Amostras de latência guardadas por host
+ERROR_RATE_THRESHOLD = 0.1
+LATENCY_FLOOR_MS = 50
+
+
+def host_key(host):
+    """Chave do host no controlador: minúsculo e sem "www." (mesmo critério do URLManager)"""
+    host = host.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0
+    index = min(int(len(sorted_values) * fraction), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+class AdaptiveConcurrencyController:
+    """Limite AIMD de requisições em voo por host, a partir de latência e erros"""
+
+    def __init__(self, max_limit, min_limit=1, initial_limit=4, decrease=0.5, latency_factor=3.0):
+        self.max_limit = max(max_limit, 1)
+        self.min_limit = max(min(min_limit, self.max_limit), 1)
+        self.initial_limit = min(max(initial_limit, self.min_limit), self.max_limit)
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def _host_state(self, host):
+        host = host_key(host)
+        state = self._hosts.get(host)
+        if state is None:
+            state = {
+                'limit': float(self.initial_limit),
+                'latencies': deque(maxlen=LATENCY_SAMPLES),
+                'baseline_p50': None,
+                'window': 0,
+                'window_errors': 0,
+                'window_congestion': 0,
+                'cooldown': 0,
+                'increases': 0,
+                'decreases': 0
+            }
+            self._hosts[host] = state
+        return state
+
+    def limit(self, host):
+        """Requisições em voo permitidas agora para o host"""
+        state = self._hosts.get(host_key(host))
+        if state is None:
+            return self.initial_limit
+        return int(state['limit'])
+
+    def record(self, host, latency_ms=None, status_code=None, error=False):
+        """Registra o resultado de uma requisição (latência, status ou exceção)"""
+        with self._lock:
+            state = self._host_state(host)
+
+            if latency_ms is not None and not error:
+                state['latencies'].append(latency_ms)
+
+            state['window'] += 1
+            if state['cooldown']:
+                state['cooldown'] -= 1
+
+            if status_code in CONGESTION_STATUS:
+                state['window_congestion'] += 1
+                # Servidor pediu para desacelerar: reage já, sem esperar a janela
+                if not state['cooldown']:
+                    self._decrease(state)
+                return
+
+            if error or (status_code is not None and status_code >= 500):
+                state['window_errors'] += 1
+
+            if state['window'] >= max(int(state['limit']), MIN_WINDOW):
+                self._evaluate_window(state)
+
+    def _evaluate_window(self, state):
+        window = state['window']
+        error_rate = state['window_errors'] / window
+
+        recent = sorted(list(state['latencies'])[-window:])
+        p50 = _percentile(recent, 0.5)
+        if recent and (state['baseline_p50'] is None or p50 < state['baseline_p50']):
+            state['baseline_p50'] = p50
+
+        baseline = state['baseline_p50'] or 0
+        slow = bool(recent) and p50 > baseline * self.latency_factor and p50 - baseline > LATENCY_FLOOR_MS
+
+        if state['window_congestion'] or error_rate > ERROR_RATE_THRESHOLD or slow:
+            if not state['cooldown']:
+                self._decrease(state)
+        elif state['limit'] < self.max_limit:
+            state['limit'] = min(state['limit'] + 1, self.max_limit)
+            state['increases'] += 1
+
+        self._reset_window(state)
+
+    def _decrease(self, state):
+        state['limit'] = max(state['limit'] * self.decrease, self.min_limit)
+        state['decreases'] += 1
+        state['latencies'].clear()
+        state['cooldown'] = max(int(state['limit']), MIN_WINDOW)
+        self._reset_window(state)
+
+    def _reset_window(self, state):
+        state['window'] = 0
+        state['window_errors'] = 0
+        state['window_congestion'] = 0
+
+    def get_stats(self):
+        with self._lock:
+            hosts = {}
+            for host, state in self._hosts.items():
+                latencies = sorted(state['latencies'])
+                hosts[host] = {
+                    'limit': int(state['limit']),
+                    'p50_ms': round(_percentile(latencies, 0.5), 2),
+                    'p95_ms': round(_percentile(latencies, 0.95), 2),
+                    'baseline_p50_ms': round(state['baseline_p50'] or 0, 2),
+                    'increases': state['increases'],
+                    'decreases': state['decreases']
+                }
+
+        return {
+            'min_limit': self.min_limit,
+            'max_limit': self.max_limit,
+            'hosts': hosts
+        }
+
+
+def create_concurrency_controller(config, max_limit):
+    """Controlador AIMD a partir da config do crawler, ou None se ``adaptive_concurrency`` estiver desligado"""
+    if not config.get('adaptive_concurrency'):
+        return None
+
+    return AdaptiveConcurrencyController(
+        max_limit=max_limit,
+        min_limit=config.get('adaptive_min_limit', 1),
+        initial_limit=config.get('adaptive_initial_limit', 4),
+        latency_factor=config.get('adaptive_latency_factor', 3.0)
+    )
+
+
+def test_adaptive_concurrency(requests_count=2000):
+    """🧪 Simula um host que congestiona acima de 12 requisições em voo"""
+    print(f"🧪 Testando AdaptiveConcurrencyController ({requests_count} respostas simuladas)...")
+    controller = AdaptiveConcurrencyController(max_limit=50, initial_limit=4)
+    host = 'exemplo.com'
+    capacity = 12
+    limits = []
+
+    for _ in range(requests_count):
+        in_flight = controller.limit(host)
+        if in_flight > capacity:
+            controller.record(host, latency_ms=2000, status_code=503)
+        else:
+            controller.record(host, latency_ms=100 + in_flight * 5, status_code=200)
+        limits.append(controller.limit(host))
+
+    tail = limits[-500:]
+    print(f"  limite final: {limits[-1]} | faixa nas últimas 500: {min(tail)}-{max(tail)}")
+    print(f"  stats: {controller.get_stats()['hosts'][host]}")
+    print(f"  {'✅ OK' if max(tail) <= capacity + 1 and min(tail) >= capacity // 2 else '❌ fora da capacidade'}")
+
+
+if __name__ == "__main__":
+    test_adaptive_concurrency()
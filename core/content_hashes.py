@@ -0,0 +1,108 @@
+# core/content_hashes.py - Hash do conteúdo por URL para recrawl incremental
+
+"""
+🧮 Recrawl incremental por hash de conteúdo
+
+Mantém ``cache/<domínio>_cache.json`` no formato já usado pelo projeto
+(``{url: {"hash": md5, "last_checked": iso}}``), acrescentando ``result``: a
+saída final dos analyzers para aquela versão da página.
+
+No crawl seguinte o corpo baixado é hasheado antes do parse; se o hash bate
+com o guardado, o resultado anterior é copiado adiante e a página não é
+parseada nem analisada de novo. Entradas antigas sem ``result`` contam como
+alteradas (são analisadas uma vez e passam a ter resultado).
+
+Uso:
+    store = ContentHashStore('cache/exemplo.com_cache.json')
+    digest = content_hash(response.content)
+    previous = store.unchanged_result(url, digest)   # None = parsear
+    store.update(url, digest, result)
+    store.save()
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+
+
+def content_hash(content):
+    """md5 hex do corpo (mesmo formato dos arquivos de cache existentes)"""
+    return hashlib.md5(content or b'').hexdigest()
+
+
+class ContentHashStore:
+    """Hash, última verificação e resultado de análise por URL (JSON por domínio)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = self._load()
+        self.dirty = False
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding='utf-8') as cache_file:
+                entries = json.load(cache_file)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Cache de hashes ilegível ({self.path}): {e} - começando do zero")
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def is_known(self, url):
+        return url in self.entries
+
+    def unchanged_result(self, url, digest):
+        """Resultado guardado se o conteúdo não mudou desde o último crawl, senão None"""
+        entry = self.entries.get(url)
+        if entry and entry.get('hash') == digest:
+            return entry.get('result')
+        return None
+
+    def update(self, url, digest, result):
+        self.entries[url] = {
+            'hash': digest,
+            'last_checked': datetime.now().isoformat(),
+            'result': result
+        }
+        self.dirty = True
+
+    def touch(self, url):
+        """Página confirmada inalterada: só atualiza ``last_checked``"""
+        entry = self.entries.get(url)
+        if entry is not None:
+            entry['last_checked'] = datetime.now().isoformat()
+            self.dirty = True
+
+    def save(self):
+        """Grava o JSON (tmp + rename atômico); nada a fazer se não houve mudança"""
+        if not self.dirty:
+            return
+
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as cache_file:
+            json.dump(self.entries, cache_file, ensure_ascii=False, indent=2, default=str)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def get_stats(self):
+        return {
+            'path': self.path,
+            'urls': len(self.entries),
+            'with_result': sum(1 for entry in self.entries.values() if entry.get('result'))
+        }
+
+
+def create_content_hash_store(config, domain):
+    """ContentHashStore do domínio, ou None se ``incremental`` estiver desligado"""
+    if not config.get('incremental'):
+        return None
+
+    folder = config.get('incremental_dir', 'cache')
+    filename = f"{domain.replace(':', '_')}_cache.json"
+    return ContentHashStore(os.path.join(folder, filename))
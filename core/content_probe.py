@@ -0,0 +1,169 @@
+# core/content_probe.py - Sonda HEAD e estatística de content-type por template de URL
+
+"""
+🔎 Sonda de content-type antes do GET
+
+URLs sem extensão (``/download?id=7``, ``/arquivo/123``) passam pelo filtro
+de extensões do URLManager e muitas vezes são PDFs ou imagens. O prober
+agrupa as URLs por template de caminho (segmentos numéricos/hash viram
+``{id}``, valores da query são descartados) e conta quantas respostas de
+cada template foram HTML.
+
+Uma URL ambígua é sondada (HEAD, ou GET com ``Range: bytes=0-0`` quando o
+servidor recusa HEAD) se o template já serviu não-HTML com frequência
+(``non_html_ratio``) ou, ainda sem estatística, se o caminho tem cara de
+download. Se a sonda responde não-HTML, o resultado sai dos headers e o GET
+não é feito; templates só de HTML nunca são sondados.
+
+Uso:
+    prober = ContentTypeProber()
+    if prober.should_probe(url):
+        probed = session_manager.probe(url)
+        if prober.use_probe(url, probed):
+            return probed                      # não-HTML: sem GET
+    response = session_manager.get(url, html_only=True)
+    prober.learn(url, response)
+"""
+
+import re
+import threading
+from urllib.parse import urlparse, parse_qsl
+
+from utils.stats import StatsCollector
+
+
+# Segmentos que identificam um item, não uma seção: números, hashes, UUIDs
+ID_SEGMENT = re.compile(r'^(\d+|[0-9a-f]{8,}|[0-9a-f]{8}(-[0-9a-f]{4}){3}-[0-9a-f]{12})$', re.IGNORECASE)
+
+# Última parte do caminho com extensão: o filtro de extensões já decidiu
+EXTENSION = re.compile(r'\.[a-z0-9]{1,5}$', re.IGNORECASE)
+
+# Caminhos que costumam servir arquivos (sondados mesmo sem estatística)
+NON_HTML_HINTS = re.compile(
+    r'(download|arquivo|anexo|attachment|file|media|documento|getfile|pdf|imagem|image)',
+    re.IGNORECASE
+)
+
+TOP_TEMPLATES_IN_STATS = 20
+
+
+def path_template(url):
+    """``host/arquivo/{id}?id=`` - chave das estatísticas de content-type"""
+    parsed = urlparse(url)
+    segments = ['{id}' if ID_SEGMENT.match(segment) else segment for segment in parsed.path.split('/')]
+    template = parsed.netloc + '/'.join(segments)
+
+    if parsed.query:
+        keys = sorted({key for key, _ in parse_qsl(parsed.query, keep_blank_values=True)})
+        template += '?' + '&'.join(f'{key}=' for key in keys)
+    return template
+
+
+def is_html_response(response):
+    return 'text/html' in response.headers.get('content-type', '').lower()
+
+
+class ContentTypeProber:
+    """Decide quais URLs sondar e aprende HTML x não-HTML por template"""
+
+    def __init__(self, non_html_ratio=0.2):
+        self.non_html_ratio = non_html_ratio
+
+        self._lock = threading.Lock()
+        self._templates = {}        # template -> {'html': n, 'non_html': n}
+        self.stats = StatsCollector(['probes', 'gets_avoided', 'probe_failures'])
+
+    def should_probe(self, url):
+        path = urlparse(url).path
+        if EXTENSION.search(path):
+            return False
+
+        counts = self._templates.get(path_template(url))
+        if counts is None:
+            return bool(NON_HTML_HINTS.search(path))
+
+        total = counts['html'] + counts['non_html']
+        return counts['non_html'] / total >= self.non_html_ratio
+
+    def learn(self, url, response):
+        """Conta a resposta (GET ou sonda) no template da URL
+        
+        Só 200 com Content-Type é evidência: erros, redirects e 304 (sem
+        Content-Type) não dizem o que o template serve.
+        """
+        if response is None or response.status_code != 200 or not response.headers.get('content-type'):
+            return
+
+        kind = 'html' if is_html_response(response) else 'non_html'
+        template = path_template(url)
+        with self._lock:
+            counts = self._templates.setdefault(template, {'html': 0, 'non_html': 0})
+            counts[kind] += 1
+
+    def use_probe(self, url, probed):
+        """Aprende com a sonda; True quando ela basta (não-HTML) e o GET pode ser pulado"""
+        self.stats.incr('probes')
+        if probed is None:
+            self.stats.incr('probe_failures')
+            return False
+
+        self.learn(url, probed)
+        if probed.status_code >= 500 or is_html_response(probed):
+            return False
+
+        self.stats.incr('gets_avoided')
+        return True
+
+    def get_stats(self):
+        with self._lock:
+            templates = sorted(self._templates.items(), key=lambda item: -item[1]['non_html'])
+
+        stats = self.stats.counters()
+        stats['templates'] = len(templates)
+        stats['non_html_templates'] = {
+            template: counts for template, counts in templates[:TOP_TEMPLATES_IN_STATS] if counts['non_html']
+        }
+        return stats
+
+
+def create_content_prober(config):
+    """ContentTypeProber a partir da config do crawler, ou None se ``content_probe`` estiver desligado"""
+    if not config.get('content_probe'):
+        return None
+
+    return ContentTypeProber(non_html_ratio=config.get('probe_non_html_ratio', 0.2))
+
+
+def test_path_template():
+    """🧪 Templates e decisão de sonda para URLs típicas"""
+    from core.session_manager import FetchedResponse
+
+    print("🧪 Testando path_template / ContentTypeProber...")
+    cases = {
+        'https://ex.com/arquivo/123': 'ex.com/arquivo/{id}',
+        'https://ex.com/download?id=9&t=x': 'ex.com/download?id=&t=',
+        'https://ex.com/doc/3f2a9c7e1b/ver': 'ex.com/doc/{id}/ver',
+        'https://ex.com/blog/meu-post': 'ex.com/blog/meu-post'
+    }
+    ok = all(path_template(url) == expected for url, expected in cases.items())
+
+    prober = ContentTypeProber()
+    hinted = prober.should_probe('https://ex.com/download?id=1')
+    plain = prober.should_probe('https://ex.com/produto/1')
+    with_extension = prober.should_probe('https://ex.com/download/manual.pdf')
+    media_host = prober.should_probe('https://media.ex.com/produto/1')
+
+    print(f"  templates: {'✅' if ok else '❌'} | dica de download sondada: {hinted} | "
+          f"página comum sondada: {plain} | com extensão sondada: {with_extension} | host media sondado: {media_host}")
+
+    not_modified = FetchedResponse(304, 'https://ex.com/arquivo/1', {}, b'')
+    prober.learn('https://ex.com/arquivo/1', not_modified)
+    learned_304 = path_template('https://ex.com/arquivo/1') in prober._templates
+
+    expected = hinted and not plain and not with_extension and not media_host and not learned_304
+    print(f"  304 contado: {learned_304}")
+    print(f"  {'✅ OK' if ok and expected else '❌ decisão inesperada'}")
+
+
+if __name__ == "__main__":
+    test_path_template()
@@ -1,17 +1,137 @@
+import os
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import heapq
+import asyncio
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
 from collections import deque
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup
 from datetime import datetime
 
-from core.session_manager import SessionManager, create_session_manager
+from core.session_manager import SessionManager, FetchedResponse, create_session_manager
 from core.url_manager import URLManager, create_url_manager
-from config.settings import DEFAULT_CONFIG, MAX_THREADS_DEFAULT
+from core.journal import CrawlJournal
+from core.content_hashes import content_hash, create_content_hash_store
+from core.content_probe import create_content_prober
+from core.parser_backend import create_parser_backend, parse_html
+from core.circuit_breaker import CircuitOpenError, CIRCUIT_OPEN_STATUS
+from core.rate_limiter import parse_retry_after
+from core.retry_policy import create_retry_policy
+from core.result_sink import SINK_EXTENSIONS, create_result_sink
+from config.settings import (
+    DEFAULT_CONFIG, MAX_THREADS_DEFAULT, MAX_CONCURRENCY_DEFAULT, OUTPUT_FOLDER, TIMESTAMP_FORMAT
+)
 from utils.constants import (
-    MSG_CRAWLER_START, MSG_PROCESSING_BATCH, MSG_CRAWL_COMPLETE,
-    MSG_ERROR_PROCESSING, MSG_NO_URLS
+    MSG_CRAWLER_START, MSG_CRAWL_PROGRESS, MSG_CRAWL_COMPLETE,
+    MSG_ERROR_PROCESSING, MSG_NO_URLS, MSG_JOURNAL_RESUMED, MSG_TIME_BUDGET_EXHAUSTED
 )
+from utils.stats import StatsCollector
+from utils.dom_visitor import DOMVisitor
+
+
+# Estado de cada processo do estágio de parse (preenchido pelo initializer)
+_parse_worker = {}
+
+# Páginas baixadas à espera do parse, por processo, antes de segurar novos downloads
+PARSE_BACKLOG_PER_PROCESS = 4
+
+
+def _init_parse_worker(analyzers, base_domain, filters_config, max_depth, parser_backend):
+    _parse_worker['analyzers'] = analyzers
+    _parse_worker['parser_backend'] = parser_backend
+    _parse_worker['url_manager'] = URLManager(base_domain, filters_config)
+    _parse_worker['max_depth'] = max_depth
+
+
+def _parse_page_in_worker(url, depth, response):
+    """Parse + parte sem estado dos analyzers + links, num processo separado
+    
+    Retorna só dados picklable: a análise por página de cada analyzer (que o
+    processo principal completa com ``finalize``), os links e os filtros aplicados.
+    """
+    url_manager = _parse_worker['url_manager']
+    url_manager.filtered_urls.clear()
+    
+    soup = parse_html(response.text, _parse_worker['parser_backend'])
+    
+    page_analysis, anchors = visit_page(
+        _parse_worker['analyzers'], soup, url, response, with_links=depth < _parse_worker['max_depth']
+    )
+    links = extract_links(url_manager, anchors, url)
+    
+    return {
+        'page_analysis': page_analysis,
+        'links': links,
+        'filtered': list(url_manager.filtered_urls)
+    }
+
+
+def _content_length(response):
+    """Bytes do corpo; se o corpo não-HTML foi descartado, o Content-Length anunciado"""
+    declared = response.headers.get('Content-Length', '')
+    if getattr(response, 'body_skipped', False) and declared.isdigit():
+        return int(declared)
+    return len(response.content)
+
+
+def visit_page(analyzers, soup, url, response, with_links=True):
+    """Parte por página de todos os analyzers + âncoras de links numa única passada pelo DOM
+    
+    Analyzers com ``visit_page`` inscrevem no visitor os elementos de que
+    precisam e montam o resultado depois da passada; os demais recebem o soup
+    em ``analyze_page``/``analyze``. Devolve ``(page_analysis, anchors)``.
+    """
+    visitor = DOMVisitor()
+    
+    finishers = []
+    for analyzer in analyzers:
+        finish = None
+        try:
+            if getattr(analyzer, 'receives_response', False) and hasattr(analyzer, 'visit_page'):
+                finish = analyzer.visit_page(visitor, url, response)
+            elif hasattr(analyzer, 'visit_page'):
+                finish = analyzer.visit_page(visitor, url)
+        except Exception:
+            finish = None  # Cai no analyze_page abaixo, que reporta o erro
+        finishers.append(finish)
+    
+    anchors = visitor.collect(tags=('a',), attrs=('href',)) if with_links else []
+    visitor.walk(soup)
+    
+    page_analysis = []
+    for analyzer, finish in zip(analyzers, finishers):
+        try:
+            if finish is not None:
+                page_analysis.append(finish())
+                continue
+            
+            analyze = getattr(analyzer, 'analyze_page', analyzer.analyze)
+            if getattr(analyzer, 'receives_response', False):
+                page_analysis.append(analyze(soup, url, response))
+            else:
+                page_analysis.append(analyze(soup, url))
+        except Exception as e:
+            page_analysis.append({'analysis_error': f"{analyzer.__class__.__name__}: {e}"})
+    
+    return page_analysis, anchors
+
+
+def extract_links(url_manager, anchors, base_url):
+    """URLs relevantes das âncoras ``<a href>`` coletadas pelo visitor"""
+    links = []
+    
+    try:
+        for tag_a in anchors:
+            href = tag_a.get('href', '').strip()
+            if href:
+                normalized_url = url_manager.normalize_url(href, base_url)
+                if normalized_url and url_manager.is_url_relevant(normalized_url):
+                    links.append(normalized_url)
+    
+    except Exception as e:
+        print(f"Erro extraindo links de {base_url}: {e}")
+    
+    return links
 
 
 class SEOCrawler:
@@ -22,22 +142,44 @@ class SEOCrawler:
         self.max_urls = self.config['crawler']['max_urls']
         self.max_depth = self.config['crawler']['max_depth']
         self.max_threads = self.config['crawler']['max_threads']
+        self.parse_processes = self.config['crawler'].get('parse_processes', 0)
+        self.time_budget = self.config['crawler'].get('time_budget', 0)
+        self.stream_parse = self.config['crawler'].get('stream_parse', False)
+        self.parser_backend = create_parser_backend(self.config['crawler'])
+        
+        # 📒 Checkpoint/resume: journal append-only do crawl
+        self.journal_file = self.config['crawler'].get('journal_file')
+        self.resume = self.config['crawler'].get('resume', False)
+        self.journal = None
+        
+        # 🧮 Recrawl incremental: hash do conteúdo + resultado por URL
+        self.content_hashes = None
+        
+        # 🔎 Sonda HEAD para URLs sem extensão com cara de arquivo
+        self.content_prober = create_content_prober(self.config['crawler'])
+        
+        # 🔁 Retries: a URL espera o backoff fora do pool, num heap por horário
+        self.retry_policy = create_retry_policy(self.config['crawler'])
+        self.retry_queue = []           # (pronta_em, seq, url, depth, último resultado)
+        self.attempt_times = {}         # url -> [ms de cada tentativa] até o resultado final
+        self._retry_seq = 0
         
         self.session_manager = None
         self.url_manager = None
         
-        self.results = []
+        self.analyzers = []
+        self.parse_pool = None
+        self.parsing = {}               # future do processo de parse -> resultado (2º estágio)
+        
+        self.results = self._create_result_sink()
         self.start_time = None
         self.end_time = None
         
-        self.stats = {
-            'urls_found': 0,
-            'urls_processed': 0,
-            'urls_successful': 0,
-            'urls_failed': 0,
-            'total_time': 0,
-            'average_response_time': 0
-        }
+        self.stats = StatsCollector(['urls_found', 'urls_processed', 'urls_successful', 'urls_failed',
+                                     'urls_unchanged', 'urls_retried', 'urls_abandoned',
+                                     'urls_truncated'])
+        self.stats.set_gauge('total_time', 0)
+        self.stats.set_gauge('average_response_time', 0)
     
     def initialize(self, start_url):
         parsed_url = urlparse(start_url)
@@ -48,7 +190,7 @@ class SEOCrawler:
         session_config = self.config.get('crawler', {})
         self.session_manager = create_session_manager(session_config, 'default')
         
-        url_config = self.config.get('filters', {})
+        url_config = self._url_manager_config()
         self.url_manager = create_url_manager('default', domain, url_config)
         self.url_manager.set_base_domain(start_url)
 
@@ -58,85 +200,358 @@ class SEOCrawler:
         
         return True
     
+    def _create_result_sink(self):
+        """💾 list em memória (padrão) ou sink em disco que libera cada resultado"""
+        sink_type = self.config['crawler'].get('result_sink', 'memory')
+        path = self.config['crawler'].get('result_sink_path')
+        
+        if not path and sink_type in SINK_EXTENSIONS:
+            folder = self.config.get('output', {}).get('folder', OUTPUT_FOLDER)
+            timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+            path = os.path.join(folder, f"crawl_results_{timestamp}{SINK_EXTENSIONS[sink_type]}")
+        
+        return create_result_sink(sink_type, path)
+    
+    def _url_manager_config(self):
+        """Filtros + limites da frontier (fila) para o URL manager"""
+        url_config = dict(self.config.get('filters', {}))
+        crawler_config = self.config.get('crawler', {})
+        url_config['frontier_memory_urls'] = crawler_config.get('frontier_memory_urls', 0)
+        url_config['frontier_dir'] = crawler_config.get('frontier_dir')
+        return url_config
+    
     def crawl(self, start_url, max_urls=None, analyzers=None):
         if max_urls:
             self.max_urls = max_urls
         
         analyzers = analyzers or []
+        self.analyzers = analyzers
+        
+        journal_state = self._load_journal()
+        if journal_state and journal_state['start_url']:
+            start_url = journal_state['start_url']
         
         if not self.initialize(start_url):
             print(MSG_NO_URLS)
             return []
         
-        while (self.url_manager.has_urls_to_process() and 
-               len(self.results) < self.max_urls):
-            
-            batch = self._create_batch()
-            
-            if not batch:
-                break
-            
-            print(MSG_PROCESSING_BATCH.format(
-                batch_size=len(batch),
-                current=len(self.results),
-                max_urls=self.max_urls
-            ))
-            
-            batch_results = self._process_batch(batch, analyzers)
-            
-            self.results.extend(batch_results)
+        self._open_journal(start_url, journal_state)
+        self.content_hashes = create_content_hash_store(self.config['crawler'], urlparse(start_url).netloc)
+        self._start_parse_pool()
+        
+        # Pool único de longa duração: cada página concluída libera o slot
+        # imediatamente e seus links voltam para a fila sem esperar as demais.
+        # O URLManager só é acessado por esta thread (scheduler). Com processos
+        # de parse, a thread de I/O entrega a página ao pool e volta a baixar:
+        # o parse termina em self.parsing, esperado junto com os downloads.
+        in_flight = {}
+        
+        with ThreadPoolExecutor(max_workers=self.max_threads) as executor:
+            self._fill_pipeline(executor, in_flight, analyzers)
             
-            self._extract_new_links(batch_results)
+            while in_flight or self.parsing or self.retry_queue:
+                if not in_flight and not self.parsing:
+                    # Só há retries em backoff: espera o próximo ficar pronto
+                    time.sleep(self._next_retry_delay())
+                    self._fill_pipeline(executor, in_flight, analyzers)
+                    continue
+                
+                done, _ = wait(
+                    list(in_flight) + list(self.parsing),
+                    timeout=self._next_retry_delay(), return_when=FIRST_COMPLETED
+                )
+                
+                for future in done:
+                    if future in self.parsing:
+                        result = self._collect_parsed(future, self.parsing.pop(future))
+                    else:
+                        url, depth = in_flight.pop(future)
+                        result = self._collect_result(future, url, depth)
+                    if result is None:
+                        continue  # Reagendada para nova tentativa, ou ainda no parse
+                    self._record_result(result)
+                    
+                    self.stats.set_gauge('in_flight', len(in_flight))
+                    self.stats.set_gauge('queue_size', self.url_manager.get_queue_size())
+                    
+                    if len(self.results) % self.max_threads == 0:
+                        print(MSG_CRAWL_PROGRESS.format(
+                            current=len(self.results),
+                            max_urls=self.max_urls,
+                            in_flight=len(in_flight),
+                            queue=self.url_manager.get_queue_size()
+                        ))
+                
+                self._fill_pipeline(executor, in_flight, analyzers)
         
         self._finalize_crawling()
         
         return self.results
     
-    def _create_batch(self):
-        batch = []
+    def _load_journal(self):
+        """Cria o journal (se configurado); no resume devolve o estado gravado"""
+        if not self.journal_file:
+            return None
+        
+        self.journal = CrawlJournal(self.journal_file)
+        if self.resume and self.journal.exists():
+            return self.journal.load()
+        return None
+    
+    def _open_journal(self, start_url, journal_state):
+        if self.journal is None:
+            return
         
-        while (len(batch) < self.max_threads and 
+        if journal_state:
+            self._restore_state(journal_state)
+            self.journal.open(resume=True)
+            print(MSG_JOURNAL_RESUMED.format(
+                path=self.journal_file,
+                done=len(self.results),
+                pending=self.url_manager.get_queue_size()
+            ))
+        else:
+            self.journal.open()
+            self.journal.record_start(start_url, self.max_urls)
+            self.journal.record_add(start_url, 0)
+    
+    def _restore_state(self, journal_state):
+        """♻️ Reconstrói resultados, URLManager e estado dos analyzers a partir do journal"""
+        # O journal é a fonte de verdade (inclusive para a URL inicial)
+        self.url_manager.reset()
+        
+        for result in journal_state['results']:
+            self.url_manager.restore_processed(result['url'])
+            self.results.append(result)
+            self._count_result(result)
+            
+            for analyzer in self.analyzers:
+                if hasattr(analyzer, 'restore'):
+                    analyzer.restore(result)
+        
+        for url, depth in journal_state['pending']:
+            self.url_manager.add_url(url, depth=depth)
+        
+        self.stats.incr('urls_found', max(journal_state['found'] - 1, 0))
+    
+    def _record_result(self, result):
+        """Enfileira os links da página e guarda o resultado (e ambos no journal)"""
+        self._extract_new_links([result])
+        self.results.append(result)
+        
+        if self.journal:
+            self.journal.record_done(result)
+    
+    def _start_parse_pool(self):
+        """Cria o estágio de parse em processos (``parse_processes`` > 0)
+        
+        As threads ficam só com I/O; parse, analyzers e extração de links rodam
+        em processos separados, sem disputar o GIL com a rede.
+        """
+        if self.parse_processes > 0:
+            # spawn: o pool sobe com threads de I/O já ativas (fork não é seguro)
+            self.parse_pool = ProcessPoolExecutor(
+                max_workers=self.parse_processes,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_parse_worker,
+                initargs=(self.analyzers, self.url_manager.base_domain,
+                          self.url_manager.config, self.max_depth, self.parser_backend)
+            )
+    
+    def _fill_pipeline(self, executor, in_flight, analyzers):
+        """Submete retries vencidos e URLs da fila até ocupar todas as threads livres"""
+        if self._budget_exhausted() or self._parse_backlogged():
+            return
+        
+        for url, depth in self._due_retries(self._in_flight_limit(self.max_threads) - len(in_flight)):
+            future = executor.submit(self._process_single_url, url, depth, analyzers)
+            in_flight[future] = (url, depth)
+        
+        while (len(in_flight) < self._in_flight_limit(self.max_threads) and
                self.url_manager.has_urls_to_process() and
-               len(self.results) + len(batch) < self.max_urls):
+               len(self.results) + len(in_flight) + len(self.parsing) + len(self.retry_queue) < self.max_urls):
             
             url, depth = self.url_manager.get_next_url()
             if url:
-                batch.append((url, depth))
+                future = executor.submit(self._process_single_url, url, depth, analyzers)
+                in_flight[future] = (url, depth)
+    
+    def _due_retries(self, slots):
+        """URLs cujo backoff já venceu, até ``slots`` delas (em ordem de horário)"""
+        now = time.monotonic()
+        while slots > 0 and self.retry_queue and self.retry_queue[0][0] <= now:
+            _, _, url, depth, _ = heapq.heappop(self.retry_queue)
+            slots -= 1
+            yield url, depth
+    
+    def _next_retry_delay(self):
+        """Segundos até o próximo retry ficar pronto (None = nenhum pendente)"""
+        if not self.retry_queue:
+            return None
+        return max(self.retry_queue[0][0] - time.monotonic(), 0)
+    
+    def _schedule_retry(self, result):
+        """Registra a tentativa; se a falha for transitória reagenda a URL com backoff
+        
+        Devolve True quando a URL foi reagendada (o resultado é descartado). No
+        resultado final ficam ``attempts`` e ``attempt_times_ms``.
+        """
+        url = result['url']
+        attempt_ms = result.pop('_attempt_ms', None)
+        retryable_error = result.pop('_retryable_error', False)
+        retry_after = result.pop('_retry_after', None)
         
-        return batch
+        times = self.attempt_times.setdefault(url, [])
+        times.append(result.get('response_time') or attempt_ms)
+        attempt = len(times)
+        
+        if (self.retry_policy.should_retry(attempt, result.get('status_code'), retryable_error) and
+                not self._budget_exhausted()):
+            ready_at = time.monotonic() + self.retry_policy.backoff(attempt, retry_after)
+            heapq.heappush(self.retry_queue, (ready_at, self._retry_seq, url, result['depth'], result))
+            self._retry_seq += 1
+            self.stats.incr('urls_retried')
+            return True
+        
+        self._finish_attempts(result)
+        return False
     
-    def _process_batch(self, batch, analyzers):
-        batch_results = []
+    def _finish_attempts(self, result):
+        times = self.attempt_times.pop(result['url'], [])
+        result['attempts'] = len(times)
+        result['attempt_times_ms'] = times
+    
+    def _budget_exhausted(self):
+        """``time_budget`` esgotado: para de agendar e fecha os retries pendentes"""
+        if not self.time_budget or time.time() - self.start_time < self.time_budget:
+            return False
         
-        with ThreadPoolExecutor(max_workers=self.max_threads) as executor:
-            futures = {
-                executor.submit(self._process_single_url, url, depth, analyzers): (url, depth)
-                for url, depth in batch
-            }
+        if not self.stats.gauges().get('time_budget_exhausted'):
+            self.stats.set_gauge('time_budget_exhausted', True)
+            print(MSG_TIME_BUDGET_EXHAUSTED.format(
+                budget=self.time_budget,
+                done=len(self.results),
+                queue=self.url_manager.get_queue_size()
+            ))
+        
+        # Retries em backoff entram no relatório com o resultado da última tentativa
+        while self.retry_queue:
+            result = heapq.heappop(self.retry_queue)[4]
+            self._finish_attempts(result)
+            self._finalize_page_analysis(result)
+            self._remember_result(result)
+            self._count_result(result)
+            self._record_result(result)
+            self.stats.incr('urls_abandoned')
+        
+        return True
+    
+    def _in_flight_limit(self, max_in_flight):
+        """Teto de páginas em voo: fixo, ou o limite AIMD atual do host do crawl"""
+        concurrency = getattr(self.session_manager, 'concurrency', None)
+        if concurrency is None:
+            return max_in_flight
+        
+        limit = min(max_in_flight, concurrency.limit(self.url_manager.base_domain))
+        self.stats.set_gauge('concurrency_limit', limit)
+        return limit
+    
+    def _parse_backlogged(self):
+        """Páginas esperando os processos de parse: acima do limite, segura novos downloads"""
+        return bool(self.parsing) and len(self.parsing) >= self.parse_processes * PARSE_BACKLOG_PER_PROCESS
+    
+    def _collect_result(self, future, url, depth):
+        """Resultado do download; None se reagendado ou entregue ao estágio de parse"""
+        try:
+            result = future.result()
+            if self._schedule_retry(result):
+                return None
             
-            for future in as_completed(futures):
-                url, depth = futures[future]
-                try:
-                    result = future.result(timeout=30)
-                    batch_results.append(result)
-                    self.stats['urls_processed'] += 1
-                    
-                    if result.get('status_code') == 200:
-                        self.stats['urls_successful'] += 1
-                    else:
-                        self.stats['urls_failed'] += 1
-                        
-                except Exception as e:
-                    print(MSG_ERROR_PROCESSING.format(url=url, error=str(e)))
-                    self.stats['urls_failed'] += 1
-                    
-                    error_result = self._create_error_result(url, depth, str(e))
-                    batch_results.append(error_result)
+            parse_future = result.pop('_parse_future', None)
+            if parse_future is not None:
+                self.parsing[parse_future] = result  # Concluído em _collect_parsed
+                return None
+            
+            return self._complete_result(result)
         
-        return batch_results
+        except Exception as e:
+            print(MSG_ERROR_PROCESSING.format(url=url, error=str(e)))
+            self.stats.incr('urls_failed')
+            
+            return self._create_error_result(url, depth, str(e))
+    
+    def _collect_parsed(self, future, result):
+        """Parse em processo concluído: completa o resultado que saiu do estágio de I/O"""
+        try:
+            self._apply_parsed(result, future.result())
+        except Exception as e:
+            print(MSG_ERROR_PROCESSING.format(url=result['url'], error=str(e)))
+            result['status_code'] = 'ERROR'
+            result['error_details'] = str(e)
+        
+        return self._complete_result(result)
+    
+    def _complete_result(self, result):
+        self._finalize_page_analysis(result)
+        self._remember_result(result)
+        self._count_result(result)
+        
+        return result
+    
+    def _count_result(self, result):
+        self.stats.incr('urls_processed')
+        
+        if result.get('status_code') == 200:
+            self.stats.incr('urls_successful')
+            if result.get('response_time'):
+                self.stats.observe('response_time_ms', result['response_time'])
+        else:
+            self.stats.incr('urls_failed')
     
     def _process_single_url(self, url, depth, analyzers):
-        result = {
+        result = self._new_result(url, depth)
+        start_time = time.time()
+        
+        try:
+            response = self._fetch(url)
+            self._process_response(result, response, analyzers)
+            
+        except Exception as e:
+            self._record_request_error(result, e)
+        
+        result['_attempt_ms'] = round((time.time() - start_time) * 1000, 2)
+        return result
+    
+    def _fetch(self, url):
+        """GET da página; URLs ambíguas passam antes pela sonda de content-type"""
+        prober = self.content_prober
+        if prober is not None and prober.should_probe(url):
+            probed = self.session_manager.probe(url)
+            if prober.use_probe(url, probed):
+                return probed  # Não-HTML: os headers da sonda bastam
+        
+        # Parse durante o download; com processos de parse o soup não atravessa o pool
+        stream_parse = self.parser_backend if self.stream_parse and not self.parse_pool else None
+        response = self.session_manager.get(url, html_only=True, stream_parse=stream_parse)
+        if prober is not None:
+            prober.learn(url, response)
+        return response
+    
+    def _record_request_error(self, result, error):
+        """Erro no download/processamento; circuito aberto vira status próprio e retry adiado"""
+        if isinstance(error, CircuitOpenError):
+            result['status_code'] = CIRCUIT_OPEN_STATUS
+            result['error_details'] = str(error)
+            result['_retryable_error'] = True
+            result['_retry_after'] = error.retry_after
+            return
+        
+        result['status_code'] = 'ERROR'
+        result['error_details'] = str(error)
+        result['_retryable_error'] = self.retry_policy.is_retryable_error(error)
+    
+    def _new_result(self, url, depth):
+        return {
             'url': url,
             'depth': depth,
             'status_code': None,
@@ -147,56 +562,157 @@ class SEOCrawler:
             'links_encontrados': [],
             'processed_at': datetime.now().isoformat()
         }
+    
+    def _process_response(self, result, response, analyzers):
+        """Parse + analyzers + links de um response já baixado (sync ou async)"""
+        url = result['url']
+        depth = result['depth']
         
-        try:
-            response = self.session_manager.get(url)
+        validators = getattr(self.session_manager, 'validators', None)
+        if response.status_code == 304 and validators is not None:
+            previous = validators.get_result(url)
+            if previous is not None:
+                self._reuse_unchanged_result(result, response, previous)
+                return result
+        
+        result.update({
+            'status_code': response.status_code,
+            'response_time': getattr(response, 'response_time_ms', 0),
+            'content_type': response.headers.get('content-type', '').split(';')[0],
+            'final_url': response.url,
+            'redirected': response.url != url,
+            'content_length': _content_length(response)
+        })
+        
+        if getattr(response, 'body_truncated', False):
+            result['body_truncated'] = True
+            self.stats.incr('urls_truncated')
+        if getattr(response, 'body_partial', False):
+            result['head_only'] = True
+        
+        if response.status_code in self.retry_policy.retry_statuses:
+            result['_retry_after'] = parse_retry_after(response.headers.get('Retry-After'))
+        
+        if (response.status_code == 200 and 
+            'text/html' in result['content_type'].lower()):
             
-            result.update({
-                'status_code': response.status_code,
-                'response_time': getattr(response, 'response_time_ms', 0),
-                'content_type': response.headers.get('content-type', '').split(';')[0],
-                'final_url': response.url,
-                'redirected': response.url != url,
-                'content_length': len(response.content)
-            })
+            if self.content_hashes is not None:
+                result['content_hash'] = content_hash(response.content)
+                previous = self.content_hashes.unchanged_result(url, result['content_hash'])
+                if previous is not None:
+                    self._reuse_unchanged_result(result, response, previous)
+                    return result
             
-            if (response.status_code == 200 and 
-                'text/html' in result['content_type'].lower()):
-                
-                html_content = response.text
-                soup = BeautifulSoup(html_content, 'html.parser')
-                
-                for analyzer in analyzers:
-                    try:
-                        analyzer_result = analyzer.analyze(soup, url)
-                        result.update(analyzer_result)
-                    except Exception as e:
-                        print(f"Erro no analisador {analyzer.__class__.__name__}: {e}")
-                
-                if depth < self.max_depth:
-                    result['links_encontrados'] = self._extract_links(soup, url)
+            if self.content_hashes is not None or validators is not None:
+                result['changed_since_last_run'] = True
             
-        except Exception as e:
-            result['status_code'] = 'ERROR'
-            result['error_details'] = str(e)
+            if self.parse_pool:
+                return self._process_response_in_pool(result, response)
+            
+            soup = getattr(response, 'soup', None)
+            if soup is None:
+                soup = parse_html(response.text, self.parser_backend)
+            
+            page_analysis, anchors = visit_page(analyzers, soup, url, response, with_links=depth < self.max_depth)
+            self._apply_page_analysis(analyzers, page_analysis, result)
+            
+            if depth < self.max_depth:
+                result['links_encontrados'] = self._extract_links(anchors, url)
         
         return result
     
-    def _extract_links(self, soup, base_url):
-        links = []
+    def _reuse_unchanged_result(self, result, response, previous):
+        """🔁 Página inalterada (304 ou mesmo hash): copia a análise do crawl anterior sem parse"""
+        reused = dict(previous)
+        reused.update({
+            'url': result['url'],
+            'depth': result['depth'],
+            'response_time': getattr(response, 'response_time_ms', 0),
+            'processed_at': result['processed_at'],
+            'changed_since_last_run': False,
+            '_reused': True
+        })
+        if 'content_hash' in result:
+            reused['content_hash'] = result['content_hash']
+        if result['depth'] >= self.max_depth:
+            reused['links_encontrados'] = []
         
-        try:
-            for tag_a in soup.find_all('a', href=True):
-                href = tag_a.get('href', '').strip()
-                if href:
-                    normalized_url = self.url_manager.normalize_url(href, base_url)
-                    if normalized_url and self.url_manager.is_url_relevant(normalized_url):
-                        links.append(normalized_url)
+        # Atualiza no lugar: o caminho async ignora o retorno de _process_response
+        result.clear()
+        result.update(reused)
+    
+    def _remember_result(self, result):
+        """Guarda a análise de páginas 200 para reuso no próximo crawl (304 ou hash igual)"""
+        if result.get('status_code') != 200:
+            return
         
-        except Exception as e:
-            print(f"Erro extraindo links de {base_url}: {e}")
+        if result.get('changed_since_last_run') is False:
+            if self.content_hashes is not None:
+                self.content_hashes.touch(result['url'])
+            return
+        
+        validators = getattr(self.session_manager, 'validators', None)
+        if validators is not None:
+            validators.save_result(result['url'], result)
+        
+        if self.content_hashes is not None and 'content_hash' in result:
+            self.content_hashes.update(result['url'], result['content_hash'], result)
+    
+    def _process_response_in_pool(self, result, response):
+        """Entrega a página ao processo de parse sem esperar (``_parse_future`` no resultado)"""
+        fetched = response
+        if not isinstance(response, FetchedResponse):
+            fetched = FetchedResponse.from_requests(response)
+        
+        result['_parse_future'] = self.parse_pool.submit(
+            _parse_page_in_worker, result['url'], result['depth'], fetched
+        )
+        
+        return result
+    
+    def _apply_parsed(self, result, parsed):
+        result['links_encontrados'] = parsed['links']
+        result['_page_analysis'] = parsed['page_analysis']
+        result['_filtered_links'] = parsed['filtered']
+    
+    def _finalize_page_analysis(self, result):
+        """Completa, na thread do scheduler, a análise feita no processo de parse"""
+        if result.pop('_reused', False):
+            # Página inalterada: só re-registra no estado dos analyzers (duplicados, stats)
+            self.stats.incr('urls_unchanged')
+            for analyzer in self.analyzers:
+                if hasattr(analyzer, 'restore'):
+                    analyzer.restore(result)
+            return
+        
+        page_analysis = result.pop('_page_analysis', None)
+        
+        for entry in result.pop('_filtered_links', []):
+            self.url_manager._log_filter(entry['reason'], entry['url'], entry['details'])
+        
+        if page_analysis is None:
+            return
         
-        return links
+        self._apply_page_analysis(self.analyzers, page_analysis, result)
+    
+    def _apply_page_analysis(self, analyzers, page_analysis, result):
+        """``finalize`` de cada analyzer (parte com estado) sobre a análise por página"""
+        for analyzer, page_data in zip(analyzers, page_analysis):
+            if 'analysis_error' in page_data:
+                print(f"Erro no analisador {page_data['analysis_error']}")
+                result['analysis_error'] = page_data['analysis_error']
+                continue
+            
+            try:
+                if hasattr(analyzer, 'finalize'):
+                    page_data = analyzer.finalize(page_data, result['url'])
+                result.update(page_data)
+            except Exception as e:
+                print(f"Erro no analisador {analyzer.__class__.__name__}: {e}")
+                result['analysis_error'] = str(e)
+    
+    def _extract_links(self, anchors, base_url):
+        return extract_links(self.url_manager, anchors, base_url)
     
     def _extract_new_links(self, batch_results):
         for result in batch_results:
@@ -204,13 +720,17 @@ class SEOCrawler:
             new_links = result.get('links_encontrados', [])
             
             for link in new_links:
-                if not self.url_manager.is_processed(link):
-                    self.url_manager.add_url(
-                        link, 
-                        depth=current_depth + 1, 
-                        base_url=result['url']
-                    )
-                    self.stats['urls_found'] += 1
+                added = self.url_manager.add_link(
+                    link, 
+                    depth=current_depth + 1, 
+                    base_url=result['url']
+                )
+                if added is None:
+                    continue  # Já processada
+                self.stats.incr('urls_found')
+                
+                if added and self.journal:
+                    self.journal.record_add(link, current_depth + 1)
     
     def _create_error_result(self, url, depth, error):
         return {
@@ -228,28 +748,45 @@ class SEOCrawler:
     
     def _finalize_crawling(self):
         self.end_time = time.time()
-        self.stats['total_time'] = self.end_time - self.start_time
+        self.stats.set_gauge('total_time', self.end_time - self.start_time)
         
         if self.stats['urls_successful'] > 0:
-            total_response_time = sum(
-                r.get('response_time', 0) for r in self.results 
-                if r.get('response_time') and r.get('status_code') == 200
-            )
-            self.stats['average_response_time'] = total_response_time / self.stats['urls_successful']
+            total_response_time = self.stats.histogram('response_time_ms')['sum']
+            self.stats.set_gauge('average_response_time', total_response_time / self.stats['urls_successful'])
         
-        url_stats = self.url_manager.get_stats()
-        self.stats.update(url_stats)
+        # Snapshot final do URLManager e da sessão (gauges sobrepõem os contadores)
+        for key, value in self.url_manager.get_stats().items():
+            self.stats.set_gauge(key, value)
         
         session_stats = self.session_manager.get_stats()
-        self.stats['session_stats'] = session_stats
+        self.stats.set_gauge('session_stats', session_stats)
         
         print(MSG_CRAWL_COMPLETE.format(total_urls=len(self.results)))
         
         self.session_manager.close()
+        
+        if self.journal:
+            self.journal.close()
+        
+        if self.content_hashes is not None:
+            self.content_hashes.save()
+            self.stats.set_gauge('content_hashes', self.content_hashes.get_stats())
+        
+        if self.content_prober is not None:
+            self.stats.set_gauge('content_probe', self.content_prober.get_stats())
+        
+        # Sinks em disco: termina a escrita (o relatório lê o arquivo depois)
+        if hasattr(self.results, 'close'):
+            self.results.close()
+        
+        if self.parse_pool:
+            self.parse_pool.shutdown()
+            self.parse_pool = None
     
     def get_stats(self):
         return {
             'crawling': self.stats.copy(),
+            'response_time_ms': self.stats.histogram('response_time_ms'),
             'urls_manager': self.url_manager.get_stats() if self.url_manager else {},
             'session_manager': self.session_manager.get_stats() if self.session_manager else {},
             'summary': {
@@ -286,7 +823,7 @@ class SmartSEOCrawler(SEOCrawler):
         session_config = self.config.get('crawler', {})
         self.session_manager = create_session_manager(session_config, 'default')
         
-        url_config = self.config.get('filters', {})
+        url_config = self._url_manager_config()
         url_config['priority_patterns'] = self.priority_patterns
         self.url_manager = create_url_manager('smart', domain, url_config)
         self.url_manager.set_base_domain(start_url)
@@ -312,7 +849,7 @@ class BatchSEOCrawler(SEOCrawler):
         session_config = self.config.get('crawler', {})
         self.session_manager = create_session_manager(session_config, 'default')
         
-        url_config = self.config.get('filters', {})
+        url_config = self._url_manager_config()
         url_config['batch_size'] = self.batch_size
         self.url_manager = create_url_manager('batch', domain, url_config)
         self.url_manager.set_base_domain(start_url)
@@ -321,17 +858,167 @@ class BatchSEOCrawler(SEOCrawler):
         
         self.start_time = time.time()
         return True
+
+
+class AsyncSEOCrawler(SEOCrawler):
+    """Crawler asyncio: fetch via AsyncSessionManager, parse/analyzers em threads
     
-    def _create_batch(self):
-        if hasattr(self.url_manager, 'get_next_batch'):
-            return self.url_manager.get_next_batch()
-        else:
-            return super()._create_batch()
+    ``max_concurrency`` requisições ficam em voo no event loop; o parse do
+    BeautifulSoup e os analyzers rodam num pool de ``max_threads`` threads para
+    não bloquear o loop. A memória fica limitada ao número de páginas em voo.
+    """
+    
+    def __init__(self, config=None):
+        super().__init__(config)
+        self.max_concurrency = self.config['crawler'].get('max_concurrency', MAX_CONCURRENCY_DEFAULT)
+        if self.stream_parse:
+            # O corpo chega pelo aiohttp; o parse em streaming só existe no fetch síncrono
+            print("⚠️ stream_parse ignorado no crawler async: o HTML é parseado após o download")
+            self.stream_parse = False
+    
+    def initialize(self, start_url):
+        parsed_url = urlparse(start_url)
+        domain = parsed_url.netloc
+        
+        print(MSG_CRAWLER_START.format(domain=domain))
+        
+        session_config = dict(self.config.get('crawler', {}))
+        session_config['max_concurrency'] = self.max_concurrency
+        self.session_manager = create_session_manager(session_config, 'async')
+        
+        url_config = self._url_manager_config()
+        self.url_manager = create_url_manager('default', domain, url_config)
+        self.url_manager.set_base_domain(start_url)
+
+        self.url_manager.add_url(start_url, depth=0)
+        
+        self.start_time = time.time()
+        return True
+    
+    def crawl(self, start_url, max_urls=None, analyzers=None):
+        if max_urls:
+            self.max_urls = max_urls
+        
+        analyzers = analyzers or []
+        self.analyzers = analyzers
+        
+        journal_state = self._load_journal()
+        if journal_state and journal_state['start_url']:
+            start_url = journal_state['start_url']
+        
+        if not self.initialize(start_url):
+            print(MSG_NO_URLS)
+            return []
+        
+        self._open_journal(start_url, journal_state)
+        self.content_hashes = create_content_hash_store(self.config['crawler'], urlparse(start_url).netloc)
+        self._start_parse_pool()
+        
+        asyncio.run(self._crawl_async(analyzers))
+        
+        self._finalize_crawling()
+        
+        return self.results
+    
+    async def _crawl_async(self, analyzers):
+        loop = asyncio.get_running_loop()
+        in_flight = {}
+        
+        with ThreadPoolExecutor(max_workers=self.max_threads) as parse_pool:
+            async with self.session_manager:
+                self._fill_async_pipeline(loop, parse_pool, in_flight, analyzers)
+                
+                while in_flight or self.retry_queue:
+                    if not in_flight:
+                        await asyncio.sleep(self._next_retry_delay())
+                        self._fill_async_pipeline(loop, parse_pool, in_flight, analyzers)
+                        continue
+                    
+                    done, _ = await asyncio.wait(
+                        in_flight, timeout=self._next_retry_delay(), return_when=asyncio.FIRST_COMPLETED
+                    )
+                    
+                    for task in done:
+                        url, depth = in_flight.pop(task)
+                        result = self._collect_result(task, url, depth)
+                        if result is None:
+                            continue  # Reagendada para nova tentativa
+                        self._record_result(result)
+                        
+                        self.stats.set_gauge('in_flight', len(in_flight))
+                        self.stats.set_gauge('queue_size', self.url_manager.get_queue_size())
+                        
+                        if len(self.results) % self.max_concurrency == 0:
+                            print(MSG_CRAWL_PROGRESS.format(
+                                current=len(self.results),
+                                max_urls=self.max_urls,
+                                in_flight=len(in_flight),
+                                queue=self.url_manager.get_queue_size()
+                            ))
+                    
+                    self._fill_async_pipeline(loop, parse_pool, in_flight, analyzers)
+    
+    def _fill_async_pipeline(self, loop, parse_pool, in_flight, analyzers):
+        if self._budget_exhausted():
+            return
+        
+        for url, depth in self._due_retries(self._in_flight_limit(self.max_concurrency) - len(in_flight)):
+            task = loop.create_task(
+                self._process_single_url_async(loop, parse_pool, url, depth, analyzers)
+            )
+            in_flight[task] = (url, depth)
+        
+        while (len(in_flight) < self._in_flight_limit(self.max_concurrency) and
+               self.url_manager.has_urls_to_process() and
+               len(self.results) + len(in_flight) + len(self.retry_queue) < self.max_urls):
+            
+            url, depth = self.url_manager.get_next_url()
+            if url:
+                task = loop.create_task(
+                    self._process_single_url_async(loop, parse_pool, url, depth, analyzers)
+                )
+                in_flight[task] = (url, depth)
+    
+    async def _process_single_url_async(self, loop, parse_pool, url, depth, analyzers):
+        result = self._new_result(url, depth)
+        start_time = time.time()
+        
+        try:
+            response = await self._fetch_async(url)
+            await loop.run_in_executor(
+                parse_pool, self._process_response, result, response, analyzers
+            )
+            
+            # Processos de parse: a task espera sem ocupar thread nem o event loop
+            parse_future = result.pop('_parse_future', None)
+            if parse_future is not None:
+                self._apply_parsed(result, await asyncio.wrap_future(parse_future))
+            
+        except Exception as e:
+            self._record_request_error(result, e)
+        
+        result['_attempt_ms'] = round((time.time() - start_time) * 1000, 2)
+        return result
+    
+    async def _fetch_async(self, url):
+        prober = self.content_prober
+        if prober is not None and prober.should_probe(url):
+            probed = await self.session_manager.probe(url)
+            if prober.use_probe(url, probed):
+                return probed
+        
+        response = await self.session_manager.get(url, html_only=True)
+        if prober is not None:
+            prober.learn(url, response)
+        return response
 
 
 def create_crawler(crawler_type='default', config=None):
     
-    if crawler_type == 'smart':
+    if crawler_type == 'async':
+        return AsyncSEOCrawler(config)
+    
+    elif crawler_type == 'smart':
         return SmartSEOCrawler(config)
     
     elif crawler_type == 'batch':
@@ -382,5 +1069,42 @@ def test_crawler():
         print(f"  Status: {first_result['status_code']}")
 
 
+def test_adaptive_limit_www_host(pages=150):
+    """🧪 Crawl de um host "www." com concorrência adaptativa: o limite deve subir"""
+    import io
+    from requests.adapters import HTTPAdapter
+    from urllib3 import HTTPResponse
+    
+    print("Testando concorrência adaptativa num host www...")
+    
+    class SiteAdapter(HTTPAdapter):
+        """Site local sem rede: cada página linka as próximas"""
+        def send(self, request, **kwargs):
+            number = int(urlparse(request.url).path.strip('/') or 0)
+            links = ''.join(f'<a href="/{n}">{n}</a>' for n in range(number + 1, min(number + 6, pages)))
+            html = f'<html><head><title>Página {number}</title></head><body>{links}</body></html>'.encode()
+            raw = HTTPResponse(body=io.BytesIO(html), status=200, preload_content=False,
+                               headers={'Content-Type': 'text/html; charset=utf-8', 'Content-Length': str(len(html))})
+            return self.build_response(request, raw)
+    
+    class LocalSiteCrawler(SEOCrawler):
+        def initialize(self, start_url):
+            super().initialize(start_url)
+            self.session_manager.session.mount('https://www.exemplo.test/', SiteAdapter())
+            return True
+    
+    crawler = LocalSiteCrawler({'crawler': {
+        'max_urls': pages, 'max_depth': pages, 'max_threads': 25,
+        'adaptive_concurrency': True, 'adaptive_initial_limit': 4
+    }})
+    results = crawler.crawl('https://www.exemplo.test/0')
+    
+    limit = crawler._in_flight_limit(25)
+    print(f"páginas: {len(results)} | limite em voo: 4 -> {limit}")
+    print('✅ OK' if limit > 4 else '❌ limite preso no valor inicial')
+
+
 if __name__ == "__main__":
-    test_crawler()
\ No newline at end of file
+    test_crawler()
+    print("\n" + "="*50 + "\n")
+    test_adaptive_limit_www_host()
\ No newline at end of file
@@ -0,0 +1,155 @@
+# core/frontier.py - Fila de URLs com janela quente em memória e excedente em disco
+
+"""
+🗂️ Frontier com spill para disco
+
+``SpillingFrontier`` tem a mesma interface de deque usada pelos URL managers
+(append, popleft, len, clear), mas guarda no máximo ``memory_urls`` tuplas
+(url, depth) em memória. O excedente vai para um arquivo de segmento
+append-only; quando a janela esvazia ela é recarregada do arquivo em ordem
+FIFO, e o arquivo é truncado assim que é totalmente consumido.
+
+Uso:
+    queue = create_frontier(memory_urls=50000)   # 0 = deque comum
+    queue.append((url, depth))
+    url, depth = queue.popleft()
+"""
+
+import os
+import tempfile
+import weakref
+from collections import deque
+
+
+def create_frontier(memory_urls=0, spill_dir=None):
+    """Fila simples em memória (padrão) ou com spill para disco"""
+    if memory_urls and memory_urls > 0:
+        return SpillingFrontier(memory_urls, spill_dir)
+    return deque()
+
+
+def _remove_segment(writer, reader, path):
+    for handle in (writer, reader):
+        if handle is not None:
+            handle.close()
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class SpillingFrontier:
+    """FIFO de (url, depth) com no máximo ``memory_urls`` itens em RAM"""
+
+    def __init__(self, memory_urls, spill_dir=None):
+        self.memory_urls = memory_urls
+        self.spill_dir = spill_dir
+
+        self.hot = deque()
+        self.spilled = 0            # Itens no arquivo ainda não lidos
+        self.total_spilled = 0      # Para estatísticas
+
+        self._path = None
+        self._writer = None
+        self._reader = None
+        self._finalizer = None
+
+    def _open_segment(self):
+        # Só cria o arquivo no primeiro spill (crawls pequenos nunca tocam o disco)
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+        fd, self._path = tempfile.mkstemp(prefix='frontier_', suffix='.seg', dir=self.spill_dir)
+        self._writer = os.fdopen(fd, 'ab')
+        self._reader = open(self._path, 'rb')
+        self._finalizer = weakref.finalize(self, _remove_segment, self._writer, self._reader, self._path)
+
+    def append(self, item):
+        # Enquanto houver itens no disco, novos itens também vão para o disco (FIFO)
+        if not self.spilled and len(self.hot) < self.memory_urls:
+            self.hot.append(item)
+            return
+
+        if self._writer is None:
+            self._open_segment()
+
+        url, depth = item
+        self._writer.write(f"{depth}\t{url}\n".encode('utf-8'))
+        self.spilled += 1
+        self.total_spilled += 1
+
+    def popleft(self):
+        if not self.hot and self.spilled:
+            self._refill()
+        if not self.hot:
+            raise IndexError('pop from an empty frontier')
+        return self.hot.popleft()
+
+    def _refill(self):
+        self._writer.flush()
+
+        for _ in range(min(self.memory_urls, self.spilled)):
+            depth, url = self._reader.readline().decode('utf-8').rstrip('\n').split('\t', 1)
+            self.hot.append((url, int(depth)))
+            self.spilled -= 1
+
+        if not self.spilled:
+            self._truncate()
+
+    def _truncate(self):
+        if self._writer is not None:
+            self._writer.truncate(0)
+            self._reader.seek(0)
+
+    def __len__(self):
+        return len(self.hot) + self.spilled
+
+    def clear(self):
+        self.hot.clear()
+        self.spilled = 0
+        self._truncate()
+
+    def close(self):
+        """Fecha e remove o arquivo de segmento"""
+        if self._finalizer is not None:
+            self._finalizer()
+        self._path = self._writer = self._reader = self._finalizer = None
+        self.hot.clear()
+        self.spilled = 0
+
+    def get_stats(self):
+        return {
+            'in_memory': len(self.hot),
+            'on_disk': self.spilled,
+            'total_spilled': self.total_spilled,
+            'memory_urls': self.memory_urls
+        }
+
+
+def test_spilling_frontier(urls=100000, memory_urls=1000):
+    """🧪 Verifica ordem FIFO e memória limitada com intercalação de append/popleft"""
+    print(f"🧪 Testando SpillingFrontier ({urls} URLs, janela de {memory_urls})...")
+    frontier = SpillingFrontier(memory_urls)
+    expected = deque()
+    max_hot = 0
+    errors = 0
+
+    for i in range(urls):
+        item = (f"https://example.com/produto/{i}", i % 7)
+        frontier.append(item)
+        expected.append(item)
+        max_hot = max(max_hot, len(frontier.hot))
+        # Consome um item a cada três adicionados
+        if i % 3 == 0 and frontier.popleft() != expected.popleft():
+            errors += 1
+
+    while frontier:
+        if frontier.popleft() != expected.popleft():
+            errors += 1
+
+    print(f"  stats: {frontier.get_stats()} | maior janela: {max_hot}")
+    frontier.close()
+    print(f"  {'✅ OK' if not errors and not expected and max_hot <= memory_urls else '❌ ordem incorreta'}")
+
+
+if __name__ == "__main__":
+    test_spilling_frontier()
@@ -0,0 +1,340 @@
+# core/http_cache.py - Cache HTTP persistente (corpos por hash + índice de URLs)
+
+"""
+🗄️ Cache de respostas HTTP em disco
+
+- Corpos comprimidos (zlib) endereçados pelo sha256 do conteúdo: páginas
+  idênticas (ex.: mesma página com parâmetros diferentes) ocupam um arquivo só
+- Índice SQLite por URL: status, URL final, headers, encoding e horários
+- TTL: entradas mais velhas que ``ttl_seconds`` não são servidas
+- Limite de tamanho: ao passar de ``max_bytes`` remove expiradas e depois as
+  menos usadas recentemente (LRU) até voltar a 90% do limite
+
+Uso (via SessionManager com ``http_cache`` ligado na config do crawler):
+    cache = HTTPCache('cache/http', max_bytes=500 * 1024 ** 2, ttl_seconds=86400)
+    response = cache.get(url) or session.get(url)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from config.settings import HTTP_CACHE_FOLDER, HTTP_CACHE_MAX_MB, HTTP_CACHE_TTL_HOURS
+from utils.stats import StatsCollector
+
+
+# Status que podem ser reutilizados sem revalidação (RFC 7231, 6.1)
+CACHEABLE_STATUS = {200, 203, 300, 301, 308, 404, 410}
+
+CACHE_COUNTERS = ['hits', 'misses', 'expired', 'stores', 'evictions', 'store_errors']
+
+
+class HTTPCache:
+    """Cache HTTP content-addressed com TTL e evicção LRU por tamanho"""
+
+    def __init__(self, folder, max_bytes=500 * 1024 ** 2, ttl_seconds=7 * 24 * 3600):
+        self.folder = folder
+        self.bodies_folder = os.path.join(folder, 'bodies')
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        os.makedirs(self.bodies_folder, exist_ok=True)
+
+        # Uma conexão compartilhada pelas threads de I/O, serializada pelo lock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(folder, 'index.sqlite'), check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute('''
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                body_hash TEXT NOT NULL,
+                status_code INTEGER,
+                final_url TEXT,
+                headers TEXT,
+                encoding TEXT,
+                stored_at REAL,
+                last_access REAL
+            )''')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS bodies (hash TEXT PRIMARY KEY, size INTEGER, refs INTEGER)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)')
+        self._db.commit()
+
+        self.total_bytes = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM bodies').fetchone()[0]
+        self.entries = self._db.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+        self.stats = StatsCollector(CACHE_COUNTERS)
+
+    def _body_path(self, body_hash):
+        return os.path.join(self.bodies_folder, body_hash[:2], body_hash + '.z')
+
+    # ========================
+    # 📖 LEITURA
+    # ========================
+
+    def lookup(self, url):
+        """Entrada do índice (dict) mesmo se expirada, ou None"""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT body_hash, status_code, final_url, headers, encoding, stored_at '
+                'FROM entries WHERE url = ?', (url,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        body_hash, status_code, final_url, headers, encoding, stored_at = row
+        return {
+            'url': url,
+            'body_hash': body_hash,
+            'status_code': status_code,
+            'final_url': final_url,
+            'headers': json.loads(headers),
+            'encoding': encoding,
+            'stored_at': stored_at,
+            'expired': time.time() - stored_at > self.ttl_seconds
+        }
+
+    def load_body(self, entry):
+        try:
+            with open(self._body_path(entry['body_hash']), 'rb') as body_file:
+                return zlib.decompress(body_file.read())
+        except (OSError, zlib.error):
+            return None
+
+    def touch(self, url):
+        with self._lock:
+            self._db.execute('UPDATE entries SET last_access = ? WHERE url = ?', (time.time(), url))
+            self._db.commit()
+
+    def get(self, url):
+        """FetchedResponse do cache, ou None (ausente, expirado ou corpo perdido)"""
+        # Import local: session_manager importa este módulo
+        from core.session_manager import FetchedResponse
+
+        entry = self.lookup(url)
+        if entry is None:
+            self.stats.incr('misses')
+            return None
+
+        if entry['expired']:
+            self.stats.incr('expired')
+            self.stats.incr('misses')
+            return None
+
+        content = self.load_body(entry)
+        if content is None:
+            self.stats.incr('misses')
+            return None
+
+        self.touch(url)
+        self.stats.incr('hits')
+
+        response = FetchedResponse(
+            status_code=entry['status_code'],
+            url=entry['final_url'],
+            headers=entry['headers'],
+            content=content,
+            encoding=entry['encoding']
+        )
+        response.from_cache = True
+        return response
+
+    # ========================
+    # ✍️ ESCRITA
+    # ========================
+
+    def put(self, url, response):
+        """Guarda o response (requests.Response ou FetchedResponse) se o status permitir"""
+        if response.status_code not in CACHEABLE_STATUS:
+            return False
+        if any(getattr(response, flag, False) for flag in ('body_skipped', 'body_truncated', 'body_partial')):
+            return False  # Corpo ausente ou incompleto: o próximo crawl baixa de novo
+
+        content = response.content or b''
+        body_hash = hashlib.sha256(content).hexdigest()
+        encoding = (getattr(response, 'encoding', None) or
+                    getattr(response, 'apparent_encoding', None) or 'utf-8')
+        headers = json.dumps(dict(response.headers))
+        now = time.time()
+
+        # Compressão fora do lock; corpo já gravado (mesmo hash) não é recomprimido
+        body_path = self._body_path(body_hash)
+        compressed = None if os.path.exists(body_path) else zlib.compress(content, 6)
+
+        with self._lock:
+            # Arquivo, tamanho e refs sob o lock: a evicção (_release_body) apaga o
+            # mesmo arquivo endereçado pelo hash em outra thread
+            try:
+                size = self._store_body(body_path, content, compressed)
+            except OSError:
+                self.stats.incr('store_errors')  # Disco cheio/sem permissão: segue sem cache
+                return False
+
+            previous = self._db.execute('SELECT body_hash FROM entries WHERE url = ?', (url,)).fetchone()
+            if previous and previous[0] == body_hash:
+                self._db.execute(
+                    'UPDATE entries SET status_code = ?, final_url = ?, headers = ?, encoding = ?, '
+                    'stored_at = ?, last_access = ? WHERE url = ?',
+                    (response.status_code, response.url, headers, encoding, now, now, url)
+                )
+            else:
+                if previous:
+                    self._release_body(previous[0])
+                else:
+                    self.entries += 1
+                self._acquire_body(body_hash, size)
+                self._db.execute(
+                    'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (url, body_hash, response.status_code, response.url, headers, encoding, now, now)
+                )
+
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+            self._db.commit()
+
+        self.stats.incr('stores')
+        return True
+
+    def _store_body(self, body_path, content, compressed):
+        """Grava o corpo se o arquivo não existe (tmp + rename atômico); devolve o tamanho (chamado com o lock)"""
+        if os.path.exists(body_path):
+            return os.path.getsize(body_path)
+
+        if compressed is None:  # Apagado pela evicção depois da checagem fora do lock
+            compressed = zlib.compress(content, 6)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        tmp_path = f"{body_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as body_file:
+            body_file.write(compressed)
+        os.replace(tmp_path, body_path)
+        return len(compressed)
+
+    def _acquire_body(self, body_hash, size):
+        updated = self._db.execute('UPDATE bodies SET refs = refs + 1 WHERE hash = ?', (body_hash,))
+        if not updated.rowcount:
+            self._db.execute('INSERT INTO bodies VALUES (?, ?, 1)', (body_hash, size))
+            self.total_bytes += size
+
+    def _release_body(self, body_hash):
+        self._db.execute('UPDATE bodies SET refs = refs - 1 WHERE hash = ?', (body_hash,))
+        row = self._db.execute('SELECT size, refs FROM bodies WHERE hash = ?', (body_hash,)).fetchone()
+        if row and row[1] <= 0:
+            self._db.execute('DELETE FROM bodies WHERE hash = ?', (body_hash,))
+            self.total_bytes -= row[0]
+            try:
+                os.remove(self._body_path(body_hash))
+            except OSError:
+                pass
+
+    def _delete_entry(self, url, body_hash):
+        self._db.execute('DELETE FROM entries WHERE url = ?', (url,))
+        self.entries -= 1
+        self._release_body(body_hash)
+        self.stats.incr('evictions')
+
+    def _evict(self):
+        """Remove expiradas e depois LRU até 90% de ``max_bytes`` (chamado com o lock)"""
+        target = self.max_bytes * 0.9
+
+        expired_before = time.time() - self.ttl_seconds
+        for url, body_hash in self._db.execute(
+            'SELECT url, body_hash FROM entries WHERE stored_at < ?', (expired_before,)
+        ).fetchall():
+            self._delete_entry(url, body_hash)
+
+        while self.total_bytes > target:
+            oldest = self._db.execute(
+                'SELECT url, body_hash FROM entries ORDER BY last_access LIMIT 100'
+            ).fetchall()
+            if not oldest:
+                break
+            for url, body_hash in oldest:
+                self._delete_entry(url, body_hash)
+                if self.total_bytes <= target:
+                    break
+
+    # ========================
+    # 📊 ESTATÍSTICAS / CICLO DE VIDA
+    # ========================
+
+    def get_stats(self):
+        counters = self.stats.counters()
+        lookups = counters['hits'] + counters['misses']
+
+        counters.update({
+            'hit_rate': round(counters['hits'] / lookups * 100, 2) if lookups else 0,
+            'entries': self.entries,
+            'total_bytes': self.total_bytes,
+            'max_bytes': self.max_bytes
+        })
+        return counters
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.commit()
+                self._db.close()
+                self._db = None
+
+
+def create_http_cache(config):
+    """HTTPCache a partir da config do crawler, ou None se ``http_cache`` estiver desligado"""
+    if not config.get('http_cache'):
+        return None
+
+    return HTTPCache(
+        config.get('http_cache_dir', HTTP_CACHE_FOLDER),
+        max_bytes=int(config.get('http_cache_max_mb', HTTP_CACHE_MAX_MB) * 1024 ** 2),
+        ttl_seconds=config.get('http_cache_ttl_hours', HTTP_CACHE_TTL_HOURS) * 3600
+    )
+
+
+def test_http_cache_concurrent_put(threads=8, puts_per_thread=300, distinct_bodies=20):
+    """🧪 put() em paralelo com evicção constante: sem erro e sem entrada apontando para corpo apagado"""
+    import random
+    import shutil
+    import tempfile
+    from core.session_manager import FetchedResponse
+
+    print(f"🧪 Testando HTTPCache.put concorrente ({threads} threads, evicção a cada put)...")
+    folder = tempfile.mkdtemp()
+    cache = HTTPCache(folder, max_bytes=4096)  # Cabem ~2 corpos: quase todo put dispara _evict
+    # Corpos incompressíveis: cada um ocupa ~1,5 KB no disco e o limite força evicções
+    bodies = [random.Random(n).randbytes(1500) for n in range(distinct_bodies)]
+    errors = []
+
+    def worker(worker_id):
+        try:
+            for n in range(puts_per_thread):
+                body = bodies[(worker_id + n) % distinct_bodies]
+                response = FetchedResponse(200, f'https://ex.com/{worker_id}/{n % 50}', {'Content-Type': 'text/html'}, body)
+                cache.put(response.url, response)
+        except Exception as e:
+            errors.append(e)
+
+    workers = [threading.Thread(target=worker, args=(worker_id,)) for worker_id in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    missing = [
+        url for url, body_hash in cache._db.execute('SELECT url, body_hash FROM entries').fetchall()
+        if not os.path.exists(cache._body_path(body_hash))
+    ]
+    print(f"  erros: {len(errors)} | entradas sem corpo: {len(missing)} | stats: {cache.get_stats()}")
+    print(f"  {'✅ OK' if not errors and not missing else '❌ corrida entre put e evicção'}")
+
+    cache.close()
+    shutil.rmtree(folder, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_http_cache_concurrent_put()
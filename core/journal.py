@@ -0,0 +1,91 @@
+# core/journal.py - Journal append-only do crawl (checkpoint/resume)
+
+"""
+📒 Journal de checkpoint do crawl
+
+Cada evento vira uma linha JSON, gravada e descarregada (flush) na hora:
+- ``start``: URL inicial e limite de URLs
+- ``add``: URL entrou na frontier (url, depth)
+- ``done``: página concluída, com o resultado completo
+
+Para retomar, ``load()`` reconstrói os resultados já concluídos e as URLs
+adicionadas e ainda não concluídas (incluindo as que estavam em andamento
+quando o processo morreu). Uma última linha truncada pelo crash é ignorada.
+"""
+
+import json
+import os
+
+
+class CrawlJournal:
+    """Journal JSON-lines de adições à frontier e páginas concluídas"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.records_written = 0
+
+    def exists(self):
+        return os.path.exists(self.path) and os.path.getsize(self.path) > 0
+
+    def open(self, resume=False):
+        """Abre para escrita: continua o arquivo (resume) ou começa do zero"""
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+
+        # Crash no meio de uma linha: fecha a linha truncada antes de continuar
+        if resume and self.file.tell() > 0:
+            with open(self.path, 'rb') as journal_file:
+                journal_file.seek(-1, os.SEEK_END)
+                if journal_file.read(1) != b'\n':
+                    self.file.write('\n')
+
+    def _write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+        self.file.flush()
+        self.records_written += 1
+
+    def record_start(self, start_url, max_urls):
+        self._write({'type': 'start', 'start_url': start_url, 'max_urls': max_urls})
+
+    def record_add(self, url, depth):
+        self._write({'type': 'add', 'url': url, 'depth': depth})
+
+    def record_done(self, result):
+        self._write({'type': 'done', 'result': result})
+
+    def load(self):
+        """Estado do crawl gravado: start_url, results e pending [(url, depth)]"""
+        state = {'start_url': None, 'max_urls': None, 'results': [], 'pending': [], 'found': 0}
+        added = {}
+        done = set()
+
+        with open(self.path, encoding='utf-8') as journal_file:
+            for line in journal_file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Linha truncada pelo crash
+
+                record_type = record.get('type')
+                if record_type == 'start' and state['start_url'] is None:
+                    state['start_url'] = record['start_url']
+                    state['max_urls'] = record.get('max_urls')
+                elif record_type == 'add':
+                    added.setdefault(record['url'], record['depth'])
+                elif record_type == 'done':
+                    url = record['result']['url']
+                    if url not in done:
+                        done.add(url)
+                        state['results'].append(record['result'])
+
+        state['found'] = len(added)
+        state['pending'] = [(url, depth) for url, depth in added.items() if url not in done]
+        return state
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
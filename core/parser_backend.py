@@ -0,0 +1,91 @@
+# core/parser_backend.py - Backend de parse HTML do BeautifulSoup (lxml por padrão)
+
+"""
+🧩 Backend de parse selecionável
+
+O soup de cada página pode ser montado por:
+- ``lxml``: tokenizador em C (padrão); como a montagem da árvore do bs4
+  domina o custo, o ganho sobre ``html.parser`` em páginas reais é modesto
+- ``html.parser``: stdlib, sempre disponível
+- ``html5lib``: parse idêntico ao de um navegador, bem mais lento
+
+Fora do escopo: um caminho sem BeautifulSoup (selectolax e similares). Os
+analyzers e a extração de links usam a API do bs4 (``Tag``, ``get_text``,
+``attrs``); outra árvore exigiria portar todos eles, então só os tree
+builders do bs4 são oferecidos.
+
+``parser_backend`` é resolvido uma vez por crawl: se o backend pedido não
+estiver instalado, cai para o próximo de ``FALLBACK_ORDER`` e avisa. Os
+analyzers só usam a API do BeautifulSoup, então o resultado é o mesmo em
+qualquer backend para HTML bem formado (o benchmark em
+``benchmarks/bench_parser_backends.py`` compara tempo e resultados).
+
+Uso:
+    backend = resolve_parser_backend(config.get('parser_backend', 'lxml'))
+    soup = parse_html(response.text, backend)
+"""
+
+from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
+
+
+PARSER_BACKENDS = ('lxml', 'html.parser', 'html5lib')
+DEFAULT_PARSER_BACKEND = 'lxml'
+
+# Ordem de queda quando o backend pedido não está instalado
+FALLBACK_ORDER = ('lxml', 'html.parser')
+
+
+def backend_available(name):
+    return builder_registry.lookup(name) is not None
+
+
+def available_backends():
+    return [name for name in PARSER_BACKENDS if backend_available(name)]
+
+
+def resolve_parser_backend(preferred=DEFAULT_PARSER_BACKEND):
+    """Nome do backend a usar: o pedido, se instalado, senão o primeiro disponível"""
+    if preferred not in PARSER_BACKENDS:
+        raise ValueError(f"Backend de parse desconhecido: {preferred} (opções: {', '.join(PARSER_BACKENDS)})")
+
+    for name in (preferred,) + FALLBACK_ORDER:
+        if backend_available(name):
+            if name != preferred:
+                print(f"⚠️ Backend de parse '{preferred}' não instalado - usando '{name}'")
+            return name
+
+    return 'html.parser'  # stdlib: sempre registrado no bs4
+
+
+def parse_html(html, backend=DEFAULT_PARSER_BACKEND):
+    return BeautifulSoup(html, backend)
+
+
+def create_parser_backend(config):
+    """Backend resolvido a partir da config do crawler (``parser_backend``)"""
+    return resolve_parser_backend(config.get('parser_backend', DEFAULT_PARSER_BACKEND))
+
+
+def test_parser_backends():
+    """🧪 Title, H1 e links iguais em todos os backends instalados"""
+    print(f"🧪 Testando backends de parse (instalados: {', '.join(available_backends())})...")
+    html = ('<html><head><title>Página de teste</title>'
+            '<meta name="description" content="Descrição"></head>'
+            '<body><h1>Título</h1><p>texto<a href="/a">a</a><a href="/b">b</a></body></html>')
+
+    extracted = {}
+    for backend in available_backends():
+        soup = parse_html(html, backend)
+        extracted[backend] = (
+            soup.title.get_text(),
+            soup.find('h1').get_text(),
+            tuple(a['href'] for a in soup.find_all('a', href=True))
+        )
+        print(f"  {backend}: {extracted[backend]}")
+
+    print(f"  {'✅ OK' if len(set(extracted.values())) == 1 else '❌ backends divergem'}")
+
+
+if __name__ == "__main__":
+    test_parser_backends()
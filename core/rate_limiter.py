@@ -0,0 +1,202 @@
+# core/rate_limiter.py - Token bucket por host, seguro com muitas threads
+
+"""
+🪣 Rate limiting por token bucket
+
+Cada host tem um balde com capacidade ``burst`` que se reabastece a
+``rate`` tokens por segundo. ``reserve(host)`` consome um token e devolve
+quanto esperar antes de enviar a requisição: 0 quando há token (só um lock
+curto e aritmética), ou o tempo até o token reservado existir. Como a
+reserva é feita dentro do lock e a espera fora dele, N threads recebem
+esperas escalonadas (1/rate, 2/rate, ...) em vez de dormirem em sincronia.
+
+``Retry-After`` (429/503) bloqueia o host até o instante indicado: o balde
+fica com um token e só volta a encher depois da pausa, então as reservas
+feitas durante ela saem escalonadas a ``rate`` a partir do fim da pausa (e
+não todas juntas, que é a rajada que o Retry-After quer evitar).
+
+Uso:
+    limiter = TokenBucketRateLimiter(rate=10, burst=20)
+    limiter.acquire('exemplo.com')                 # threads (dorme se preciso)
+    await asyncio.sleep(limiter.reserve(host))     # asyncio
+    limiter.penalize(host, parse_retry_after(response.headers.get('Retry-After')))
+"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from utils.stats import StatsCollector
+
+
+MAX_RETRY_AFTER_SECONDS = 300   # Ignora pedidos de pausa absurdos
+
+
+def parse_retry_after(value):
+    """Segundos de um header Retry-After (delta em segundos ou HTTP-date), ou None"""
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        seconds = int(value)
+    else:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError, OverflowError):
+            return None
+
+    return min(max(seconds, 0), MAX_RETRY_AFTER_SECONDS)
+
+
+class TokenBucketRateLimiter:
+    """Token bucket por host (ou global) com burst e pausa por Retry-After"""
+
+    def __init__(self, rate, burst=None, per_host=True):
+        self.rate = float(rate)
+        self.burst = float(burst or max(rate, 1))
+        self.per_host = per_host
+
+        self._lock = threading.Lock()
+        self._buckets = {}      # host -> [tokens, reabastece a partir de (futuro durante Retry-After)]
+        self.stats = StatsCollector(['reservations', 'throttled', 'retry_after'])
+
+    def _bucket_key(self, host):
+        return host if self.per_host else '*'
+
+    def reserve(self, host):
+        """Consome um token do host e devolve quantos segundos esperar (0 = já)"""
+        now = time.monotonic()
+
+        with self._lock:
+            bucket = self._buckets.get(self._bucket_key(host))
+            if bucket is None:
+                bucket = [self.burst, now]
+                self._buckets[self._bucket_key(host)] = bucket
+
+            tokens, refill_from = bucket
+            if now > refill_from:
+                tokens = min(self.burst, tokens + (now - refill_from) * self.rate)
+                refill_from = now
+
+            # Token negativo = reserva de um token futuro (fila implícita),
+            # contada a partir do fim da pausa quando o host está bloqueado
+            tokens -= 1
+            wait = refill_from - now
+            if tokens < 0:
+                wait += -tokens / self.rate
+
+            bucket[0] = tokens
+            bucket[1] = refill_from
+
+        self.stats.incr('reservations')
+        if wait > 0:
+            self.stats.incr('throttled')
+            self.stats.observe('wait_ms', wait * 1000)
+        return wait
+
+    def acquire(self, host):
+        """Versão bloqueante de ``reserve`` para threads"""
+        wait = self.reserve(host)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def penalize(self, host, seconds):
+        """Retry-After: nenhuma requisição ao host antes de ``seconds`` a partir de agora"""
+        if not seconds:
+            return
+
+        now = time.monotonic()
+        until = now + seconds
+        with self._lock:
+            bucket = self._buckets.setdefault(self._bucket_key(host), [self.burst, now])
+            # Reservas já feitas que saem depois da pausa continuam na fila
+            queue_end = bucket[1] + max(-bucket[0], 0) / self.rate
+            if until > queue_end:
+                bucket[0] = 1.0
+                bucket[1] = until
+        self.stats.incr('retry_after')
+
+    def get_stats(self):
+        counters = self.stats.counters()
+        counters.update({
+            'rate_per_second': self.rate,
+            'burst': self.burst,
+            'per_host': self.per_host,
+            'hosts': len(self._buckets),
+            'wait_ms': self.stats.histogram('wait_ms')
+        })
+        return counters
+
+
+def create_rate_limiter(config):
+    """Limiter a partir da config do crawler, ou None se ``requests_per_second`` não estiver definido"""
+    rate = config.get('requests_per_second')
+    if not rate:
+        return None
+
+    return TokenBucketRateLimiter(
+        rate,
+        burst=config.get('rate_burst'),
+        per_host=config.get('rate_per_host', True)
+    )
+
+
+def test_token_bucket(threads=25, requests_per_thread=8, rate=50, burst=10):
+    """🧪 25 threads disputando um host: vazão deve ficar em ~rate req/s após o burst"""
+    print(f"🧪 Testando TokenBucketRateLimiter ({threads} threads, {rate} req/s, burst {burst})...")
+    limiter = TokenBucketRateLimiter(rate, burst)
+    sent_at = []
+    sent_lock = threading.Lock()
+
+    def worker():
+        for _ in range(requests_per_thread):
+            limiter.acquire('exemplo.com')
+            with sent_lock:
+                sent_at.append(time.monotonic())
+
+    start = time.monotonic()
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    elapsed = time.monotonic() - start
+    total = threads * requests_per_thread
+    expected = (total - burst) / rate
+    print(f"  {total} requisições em {elapsed:.2f}s (esperado ~{expected:.2f}s)")
+    print(f"  stats: throttled={limiter.stats['throttled']} espera média={limiter.stats.histogram('wait_ms')['avg']:.1f}ms")
+    print(f"  {'✅ OK' if abs(elapsed - expected) < 0.5 else '❌ vazão fora do esperado'}")
+
+
+def test_retry_after_spacing(threads=10, rate=20, burst=10, pause=0.5):
+    """🧪 Threads esperando um Retry-After devem voltar a ~rate req/s, não em rajada"""
+    print(f"🧪 Testando Retry-After com {threads} threads ({rate} req/s, pausa {pause}s)...")
+    limiter = TokenBucketRateLimiter(rate, burst)
+    limiter.penalize('exemplo.com', pause)
+    sent_at = []
+    sent_lock = threading.Lock()
+
+    def worker():
+        limiter.acquire('exemplo.com')
+        with sent_lock:
+            sent_at.append(time.monotonic())
+
+    start = time.monotonic()
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    first, span = min(sent_at) - start, max(sent_at) - min(sent_at)
+    expected_span = (threads - 1) / rate
+    print(f"  primeira após {first:.2f}s | intervalo das {threads}: {span:.2f}s (esperado ~{expected_span:.2f}s)")
+    print(f"  {'✅ OK' if first >= pause * 0.9 and span >= expected_span * 0.9 else '❌ rajada no fim da pausa'}")
+
+
+if __name__ == "__main__":
+    test_token_bucket()
+    test_retry_after_spacing()
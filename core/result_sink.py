@@ -0,0 +1,223 @@
+# core/result_sink.py - Destino dos resultados do crawl (memória ou disco)
+
+"""
+💾 Result sinks: cada resultado é gravado quando a página termina
+
+Com um sink em disco o crawler não acumula os dicts de resultado (sequências
+de headings, recursos de mixed content, campos duplicados do Excel); o
+relatório lê os resultados de volta do arquivo, em ordem.
+
+O ganho de memória é da fase de crawl. A geração do Excel continua O(N): o
+DataFrame principal tem todas as páginas (abas de duplicados, ranking e
+resumo são calculadas sobre ele) e o xlsxwriter guarda todas as células até
+o ``close``. Para crawls grandes demais para o relatório, o próprio arquivo
+do sink é a saída.
+
+Interface comum (a mesma de ``list`` usada pelo crawler):
+    sink.append(result)     # grava
+    len(sink)               # resultados gravados
+    for result in sink:     # lê de volta, na ordem de gravação
+    sink.close()            # termina a escrita (a leitura continua possível)
+
+Tipos: 'memory' (list comum, padrão), 'jsonl', 'sqlite', 'parquet' (pyarrow).
+"""
+
+import json
+import os
+import sqlite3
+
+try:
+    import pyarrow
+    import pyarrow.parquet as pyarrow_parquet
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pyarrow = None
+    pyarrow_parquet = None
+    PYARROW_AVAILABLE = False
+
+
+SINK_EXTENSIONS = {
+    'jsonl': '.jsonl',
+    'sqlite': '.sqlite',
+    'parquet': '.parquet'
+}
+
+
+def _dumps(result):
+    return json.dumps(result, ensure_ascii=False, default=str)
+
+
+def create_result_sink(sink_type='memory', path=None):
+    """🏭 list comum (padrão) ou sink em disco no caminho indicado"""
+    if sink_type == 'jsonl':
+        return JSONLResultSink(path)
+    elif sink_type == 'sqlite':
+        return SQLiteResultSink(path)
+    elif sink_type == 'parquet':
+        return ParquetResultSink(path)
+    else:
+        return []
+
+
+class JSONLResultSink:
+    """Um resultado JSON por linha"""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self.file = None
+
+    def append(self, result):
+        if self.file is None:
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            # Reabertura depois de close() continua o arquivo
+            self.file = open(self.path, 'a' if self.count else 'w', encoding='utf-8')
+
+        self.file.write(_dumps(result) + '\n')
+        self.count += 1
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        if not self.count:
+            return
+        if self.file is not None:
+            self.file.flush()
+
+        with open(self.path, encoding='utf-8') as results_file:
+            for line in results_file:
+                yield json.loads(line)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class SQLiteResultSink:
+    """Tabela ``results`` (id, url, data JSON), commit a cada ``commit_every`` linhas"""
+
+    def __init__(self, path, commit_every=500):
+        self.path = path
+        self.commit_every = commit_every
+        self.count = 0
+        self.pending = 0
+        self.connection = None
+
+    def _connect(self):
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        if not self.count:
+            self.connection.execute('DROP TABLE IF EXISTS results')
+            self.connection.execute(
+                'CREATE TABLE results (id INTEGER PRIMARY KEY, url TEXT, data TEXT NOT NULL)'
+            )
+
+    def append(self, result):
+        if self.connection is None:
+            self._connect()
+
+        self.connection.execute(
+            'INSERT INTO results (url, data) VALUES (?, ?)', (result.get('url'), _dumps(result))
+        )
+        self.count += 1
+        self.pending += 1
+
+        if self.pending >= self.commit_every:
+            self.connection.commit()
+            self.pending = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        if not self.count:
+            return
+        if self.connection is not None:
+            self.connection.commit()
+
+        connection = sqlite3.connect(self.path)
+        try:
+            for (data,) in connection.execute('SELECT data FROM results ORDER BY id'):
+                yield json.loads(data)
+        finally:
+            connection.close()
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.commit()
+            self.connection.close()
+            self.connection = None
+
+
+class ParquetResultSink:
+    """Parquet (colunas url + result JSON), um row group a cada ``batch_size`` resultados
+
+    Os dicts de resultado têm chaves e tipos variáveis entre páginas, então o
+    resultado vai serializado numa coluna; ``url`` fica separada para consulta.
+    """
+
+    def __init__(self, path, batch_size=1000):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow não instalado: pip install pyarrow")
+
+        self.path = path
+        self.batch_size = batch_size
+        self.count = 0
+        self.buffer_urls = []
+        self.buffer_results = []
+        self.writer = None
+        self.closed = False
+        self.schema = pyarrow.schema([('url', pyarrow.string()), ('result', pyarrow.string())])
+
+    def append(self, result):
+        if self.closed:
+            raise ValueError("Parquet já finalizado: não aceita novos resultados")
+
+        self.buffer_urls.append(result.get('url'))
+        self.buffer_results.append(_dumps(result))
+        self.count += 1
+
+        if len(self.buffer_results) >= self.batch_size:
+            self._write_batch()
+
+    def _write_batch(self):
+        if not self.buffer_results:
+            return
+
+        if self.writer is None:
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            self.writer = pyarrow_parquet.ParquetWriter(self.path, self.schema)
+
+        table = pyarrow.table({'url': self.buffer_urls, 'result': self.buffer_results}, schema=self.schema)
+        self.writer.write_table(table)
+        self.buffer_urls = []
+        self.buffer_results = []
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        if not self.count:
+            return
+        # O rodapé do Parquet só existe depois de fechar o writer
+        self.close()
+
+        parquet_file = pyarrow_parquet.ParquetFile(self.path)
+        for batch in parquet_file.iter_batches(columns=['result']):
+            for data in batch.column(0).to_pylist():
+                yield json.loads(data)
+
+    def close(self):
+        self._write_batch()
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        self.closed = True
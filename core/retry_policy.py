@@ -0,0 +1,96 @@
+# core/retry_policy.py - Política explícita de novas tentativas (backoff com jitter)
+
+"""
+🔁 Retries fora da thread de I/O
+
+O adapter do requests não faz mais retries escondidos dentro de um ``get()``:
+cada tentativa é uma requisição própria, com latência própria. Quando uma
+tentativa falha com status da lista ``retry_statuses`` ou erro de rede
+(timeout/conexão), o crawler devolve a URL ao scheduler com um atraso de
+backoff exponencial com jitter ("full jitter": uniforme entre 0 e
+``base * 2^(tentativa-1)``, limitado a ``backoff_max``). ``Retry-After``,
+quando presente, é o atraso mínimo.
+
+Uso:
+    policy = RetryPolicy(max_retries=3)
+    if policy.should_retry(attempt, status_code=503):
+        delay = policy.backoff(attempt, retry_after=2)
+"""
+
+import random
+
+import requests
+
+
+RETRY_STATUSES_DEFAULT = (429, 500, 502, 503, 504)
+
+
+class RetryPolicy:
+    """Quantas vezes, para quais falhas e com que atraso repetir uma URL"""
+
+    def __init__(self, max_retries=3, backoff_base=0.5, backoff_max=30.0, retry_statuses=RETRY_STATUSES_DEFAULT):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def is_retryable_error(self, error):
+        """Timeout e falha de conexão são transitórios; SSL e demais erros não"""
+        if isinstance(error, requests.exceptions.SSLError):
+            return False
+        return isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError,
+                                  TimeoutError, ConnectionError))
+
+    def should_retry(self, attempt, status_code=None, retryable_error=False):
+        """``attempt`` = tentativas já feitas (1 depois da primeira)"""
+        if attempt > self.max_retries:
+            return False
+        return retryable_error or status_code in self.retry_statuses
+
+    def backoff(self, attempt, retry_after=None):
+        """Segundos até a próxima tentativa (full jitter, Retry-After como mínimo)"""
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        delay = random.uniform(0, ceiling)
+        if retry_after:
+            delay = max(delay, retry_after)
+        return delay
+
+    def get_config(self):
+        return {
+            'max_retries': self.max_retries,
+            'backoff_base': self.backoff_base,
+            'backoff_max': self.backoff_max,
+            'retry_statuses': sorted(self.retry_statuses)
+        }
+
+
+def create_retry_policy(config):
+    """RetryPolicy a partir da config do crawler (``max_retries`` = 0 desliga os retries)"""
+    return RetryPolicy(
+        max_retries=config.get('max_retries', 3),
+        backoff_base=config.get('retry_backoff_base', 0.5),
+        backoff_max=config.get('retry_backoff_max', 30.0),
+        retry_statuses=config.get('retry_statuses', RETRY_STATUSES_DEFAULT)
+    )
+
+
+def test_retry_policy():
+    """🧪 Timeout/conexão são repetidos; SSL (subclasse de ConnectionError) não"""
+    print("🧪 Testando RetryPolicy...")
+    policy = RetryPolicy(max_retries=2)
+    
+    checks = {
+        'timeout repetido': policy.is_retryable_error(requests.exceptions.Timeout()),
+        'conexão repetida': policy.is_retryable_error(requests.exceptions.ConnectionError()),
+        'SSL não repetido': not policy.is_retryable_error(requests.exceptions.SSLError()),
+        '503 repetido': policy.should_retry(1, status_code=503),
+        '404 não repetido': not policy.should_retry(1, status_code=404),
+        'limite de tentativas': not policy.should_retry(3, status_code=503)
+    }
+    for name, ok in checks.items():
+        print(f"  {'✅' if ok else '❌'} {name}")
+    print(f"  {'✅ OK' if all(checks.values()) else '❌ política inesperada'}")
+
+
+if __name__ == "__main__":
+    test_retry_policy()
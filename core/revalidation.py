@@ -0,0 +1,103 @@
+# core/revalidation.py - Validadores HTTP (ETag/Last-Modified) + última análise por URL
+
+"""
+🔁 GET condicional entre crawls
+
+Para cada URL normalizada guarda ``ETag``/``Last-Modified`` da última resposta
+200 e o resultado de análise daquela versão. No crawl seguinte o
+SessionManager envia ``If-None-Match``/``If-Modified-Since``; um 304 significa
+"página inalterada" e o crawler reaproveita o resultado guardado sem baixar
+nem parsear a página.
+
+Validadores novos invalidam o resultado guardado até que a análise da nova
+versão seja gravada, então um 304 nunca devolve a análise de outra versão.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class ValidatorStore:
+    """Tabela ``pages`` (url, etag, last_modified, result JSON) em SQLite"""
+
+    def __init__(self, path):
+        self.path = path
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('''
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                result TEXT,
+                updated_at REAL
+            )''')
+        self._db.commit()
+
+    def conditional_headers(self, url):
+        """Headers If-None-Match/If-Modified-Since, só se houver análise guardada"""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT etag, last_modified FROM pages WHERE url = ? AND result IS NOT NULL', (url,)
+            ).fetchone()
+
+        headers = {}
+        if row:
+            etag, last_modified = row
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def save_validators(self, url, response_headers):
+        """Registra validadores de uma resposta 200 (invalida a análise anterior)"""
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO pages (url, etag, last_modified, result, updated_at) '
+                'VALUES (?, ?, ?, NULL, ?)', (url, etag, last_modified, time.time())
+            )
+            self._db.commit()
+
+    def save_result(self, url, result):
+        """Guarda a análise da versão cujos validadores já foram registrados"""
+        with self._lock:
+            self._db.execute(
+                'UPDATE pages SET result = ?, updated_at = ? WHERE url = ?',
+                (json.dumps(result, ensure_ascii=False, default=str), time.time(), url)
+            )
+            self._db.commit()
+
+    def get_result(self, url):
+        with self._lock:
+            row = self._db.execute('SELECT result FROM pages WHERE url = ?', (url,)).fetchone()
+
+        if row and row[0]:
+            return json.loads(row[0])
+        return None
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def create_validator_store(config):
+    """ValidatorStore a partir da config do crawler, ou None se ``revalidate`` estiver desligado"""
+    if not config.get('revalidate'):
+        return None
+    return ValidatorStore(config.get('revalidate_store', os.path.join('cache', 'validators.sqlite')))
@@ -1,107 +1,470 @@
+import re
 import requests
+import asyncio
+from requests.structures import CaseInsensitiveDict
+from urllib3.exceptions import DecodeError, ProtocolError, ReadTimeoutError, SSLError as Urllib3SSLError
 import time
 from urllib.parse import urlparse
 
+from core.circuit_breaker import create_circuit_breaker
+from core.concurrency import create_concurrency_controller
+from core.http_cache import create_http_cache
+from core.rate_limiter import TokenBucketRateLimiter, create_rate_limiter, parse_retry_after
+from core.revalidation import create_validator_store
+from core.streaming_parser import create_streaming_parser
+from utils.stats import StatsCollector
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    aiohttp = None
+    AIOHTTP_AVAILABLE = False
+
+
+SESSION_COUNTERS = ['requests_made', 'successful_requests', 'failed_requests', 'not_modified',
+                    'bodies_skipped', 'bodies_truncated', 'bodies_partial', 'probe_requests']
+
+# Leitura do corpo em blocos: o prazo total da requisição é checado entre blocos
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _session_stats_summary(session_manager):
+    counters = session_manager.stats.counters()
+    latency = session_manager.stats.histogram('response_time_ms')
+    
+    summary = {
+        'requests_made': counters['requests_made'],
+        'successful_requests': counters['successful_requests'],
+        'failed_requests': counters['failed_requests'],
+        'success_rate': (counters['successful_requests'] / max(counters['requests_made'], 1)) * 100,
+        'average_response_time_ms': latency['avg'],
+        'response_time_ms': latency,
+        'not_modified_responses': counters['not_modified'],
+        'bodies_skipped': counters['bodies_skipped'],
+        'bodies_truncated': counters['bodies_truncated'],
+        'bodies_partial': counters['bodies_partial'],
+        'probe_requests': counters['probe_requests']
+    }
+    
+    if session_manager.cache is not None:
+        summary['http_cache'] = session_manager.cache.get_stats()
+    
+    if session_manager.concurrency is not None:
+        summary['concurrency'] = session_manager.concurrency.get_stats()
+    
+    if session_manager.rate_limiter is not None:
+        summary['rate_limit'] = session_manager.rate_limiter.get_stats()
+    
+    if session_manager.circuit_breaker is not None:
+        summary['circuit_breaker'] = session_manager.circuit_breaker.get_stats()
+    
+    return summary
+
+
+def _conditional_headers(validators, url, headers):
+    """Acrescenta If-None-Match/If-Modified-Since quando há análise anterior da URL"""
+    if validators is None:
+        return headers
+    
+    conditional = validators.conditional_headers(url)
+    if not conditional:
+        return headers
+    return dict(headers or {}, **conditional)
+
+
+def _record_outcome(session_manager, url, latency_ms=None, status_code=None, error=False):
+    """Alimenta a concorrência adaptativa e o circuit breaker (quando ligados)"""
+    if session_manager.concurrency is not None:
+        session_manager.concurrency.record(urlparse(url).netloc, latency_ms, status_code, error)
+    if session_manager.circuit_breaker is not None:
+        session_manager.circuit_breaker.record(url, status_code, error)
+
+
+def _honor_retry_after(rate_limiter, url, status_code, headers):
+    """429/503 com Retry-After: pausa o host no rate limiter"""
+    if rate_limiter is not None and status_code in (429, 503):
+        rate_limiter.penalize(urlparse(url).netloc, parse_retry_after(headers.get('Retry-After')))
+
+
+def _track_validators(validators, stats, url, status_code, headers):
+    if validators is None:
+        return
+    if status_code == 304:
+        stats.incr('not_modified')
+    elif status_code == 200:
+        validators.save_validators(url, headers)
+
+
+def _request_timeouts(config):
+    """(connect, read, total): ``timeout`` é o prazo total de cada requisição"""
+    total = config.get('timeout', 15)
+    connect = min(config.get('connect_timeout', total), total)
+    read = min(config.get('read_timeout', total), total)
+    return connect, read, total
+
+
+def _iter_body(response):
+    """Blocos do corpo conforme chegam (read1 = um recv por bloco)
+    
+    ``iter_content`` espera o bloco inteiro: um servidor que manda um byte por
+    vez prende a thread muito além do prazo. Com ``read1`` cada bloco é o que
+    chegou num único recv, limitado pelo read timeout.
+    
+    ``read1`` fala direto com o urllib3: as exceções são traduzidas para as
+    do requests como ``iter_content`` faz, para timeout e queda de conexão
+    no meio do corpo continuarem sendo repetidos pela RetryPolicy.
+    """
+    read1 = getattr(response.raw, 'read1', None)
+    if read1 is None:  # urllib3 < 2.3
+        yield from response.iter_content(STREAM_CHUNK_SIZE)
+        return
+    
+    while True:
+        try:
+            chunk = read1(STREAM_CHUNK_SIZE, decode_content=True)
+        except ReadTimeoutError as e:
+            raise requests.exceptions.Timeout(e)
+        except ProtocolError as e:
+            raise requests.exceptions.ConnectionError(e)
+        except DecodeError as e:
+            raise requests.exceptions.ContentDecodingError(e)
+        except Urllib3SSLError as e:
+            raise requests.exceptions.SSLError(e)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _is_html(headers):
+    return 'text/html' in headers.get('content-type', '').lower()
+
+
+class _HeadOnlyScanner:
+    """Modo head-only: acha ``</head>`` e depois o primeiro ``</h1>`` sem reler o corpo todo"""
+    
+    MARKERS = (re.compile(rb'</head\s*>', re.IGNORECASE), re.compile(rb'</h1\s*>', re.IGNORECASE))
+    OVERLAP = 16  # Marcador partido entre dois blocos
+    
+    def __init__(self):
+        self.stage = 0
+        self.position = 0
+    
+    def complete(self, body):
+        while self.stage < len(self.MARKERS):
+            match = self.MARKERS[self.stage].search(body, self.position)
+            if match is None:
+                self.position = max(len(body) - self.OVERLAP, self.position)
+                return False
+            self.position = match.end()
+            self.stage += 1
+        return True
+
+
+# Marcas deixadas no response quando o corpo não foi lido inteiro
+BODY_FLAGS = ('body_skipped', 'body_truncated', 'body_partial')
+
+
+# Respostas que nunca trazem corpo (RFC 9110): nada a descartar nem conexão a fechar
+BODILESS_STATUS = (204, 304)
+
+
+def _body_pending(status_code, method, headers):
+    """True se há corpo para ler na conexão (sem Content-Length conta como pendente)"""
+    if method == 'HEAD' or status_code in BODILESS_STATUS:
+        return False
+    return headers.get('Content-Length', '').strip() != '0'
+
+
+def _body_flags(headers, html_only, body_pending=True):
+    return {
+        'body_skipped': html_only and body_pending and not _is_html(headers),
+        'body_truncated': False,
+        'body_partial': False
+    }
+
+
+def _feed_body(body, chunk, flags, max_bytes, scanner):
+    """Acrescenta o bloco; True quando a leitura deve parar (limite ou head-only completo)"""
+    body += chunk
+    if max_bytes and len(body) > max_bytes:
+        del body[max_bytes:]
+        flags['body_truncated'] = True
+        return True
+    if scanner is not None and scanner.complete(body):
+        flags['body_partial'] = True
+        return True
+    return False
+
+
+def _read_body(response, url, deadline, max_bytes=0, html_only=False, head_only=False, stream_parse=None):
+    """Lê o corpo de um response ``stream=True`` respeitando o prazo total
+    
+    Decide pelos headers antes de baixar: com ``html_only`` o corpo de
+    respostas não-HTML é descartado (``body_skipped``); acima de ``max_bytes``
+    o HTML é cortado (``body_truncated``); com ``head_only`` a leitura para
+    depois do ``</head>`` e do primeiro ``</h1>`` (``body_partial``). Com
+    ``stream_parse`` (nome do backend) a árvore do HTML é montada enquanto ele
+    chega e o soup fica em ``response.soup`` (o corpo continua em ``content``).
+    """
+    flags = _body_flags(
+        response.headers, html_only,
+        _body_pending(response.status_code, response.request.method, response.headers)
+    )
+    scanner = _HeadOnlyScanner() if head_only else None
+    parser = None
+    if stream_parse and _is_html(response.headers):
+        parser = create_streaming_parser(response.encoding, stream_parse)
+    
+    body = bytearray()
+    if not flags['body_skipped']:
+        for chunk in _iter_body(response):
+            fed = len(body)
+            stop = _feed_body(body, chunk, flags, max_bytes, scanner)
+            if parser is not None:
+                parser.feed(bytes(body[fed:]))  # Só o que ficou no corpo (limite de tamanho)
+            if stop:
+                break
+            if time.time() > deadline:
+                response.close()
+                raise requests.exceptions.Timeout(f"Prazo total excedido lendo {url}")
+    
+    for name, value in flags.items():
+        setattr(response, name, value)
+    
+    response.soup = parser.close() if parser is not None else None
+    
+    if any(flags.values()):
+        response.raw.close()  # Sobrou corpo na conexão: descarta em vez de devolver ao pool
+    
+    response._content = bytes(body)
+    response._content_consumed = True
+    response.close()  # Conexão volta para o pool
+
+
+async def _read_async_body(response, max_bytes=0, html_only=False, head_only=False):
+    """Equivalente de ``_read_body`` para aiohttp: (conteúdo, flags do corpo)"""
+    flags = _body_flags(
+        response.headers, html_only, _body_pending(response.status, response.method, response.headers)
+    )
+    if flags['body_skipped']:
+        return b'', flags
+    if not max_bytes and not head_only:
+        return await response.read(), flags
+    
+    scanner = _HeadOnlyScanner() if head_only else None
+    body = bytearray()
+    async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+        if _feed_body(body, chunk, flags, max_bytes, scanner):
+            break
+    return bytes(body), flags
+
+
+def _track_body(stats, response):
+    for flag in BODY_FLAGS:
+        if getattr(response, flag, False):
+            stats.incr(flag.replace('body_', 'bodies_'))
+
+
+# Servidores que não implementam HEAD: a sonda cai para GET com Range
+HEAD_UNSUPPORTED = (405, 501)
+RANGE_PROBE_HEADERS = {'Range': 'bytes=0-0'}
+
+
+def _needs_range_probe(status_code, headers):
+    return status_code in HEAD_UNSUPPORTED or 'content-type' not in headers
+
+
+def _probe_response(status_code, url, headers, encoding, response_time_ms):
+    """Resposta só de headers da sonda, no formato de um GET sem corpo
+    
+    206 do GET com Range vira 200 e o total de ``Content-Range`` vira
+    ``Content-Length`` (o tamanho que o GET completo teria).
+    """
+    headers = CaseInsensitiveDict(headers)
+    if status_code == 206:
+        status_code = 200
+        total = headers.get('Content-Range', '').rpartition('/')[2]
+        if total.isdigit():
+            headers['Content-Length'] = total
+    
+    response = FetchedResponse(status_code, url, headers, b'', encoding, round(response_time_ms, 2))
+    response.body_skipped = True
+    return response
+
+
+def _build_headers(config):
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+    }
+    
+    config_headers = config.get('headers', {})
+    headers.update(config_headers)
+    return headers
+
 
 class SessionManager:
     
     def __init__(self, config=None):
         self.config = config or {}
         self.session = self._create_optimized_session()
-        self.stats = {
-            'requests_made': 0,
-            'successful_requests': 0,
-            'failed_requests': 0,
-            'total_response_time': 0
-        }
+        self.stats = StatsCollector(SESSION_COUNTERS)
+        self.cache = create_http_cache(self.config)
+        self.validators = create_validator_store(self.config)
+        self.concurrency = create_concurrency_controller(self.config, self.config.get('max_threads', 25))
+        self.rate_limiter = create_rate_limiter(self.config)
+        self.circuit_breaker = create_circuit_breaker(self.config)
     
     def _create_optimized_session(self):
         session = requests.Session()
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        }
-        
-        config_headers = self.config.get('headers', {})
-        headers.update(config_headers)
-        session.headers.update(headers)
+        session.headers.update(_build_headers(self.config))
         
         adapter = requests.adapters.HTTPAdapter(
             pool_connections=20,
             pool_maxsize=20,
-            max_retries=3
+            max_retries=0     # Retries explícitos no crawler (core/retry_policy.py)
         )
         session.mount('http://', adapter)
         session.mount('https://', adapter)
         
         return session
     
-    def get(self, url, **kwargs):
+    def get(self, url, conditional=True, html_only=False, stream_parse=None, **kwargs):
+        """GET com cache, circuit breaker e rate limit opcionais
+        
+        ``html_only`` descarta o corpo de respostas não-HTML sem baixá-lo;
+        ``stream_parse`` (backend de parse) monta o soup durante o download
+        (``response.soup``).
+        """
+        # 🗄️ Cache em disco: resposta servida sem tocar a rede
+        if self.cache is not None:
+            cached = self.cache.get(url)
+            if cached is not None:
+                return cached
+        
+        # ⚡ Circuito aberto: falha na hora, sem esperar o timeout da origem
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before_request(url)
+        
+        # 🪣 Token bucket: espera fora do lock, o tempo de espera não conta como latência
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(urlparse(url).netloc)
+        
         start_time = time.time()
-        self.stats['requests_made'] += 1
+        self.stats.incr('requests_made')
+        
+        connect_timeout, read_timeout, total_timeout = _request_timeouts(self.config)
         
         try:
             default_kwargs = {
-                'timeout': self.config.get('timeout', 15),
+                'timeout': (connect_timeout, read_timeout),
                 'allow_redirects': True,
-                'verify': False
+                'verify': False,
+                'stream': True
             }
             default_kwargs.update(kwargs)
             
+            # 🔁 GET condicional: 304 = página inalterada desde o último crawl
+            if conditional:
+                default_kwargs['headers'] = _conditional_headers(
+                    self.validators, url, default_kwargs.get('headers')
+                )
+            
             response = self.session.get(url, **default_kwargs)
+            if default_kwargs['stream']:
+                _read_body(response, url, start_time + total_timeout,
+                           self.config.get('max_body_bytes', 0), html_only,
+                           self.config.get('head_only', False), stream_parse)
+                _track_body(self.stats, response)
+            _honor_retry_after(self.rate_limiter, url, response.status_code, response.headers)
+            _track_validators(self.validators, self.stats, url, response.status_code, response.headers)
             
             response_time = (time.time() - start_time) * 1000
-            self.stats['total_response_time'] += response_time
-            self.stats['successful_requests'] += 1
+            self.stats.observe('response_time_ms', response_time)
+            self.stats.incr('successful_requests')
+            _record_outcome(self, url, response_time, response.status_code)
             
             response.response_time_ms = round(response_time, 2)
             
+            if self.cache is not None:
+                self.cache.put(url, response)
+            
             return response
             
         except requests.exceptions.Timeout:
-            self.stats['failed_requests'] += 1
+            self.stats.incr('failed_requests')
+            _record_outcome(self, url, error=True)
             raise requests.exceptions.Timeout(f"Timeout ao acessar {url}")
             
-        except requests.exceptions.ConnectionError:
-            self.stats['failed_requests'] += 1
-            raise requests.exceptions.ConnectionError(f"Erro de conexão ao acessar {url}")
-            
+        # SSLError é subclasse de ConnectionError: tratada antes para não virar retry
         except requests.exceptions.SSLError:
-            self.stats['failed_requests'] += 1
+            self.stats.incr('failed_requests')
+            _record_outcome(self, url, error=True)
             raise requests.exceptions.SSLError(f"Erro SSL ao acessar {url}")
             
+        except requests.exceptions.ConnectionError:
+            self.stats.incr('failed_requests')
+            _record_outcome(self, url, error=True)
+            raise requests.exceptions.ConnectionError(f"Erro de conexão ao acessar {url}")
+            
         except Exception as e:
-            self.stats['failed_requests'] += 1
+            self.stats.incr('failed_requests')
+            _record_outcome(self, url, error=True)
             raise Exception(f"Erro inesperado ao acessar {url}: {str(e)}")
     
+    def probe(self, url):
+        """HEAD (ou GET com ``Range: bytes=0-0``): status e headers sem baixar o corpo
+        
+        Devolve None se a sonda falhar; o chamador segue com o GET normal.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(url)
+            if cached is not None:
+                return cached
+        
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before_request(url)
+        
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(urlparse(url).netloc)
+        
+        start_time = time.time()
+        self.stats.incr('probe_requests')
+        connect_timeout, read_timeout, _ = _request_timeouts(self.config)
+        request_kwargs = {'timeout': (connect_timeout, read_timeout), 'allow_redirects': True, 'verify': False}
+        
+        try:
+            response = self.session.head(url, **request_kwargs)
+            if _needs_range_probe(response.status_code, response.headers):
+                response = self.session.get(url, headers=RANGE_PROBE_HEADERS, stream=True, **request_kwargs)
+                response.close()
+        except requests.exceptions.RequestException:
+            _record_outcome(self, url, error=True)
+            return None
+        
+        response_time = (time.time() - start_time) * 1000
+        _record_outcome(self, url, response_time, response.status_code)
+        _honor_retry_after(self.rate_limiter, url, response.status_code, response.headers)
+        return _probe_response(response.status_code, response.url, response.headers,
+                               response.encoding, response_time)
+    
     def close(self):
         if self.session:
             self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+        if self.validators is not None:
+            self.validators.close()
     
     def get_stats(self):
-        avg_response_time = 0
-        if self.stats['successful_requests'] > 0:
-            avg_response_time = self.stats['total_response_time'] / self.stats['successful_requests']
-        
-        return {
-            'requests_made': self.stats['requests_made'],
-            'successful_requests': self.stats['successful_requests'],
-            'failed_requests': self.stats['failed_requests'],
-            'success_rate': (self.stats['successful_requests'] / max(self.stats['requests_made'], 1)) * 100,
-            'average_response_time_ms': round(avg_response_time, 2)
-        }
+        return _session_stats_summary(self)
     
     def reset_stats(self):
-        self.stats = {
-            'requests_made': 0,
-            'successful_requests': 0,
-            'failed_requests': 0,
-            'total_response_time': 0
-        }
+        self.stats.reset()
     
     def update_headers(self, new_headers):
         self.session.headers.update(new_headers)
@@ -118,24 +481,20 @@ class SessionManager:
 
 
 class RateLimitedSessionManager(SessionManager):
+    """SessionManager com token bucket sempre ligado
+    
+    ``rate_limit``: requests_per_second, burst (padrão 1 = intervalo fixo) e
+    per_host (padrão False = um balde para todos os hosts).
+    """
     
     def __init__(self, config=None, rate_limit=None):
         super().__init__(config)
         self.rate_limit = rate_limit or {'requests_per_second': 10}
-        self.last_request_time = 0
-        self.min_interval = 1.0 / self.rate_limit['requests_per_second']
-    
-    def get(self, url, **kwargs):
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.min_interval:
-            sleep_time = self.min_interval - time_since_last
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
-        
-        return super().get(url, **kwargs)
+        self.rate_limiter = TokenBucketRateLimiter(
+            self.rate_limit['requests_per_second'],
+            burst=self.rate_limit.get('burst', 1),
+            per_host=self.rate_limit.get('per_host', False)
+        )
 
 
 class MultiDomainSessionManager:
@@ -195,9 +554,227 @@ class MultiDomainSessionManager:
         self.close_all()
 
 
+class FetchedResponse:
+    """Response já baixado e desacoplado da conexão (picklable)
+    
+    Expõe a mesma interface usada do requests.Response (status_code, url,
+    headers, content, text, response_time_ms). Usado pelo AsyncSessionManager
+    e para enviar páginas aos processos de parse.
+    """
+    
+    def __init__(self, status_code, url, headers, content, encoding=None, response_time_ms=0):
+        self.status_code = status_code
+        self.url = url
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.encoding = encoding or 'utf-8'
+        self.response_time_ms = response_time_ms
+    
+    @classmethod
+    def from_requests(cls, response):
+        fetched = cls(
+            status_code=response.status_code,
+            url=response.url,
+            headers=response.headers,
+            content=response.content,
+            encoding=response.encoding or response.apparent_encoding,
+            response_time_ms=getattr(response, 'response_time_ms', 0)
+        )
+        for flag in BODY_FLAGS:
+            setattr(fetched, flag, getattr(response, flag, False))
+        return fetched
+    
+    @property
+    def text(self):
+        try:
+            return self.content.decode(self.encoding, errors='replace')
+        except LookupError:
+            return self.content.decode('utf-8', errors='replace')
+
+
+class AsyncSessionManager:
+    """SessionManager sobre asyncio/aiohttp: centenas de requisições em voo por processo
+    
+    Mesmo contrato do SessionManager (``get()``/``get_stats()``), mas ``get()``
+    é uma coroutine. A sessão é aberta dentro do event loop com ``open()`` (ou
+    ``async with``) e o pool de conexões é limitado por ``max_concurrency``.
+    """
+    
+    def __init__(self, config=None):
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp não instalado: pip install aiohttp")
+        
+        self.config = config or {}
+        self.max_concurrency = self.config.get('max_concurrency', 200)
+        self.session = None
+        self.stats = StatsCollector(SESSION_COUNTERS)
+        self.cache = create_http_cache(self.config)
+        self.validators = create_validator_store(self.config)
+        self.concurrency = create_concurrency_controller(self.config, self.max_concurrency)
+        self.rate_limiter = create_rate_limiter(self.config)
+        self.circuit_breaker = create_circuit_breaker(self.config)
+    
+    async def open(self):
+        if self.session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency,
+                limit_per_host=self.max_concurrency,
+                ssl=False
+            )
+            self.session = aiohttp.ClientSession(
+                headers=_build_headers(self.config),
+                connector=connector,
+                timeout=self._client_timeout()
+            )
+        return self
+    
+    def _client_timeout(self):
+        connect_timeout, read_timeout, total_timeout = _request_timeouts(self.config)
+        # total = prazo do request inteiro (inclui a leitura do corpo)
+        return aiohttp.ClientTimeout(total=total_timeout, connect=connect_timeout, sock_read=read_timeout)
+    
+    async def get(self, url, conditional=True, html_only=False, **kwargs):
+        if self.cache is not None:
+            cached = self.cache.get(url)
+            if cached is not None:
+                return cached
+        
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before_request(url)
+        
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.reserve(urlparse(url).netloc)
+            if wait > 0:
+                await asyncio.sleep(wait)
+        
+        start_time = time.time()
+        self.stats.incr('requests_made')
+        
+        if conditional:
+            kwargs['headers'] = _conditional_headers(self.validators, url, kwargs.get('headers'))
+        
+        try:
+            async with self.session.get(url, allow_redirects=True, **kwargs) as response:
+                content, body_flags = await _read_async_body(
+                    response, self.config.get('max_body_bytes', 0), html_only,
+                    self.config.get('head_only', False)
+                )
+                _honor_retry_after(self.rate_limiter, url, response.status, response.headers)
+                _track_validators(self.validators, self.stats, url, response.status, response.headers)
+                try:
+                    encoding = response.get_encoding()
+                except Exception:
+                    encoding = 'utf-8'
+                
+                result = FetchedResponse(
+                    status_code=response.status,
+                    url=str(response.url),
+                    headers=response.headers,
+                    content=content,
+                    encoding=encoding
+                )
+                for name, value in body_flags.items():
+                    setattr(result, name, value)
+                _track_body(self.stats, result)
+            
+            response_time = (time.time() - start_time) * 1000
+            self.stats.observe('response_time_ms', response_time)
+            self.stats.incr('successful_requests')
+            _record_outcome(self, url, response_time, result.status_code)
+            
+            result.response_time_ms = round(response_time, 2)
+            
+            if self.cache is not None:
+                self.cache.put(url, result)
+            
+            return result
+            
+        except asyncio.TimeoutError:
+            self.stats.incr('failed_requests')
+            _record_outcome(self, url, error=True)
+            raise TimeoutError(f"Timeout ao acessar {url}")
+            
+        except aiohttp.ClientSSLError:
+            self.stats.incr('failed_requests')
+            _record_outcome(self, url, error=True)
+            raise requests.exceptions.SSLError(f"Erro SSL ao acessar {url}")
+            
+        except aiohttp.ClientConnectionError:
+            self.stats.incr('failed_requests')
+            _record_outcome(self, url, error=True)
+            raise ConnectionError(f"Erro de conexão ao acessar {url}")
+            
+        except Exception as e:
+            self.stats.incr('failed_requests')
+            _record_outcome(self, url, error=True)
+            raise Exception(f"Erro inesperado ao acessar {url}: {str(e)}")
+    
+    async def probe(self, url):
+        """Versão async de ``SessionManager.probe`` (None se a sonda falhar)"""
+        if self.cache is not None:
+            cached = self.cache.get(url)
+            if cached is not None:
+                return cached
+        
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before_request(url)
+        
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.reserve(urlparse(url).netloc)
+            if wait > 0:
+                await asyncio.sleep(wait)
+        
+        start_time = time.time()
+        self.stats.incr('probe_requests')
+        
+        try:
+            async with self.session.head(url, allow_redirects=True) as response:
+                status_code, final_url, headers = response.status, str(response.url), response.headers
+            
+            if _needs_range_probe(status_code, headers):
+                async with self.session.get(url, headers=RANGE_PROBE_HEADERS, allow_redirects=True) as response:
+                    status_code, final_url, headers = response.status, str(response.url), response.headers
+        except (asyncio.TimeoutError, aiohttp.ClientError):
+            _record_outcome(self, url, error=True)
+            return None
+        
+        response_time = (time.time() - start_time) * 1000
+        _record_outcome(self, url, response_time, status_code)
+        _honor_retry_after(self.rate_limiter, url, status_code, headers)
+        return _probe_response(status_code, final_url, headers, None, response_time)
+    
+    async def aclose(self):
+        if self.session:
+            await self.session.close()
+            self.session = None
+    
+    def close(self):
+        # A sessão aiohttp é fechada dentro do event loop (aclose); aqui só
+        # garantimos que o crawler possa chamar close() como no modo sync.
+        if self.cache is not None:
+            self.cache.close()
+        if self.validators is not None:
+            self.validators.close()
+    
+    def get_stats(self):
+        return _session_stats_summary(self)
+    
+    def reset_stats(self):
+        self.stats.reset()
+    
+    async def __aenter__(self):
+        return await self.open()
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+
 def create_session_manager(config=None, session_type='default'):
     
-    if session_type == 'rate_limited':
+    if session_type == 'async':
+        return AsyncSessionManager(config)
+    
+    elif session_type == 'rate_limited':
         rate_config = config.get('rate_limit', {}) if config else {}
         return RateLimitedSessionManager(config, rate_config)
     
@@ -244,7 +821,97 @@ def test_rate_limited_session(url="https://httpbin.org/get", requests_count=5):
         print(f"Rate efetivo: {requests_count/total_time:.2f} req/s")
 
 
+def test_ssl_error_not_retried():
+    """🧪 Falha SSL sai de ``get`` como SSLError e a RetryPolicy não a repete"""
+    from core.retry_policy import RetryPolicy
+    
+    print("Testando SSLError em SessionManager.get...")
+    
+    def fail_ssl(*args, **kwargs):
+        raise requests.exceptions.SSLError("certificado inválido")
+    
+    with SessionManager() as session_manager:
+        session_manager.session.get = fail_ssl
+        try:
+            session_manager.get("https://ssl.invalido.test/")
+        except Exception as e:
+            retried = RetryPolicy().is_retryable_error(e)
+            print(f"{type(e).__name__} - repetido: {retried}")
+            print('✅ OK' if isinstance(e, requests.exceptions.SSLError) and not retried else '❌ SSL seria repetido')
+
+
+def test_stalled_body_retried():
+    """🧪 Servidor que manda os headers e trava (ou cai) no corpo: erro repetível"""
+    import socket
+    import threading
+    from core.retry_policy import RetryPolicy
+    
+    print("Testando corpo travado / conexão caída no meio do corpo...")
+    
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen()
+    port = listener.getsockname()[1]
+    
+    def serve(stall_seconds):
+        connection, _ = listener.accept()
+        connection.recv(65536)
+        connection.sendall(b'HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n'
+                           b'Content-Length: 1000\r\n\r\n<html><body>')
+        time.sleep(stall_seconds)  # 0: fecha com o corpo incompleto
+        connection.close()
+    
+    outcomes = []
+    for case, stall_seconds in (('corpo travado', 3), ('conexão caída', 0)):
+        server = threading.Thread(target=serve, args=(stall_seconds,), daemon=True)
+        server.start()
+        with SessionManager({'timeout': 10, 'read_timeout': 1}) as session_manager:
+            try:
+                session_manager.get(f"http://127.0.0.1:{port}/")
+                error = None
+            except Exception as e:
+                error = e
+        server.join()
+        retried = error is not None and RetryPolicy().is_retryable_error(error)
+        outcomes.append(retried)
+        print(f"{case}: {type(error).__name__} - repetido: {retried}")
+    
+    listener.close()
+    print('✅ OK' if all(outcomes) else '❌ erro no corpo não seria repetido')
+
+
+def test_probe_feeds_circuit_breaker():
+    """🧪 Sonda HEAD bem-sucedida fecha o circuito half-open, como um GET"""
+    from core.circuit_breaker import HALF_OPEN, CLOSED
+    
+    print("Testando sonda com circuit breaker half-open...")
+    
+    def head_ok(url, **kwargs):
+        response = requests.models.Response()
+        response.status_code, response.url = 200, url
+        response.headers = CaseInsensitiveDict({'Content-Type': 'application/pdf'})
+        return response
+    
+    with SessionManager({'circuit_breaker': True, 'circuit_reset_seconds': 0}) as session_manager:
+        url = "https://instavel.test/arquivo/1"
+        breaker = session_manager.circuit_breaker
+        circuit = breaker._circuit(breaker.circuit_key(url))
+        circuit.update(state=HALF_OPEN, probe_started=0.0)
+        
+        session_manager.session.head = head_ok
+        probed = session_manager.probe(url)
+        state = circuit['state']
+        print(f"status da sonda: {probed.status_code} | circuito: {state}")
+        print('✅ OK' if state == CLOSED else '❌ sonda não alimentou o circuit breaker')
+
+
 if __name__ == "__main__":
+    test_ssl_error_not_retried()
+    print("\n" + "="*50 + "\n")
+    test_stalled_body_retried()
+    print("\n" + "="*50 + "\n")
+    test_probe_feeds_circuit_breaker()
+    print("\n" + "="*50 + "\n")
     test_session_manager()
     print("\n" + "="*50 + "\n")
     test_rate_limited_session()
\ No newline at end of file
@@ -0,0 +1,121 @@
+# core/streaming_parser.py - Árvore do BeautifulSoup montada enquanto o corpo chega
+
+"""
+🌊 Montagem incremental do soup (push-parser) durante o download
+
+Em vez de esperar o corpo inteiro, decodificar ``response.text`` e só então
+chamar ``BeautifulSoup(html, backend)``, cada bloco recebido da rede é
+decodificado incrementalmente e empurrado no parser que monta a árvore do
+BeautifulSoup. Tokenização e montagem da árvore acontecem durante o
+download (a thread de I/O estaria parada esperando a rede de qualquer forma).
+
+O soup final é o mesmo de ``BeautifulSoup(response.text, backend)``. Com
+``html.parser`` o texto vai para o ``BeautifulSoupHTMLParser`` interno do
+bs4; com ``lxml``, para o parser do lxml (que aceita ``feed``) tendo o tree
+builder do bs4 como target. Backends sem essa interface (html5lib) ou uma
+versão do bs4 diferente fazem ``create_streaming_parser`` devolver None e o
+crawler volta ao parse do corpo completo.
+
+Escopo - só a árvore é montada durante o download:
+- extração de links e analyzers (head/meta, headings, mixed content) rodam
+  depois do último bloco, na passada única do DOMVisitor sobre o soup pronto
+- os bytes do corpo continuam em ``response.content`` (tamanho, hash de
+  conteúdo, cache HTTP): o pico de memória é o corpo mais a árvore, como no
+  parse normal; só a cópia decodificada do texto inteiro deixa de existir
+- só nos crawlers com threads; o crawler async não usa streaming
+
+Uso:
+    parser = StreamingSoupParser(response.encoding, 'lxml')
+    for chunk in chunks:
+        parser.feed(chunk)
+    soup = parser.close()
+"""
+
+import codecs
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+try:
+    from bs4.builder._htmlparser import BeautifulSoupHTMLParser
+    STREAMING_PARSE_AVAILABLE = True
+except ImportError:
+    BeautifulSoupHTMLParser = None
+    STREAMING_PARSE_AVAILABLE = False
+
+
+# Backends com parser incremental (html5lib só parseia o documento inteiro)
+STREAMING_BACKENDS = ('html.parser', 'lxml')
+
+
+class StreamingSoupParser:
+    """Recebe bytes em blocos e devolve o soup completo em ``close()``"""
+
+    def __init__(self, encoding, backend='html.parser'):
+        # LookupError para encodings desconhecidos: o chamador cai no parse completo
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+
+        self.soup = BeautifulSoup('', backend)
+        builder = self.soup.builder
+        if backend == 'lxml':
+            # O tree builder do bs4 é o target do parser lxml (como em LXMLTreeBuilder.feed)
+            builder.initialize_soup(self.soup)
+            self._parser = builder.parser_for(None)
+            return
+
+        args, kwargs = builder.parser_args
+        try:
+            self._parser = BeautifulSoupHTMLParser(self.soup, *args, **kwargs)
+        except TypeError:  # bs4 < 4.13: o soup é atribuído depois
+            self._parser = BeautifulSoupHTMLParser(*args, **kwargs)
+            self._parser.soup = self.soup
+
+    def feed(self, chunk):
+        text = self._decoder.decode(chunk)
+        if text:
+            self._parser.feed(text)
+
+    def close(self):
+        """Termina o documento (como ``BeautifulSoup._feed``) e devolve o soup"""
+        self._parser.feed(self._decoder.decode(b'', final=True))
+        self._parser.close()
+
+        soup = self.soup
+        soup.endData()
+        while soup.currentTag is not None and soup.currentTag.name != soup.ROOT_TAG_NAME:
+            soup.popTag()
+        return soup
+
+
+def create_streaming_parser(encoding, backend='html.parser'):
+    """StreamingSoupParser para o encoding do response, ou None se não for possível"""
+    if not STREAMING_PARSE_AVAILABLE or not encoding or backend not in STREAMING_BACKENDS:
+        return None
+    try:
+        return StreamingSoupParser(encoding, backend)
+    except (LookupError, TypeError, AttributeError, FeatureNotFound):
+        return None
+
+
+def test_streaming_parser(chunk_size=7, backend='html.parser'):
+    """🧪 Soup montado em blocos pequenos deve ser idêntico ao parse do texto inteiro"""
+    print(f"🧪 Testando StreamingSoupParser ({backend}, blocos de {chunk_size} bytes)...")
+    html = ('<!DOCTYPE html><html><head><title>Título ção</title>'
+            '<meta name="description" content="a &amp; b"></head>'
+            '<body><h1>Olá</h1><p>texto <b>negrito<br>quebra</p><a href="/x?a=1&b=2">link</a>'
+            '<script>if (a < b) {}</script><img src="x.png"></body></html>')
+    content = html.encode('utf-8')
+
+    parser = StreamingSoupParser('utf-8', backend)
+    for start in range(0, len(content), chunk_size):
+        parser.feed(content[start:start + chunk_size])
+    streamed = parser.close()
+
+    expected = BeautifulSoup(content.decode('utf-8'), backend)
+    same = streamed.decode() == expected.decode()
+    print(f"  title: {streamed.title.get_text()} | links: {len(streamed.find_all('a'))}")
+    print(f"  {'✅ OK' if same else '❌ soup diferente do parse completo'}")
+
+
+if __name__ == "__main__":
+    for backend in STREAMING_BACKENDS:
+        test_streaming_parser(backend=backend)
@@ -0,0 +1,92 @@
+# core/url_filters.py - Filtro de relevância de URLs compilado a partir da config
+
+"""
+🚫 Filtro de URLs compilado uma vez por URLManager
+
+Os padrões da seção ``filters`` da config viram:
+- uma regex combinada (e-commerce + técnicos) para o caminho rápido:
+  a imensa maioria das URLs não casa com nada e sai após uma busca só
+- um set de extensões consultado pelo sufixo da URL (O(1))
+
+Quando algo casa, a ordem de prioridade original é respeitada
+(e-commerce → extensão → técnico, padrões na ordem da config) e a regra
+que bloqueou é retornada.
+"""
+
+import re
+
+from config.settings import ECOMMERCE_PATTERNS, EXCLUDED_EXTENSIONS, TECHNICAL_PATTERNS
+
+
+# Motivos registrados em URLManager._log_filter
+FILTER_ECOMMERCE = 'ECOMMERCE_ENDPOINT'
+FILTER_EXTENSION = 'FILE_EXTENSION'
+FILTER_TECHNICAL = 'TECHNICAL_PATTERN'
+
+
+def _compile_patterns(patterns):
+    """Alternação de literais; None se a lista estiver vazia"""
+    if not patterns:
+        return None
+    return re.compile('|'.join(re.escape(p) for p in patterns))
+
+
+def _first_match(patterns, url_lower):
+    """Primeiro padrão (na ordem da config) contido na URL"""
+    for pattern in patterns:
+        if pattern in url_lower:
+            return pattern
+    return None
+
+
+class URLFilter:
+    """Regras de exclusão de URLs (padrões de substring + extensões)"""
+
+    def __init__(self, config=None):
+        config = config or {}
+
+        ecommerce = config.get('ecommerce_patterns', ECOMMERCE_PATTERNS)
+        technical = config.get('technical_patterns', TECHNICAL_PATTERNS)
+        extensions = config.get('excluded_extensions', EXCLUDED_EXTENSIONS)
+
+        self.ecommerce_patterns = tuple(p.lower() for p in ecommerce if p)
+        self.technical_patterns = tuple(p.lower() for p in technical if p)
+        self.any_pattern_regex = _compile_patterns(self.ecommerce_patterns + self.technical_patterns)
+
+        self.extensions = {ext.lower() for ext in extensions if ext}
+        # Extensões compostas ('.tar.gz') exigem olhar mais de um sufixo
+        self.extension_dots = max((ext.count('.') for ext in self.extensions), default=0)
+
+    def _match_extension(self, url_lower):
+        end = len(url_lower)
+        for _ in range(self.extension_dots):
+            dot = url_lower.rfind('.', 0, end)
+            if dot < 0:
+                break
+            suffix = url_lower[dot:]
+            if suffix in self.extensions:
+                return suffix
+            end = dot
+        return None
+
+    def match(self, url):
+        """Retorna (motivo, detalhes) da regra que bloqueia a URL, ou None"""
+        url_lower = url.lower()
+
+        if self.any_pattern_regex is None or not self.any_pattern_regex.search(url_lower):
+            ext = self._match_extension(url_lower)
+            if ext:
+                return FILTER_EXTENSION, f'Extensão de arquivo: {ext}'
+            return None
+
+        # Caminho lento (URL será bloqueada): respeita a prioridade das regras
+        pattern = _first_match(self.ecommerce_patterns, url_lower)
+        if pattern:
+            return FILTER_ECOMMERCE, f'E-commerce endpoint: {pattern}'
+
+        ext = self._match_extension(url_lower)
+        if ext:
+            return FILTER_EXTENSION, f'Extensão de arquivo: {ext}'
+
+        pattern = _first_match(self.technical_patterns, url_lower)
+        return FILTER_TECHNICAL, f'Padrão técnico: {pattern}'
@@ -0,0 +1,199 @@
+# core/url_fingerprints.py - Conjunto compacto de URLs vistas (fingerprints de 64 bits)
+
+"""
+🔑 Deduplicação de URLs sem guardar as strings
+
+Cada URL normalizada vira um fingerprint de 64 bits (blake2b, estável entre
+execuções). Os fingerprints ficam num array com endereçamento aberto
+(sondagem linear) e um byte de estado por slot, ~15 bytes por URL contra
+centenas de bytes de três cópias da string + md5 hexdigest.
+
+Com 1 milhão de URLs a chance de colisão de 64 bits é ~3e-8.
+"""
+
+from array import array
+from hashlib import blake2b
+
+
+# Estados guardados junto com cada fingerprint
+URL_DISCOVERED = 1     # Já entrou na fila
+URL_PROCESSED = 2      # Já saiu da fila para processamento
+
+_EMPTY = 0
+_MAX_LOAD = 0.7
+
+
+def url_fingerprint(url):
+    """Fingerprint de 64 bits (nunca 0, reservado para slot vazio)"""
+    fingerprint = int.from_bytes(blake2b(url.encode(), digest_size=8).digest(), 'little')
+    return fingerprint or 1
+
+
+class BloomFilter:
+    """Filtro de Bloom sobre fingerprints já calculados (sem re-hash da URL)"""
+
+    def __init__(self, size_bits, num_hashes=4):
+        self.size_bits = max(size_bits, 64)
+        self.num_hashes = num_hashes
+        self.bits = bytearray((self.size_bits + 7) // 8)
+
+    def _positions(self, fingerprint):
+        # Double hashing: h1 + i*h2 derivados das duas metades do fingerprint
+        h1 = fingerprint & 0xFFFFFFFF
+        h2 = (fingerprint >> 32) | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.size_bits
+
+    def add(self, fingerprint):
+        for position in self._positions(fingerprint):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, fingerprint):
+        for position in self._positions(fingerprint):
+            if not self.bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def clear(self):
+        self.bits = bytearray(len(self.bits))
+
+
+class FingerprintSet:
+    """Tabela hash de fingerprints (array('Q')) com um byte de estado por URL
+
+    ``bloom_bits`` > 0 liga um filtro de Bloom na frente da tabela para
+    responder "nunca vista" sem sondar o array.
+    """
+
+    def __init__(self, capacity=1024, bloom_bits=0):
+        self.bloom_bits = bloom_bits
+        self._allocate(capacity)
+        self.bloom = BloomFilter(bloom_bits) if bloom_bits else None
+
+    def _allocate(self, capacity):
+        size = 8
+        while size < capacity:
+            size <<= 1
+        self._keys = array('Q', bytes(8 * size))
+        self._states = bytearray(size)
+        self._mask = size - 1
+        self._size = 0
+
+    def _slot(self, fingerprint):
+        keys = self._keys
+        mask = self._mask
+        index = fingerprint & mask
+        while True:
+            key = keys[index]
+            if key == fingerprint or key == _EMPTY:
+                return index
+            index = (index + 1) & mask
+
+    def get_state(self, fingerprint):
+        """Estado do fingerprint (0 se nunca visto)"""
+        if self.bloom is not None and fingerprint not in self.bloom:
+            return 0
+        index = self._slot(fingerprint)
+        if self._keys[index] == fingerprint:
+            return self._states[index]
+        return 0
+
+    def set_state(self, fingerprint, state):
+        """Insere (ou atualiza) o fingerprint; retorna True se era novo"""
+        index = self._slot(fingerprint)
+        is_new = self._keys[index] == _EMPTY
+
+        if is_new:
+            self._keys[index] = fingerprint
+            self._size += 1
+            if self.bloom is not None:
+                self.bloom.add(fingerprint)
+
+        self._states[index] = state
+
+        if is_new and self._size > len(self._keys) * _MAX_LOAD:
+            self._grow()
+
+        return is_new
+
+    def check_and_add(self, fingerprint, state=URL_DISCOVERED, admit=None):
+        """Consulta e inserção numa única sondagem; devolve o estado anterior
+
+        0: era novo e foi inserido com ``state``. Com ``admit``, chamado só
+        para fingerprints novos, a inserção pode ser recusada: devolve None e
+        nada é gravado.
+        """
+        index = self._slot(fingerprint)
+        if self._keys[index] == fingerprint:
+            return self._states[index]
+
+        if admit is not None and not admit():
+            return None
+
+        self._keys[index] = fingerprint
+        self._states[index] = state
+        self._size += 1
+        if self.bloom is not None:
+            self.bloom.add(fingerprint)
+
+        if self._size > len(self._keys) * _MAX_LOAD:
+            self._grow()
+
+        return 0
+
+    def _grow(self):
+        old_keys = self._keys
+        old_states = self._states
+        self._allocate(len(old_keys) * 2)
+
+        for key, state in zip(old_keys, old_states):
+            if key != _EMPTY:
+                index = self._slot(key)
+                self._keys[index] = key
+                self._states[index] = state
+                self._size += 1
+
+    def __contains__(self, fingerprint):
+        return self.get_state(fingerprint) != 0
+
+    def __len__(self):
+        return self._size
+
+    def clear(self):
+        self._allocate(8)
+        if self.bloom is not None:
+            self.bloom.clear()
+
+    def memory_bytes(self):
+        total = self._keys.itemsize * len(self._keys) + len(self._states)
+        if self.bloom is not None:
+            total += len(self.bloom.bits)
+        return total
+
+
+def test_fingerprint_set(urls=200000):
+    """🧪 Compara memória/consistência do FingerprintSet com um set de strings"""
+    import sys
+
+    print(f"🧪 Testando FingerprintSet com {urls} URLs...")
+    fingerprints = FingerprintSet(bloom_bits=urls * 10)
+    strings = set()
+
+    for i in range(urls):
+        url = f"https://example.com/produto/{i}?cor=azul"
+        strings.add(url)
+        fingerprints.set_state(url_fingerprint(url), URL_DISCOVERED)
+
+    missing = sum(1 for url in strings if url_fingerprint(url) not in fingerprints)
+    false_hits = sum(
+        1 for i in range(urls) if url_fingerprint(f"https://example.com/outra/{i}") in fingerprints
+    )
+    string_bytes = sys.getsizeof(strings) + sum(sys.getsizeof(url) for url in strings)
+
+    print(f"  fingerprints: {len(fingerprints)} | ausentes: {missing} | falsos positivos: {false_hits}")
+    print(f"  memória: {fingerprints.memory_bytes() / 1024:.0f} KB (set de strings: {string_bytes / 1024:.0f} KB)")
+    print(f"  {'✅ OK' if not missing and not false_hits else '❌ inconsistência'}")
+
+
+if __name__ == "__main__":
+    test_fingerprint_set()
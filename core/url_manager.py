@@ -1,7 +1,14 @@
-from urllib.parse import urlparse, urljoin, urlunparse, parse_qs, urlencode
-from collections import deque
+from urllib.parse import urlparse, urlsplit, urljoin, urlunparse, parse_qs, urlencode
+from functools import lru_cache
 import re
-import hashlib
+
+from core.frontier import create_frontier
+from core.url_filters import URLFilter
+from core.url_fingerprints import FingerprintSet, url_fingerprint, URL_DISCOVERED, URL_PROCESSED
+
+
+NORMALIZE_CACHE_SIZE = 20000
+ABSOLUTE_URL_REGEX = re.compile(r'[a-zA-Z][a-zA-Z0-9+.-]*://')
 
 
 class URLManager:
@@ -10,14 +17,23 @@ class URLManager:
         self.base_domain = base_domain
         self.config = config or {}
         
-        # 🔥 CORREÇÃO: Conjuntos para deduplicação
-        self.processed_urls = set()           # URLs já processadas
-        self.normalized_urls = set()          # URLs normalizadas para deduplicação
-        self.url_hashes = set()               # Hashes de URLs para detecção extra
+        # 🔥 Deduplicação: um único store de fingerprints de 64 bits
+        # (estado URL_DISCOVERED ou URL_PROCESSED por URL normalizada)
+        self.seen_urls = FingerprintSet(bloom_bits=self.config.get('bloom_bits', 0))
+        self.processed_count = 0
         
-        self.urls_to_process = deque()
+        self.urls_to_process = self._create_frontier()
         self.filtered_urls = []
         
+        # 🚫 Filtro de relevância compilado uma vez a partir da seção 'filters'
+        self.url_filter = URLFilter(self.config)
+        
+        # ⚡ LRU de normalizações: (base reduzida, href) -> URL normalizada
+        self._normalize_cached = lru_cache(
+            maxsize=self.config.get('normalize_cache_size', NORMALIZE_CACHE_SIZE)
+        )(self._normalize_uncached)
+        self._last_base = (None, None, None)
+        
         self.stats = {
             'total_found': 0,
             'total_processed': 0,
@@ -26,46 +42,97 @@ class URLManager:
             'filtered_by_reason': {}
         }
     
+    def _create_frontier(self):
+        """Fila em memória, ou com spill para disco se frontier_memory_urls > 0"""
+        return create_frontier(
+            self.config.get('frontier_memory_urls', 0),
+            self.config.get('frontier_dir')
+        )
+    
     def set_base_domain(self, url):
         """Define o domínio base a partir de uma URL"""
         domain = urlparse(url).netloc.lower()
         if domain.startswith("www."):
             domain = domain[4:]
         self.base_domain = domain
+        self.clear_normalize_cache()
     
     def normalize_url(self, url, base_url=None):
-        """🔥 CORREÇÃO: Normalização robusta anti-duplicação"""
+        """🔥 CORREÇÃO: Normalização robusta anti-duplicação (memoizada)"""
         if not url:
             return None
         
+        url = url.strip()
+        
         try:
-            url = url.strip()
-            
-            # Resolve URL relativa
-            if base_url:
-                url = urljoin(base_url, url)
-            
-            parsed = urlparse(url)
-
-            # Validações básicas
-            if parsed.scheme not in ['http', 'https']:
-                return None
-
-            domain = parsed.netloc.lower()
-            if domain.startswith("www."):
-                domain = domain[4:]
-            if self.base_domain and domain != self.base_domain:
-                return None
-            
-            # 🔥 NORMALIZAÇÃO ANTI-DUPLICAÇÃO
-            normalized_url = self._deep_normalize_url(parsed)
-            
-            return normalized_url
+            return self._normalize_cached(self._base_key(base_url, url), url)
             
         except Exception as e:
             self._log_filter('INVALID_URL', url, f'Erro na normalização: {str(e)}')
             return None
     
+    def _base_key(self, base_url, href):
+        """Menor parte da base da qual urljoin(base, href) depende
+        
+        Links de menu/rodapé se repetem em todas as páginas: com a chave
+        reduzida a origem/diretório eles viram hits no cache entre páginas.
+        """
+        if not base_url:
+            return ''
+        
+        if ABSOLUTE_URL_REGEX.match(href):
+            return ''
+        
+        if not href or href[0] in '?#;':
+            return base_url
+        
+        # Decompõe a base uma vez por página (extract_links repete a mesma base)
+        last = self._last_base
+        if last[0] != base_url:
+            parts = urlsplit(base_url)
+            origin = f"{parts.scheme}://{parts.netloc}"
+            directory = origin + parts.path[:parts.path.rfind('/') + 1] if parts.path else origin + '/'
+            last = (base_url, origin + '/', directory)
+            self._last_base = last
+        
+        return last[1] if href[0] == '/' else last[2]
+    
+    def _normalize_uncached(self, base_key, url):
+        # Resolve URL relativa
+        if base_key:
+            url = urljoin(base_key, url)
+        
+        parsed = urlparse(url)
+
+        # Validações básicas
+        if parsed.scheme not in ['http', 'https']:
+            return None
+
+        domain = parsed.netloc.lower()
+        if domain.startswith("www."):
+            domain = domain[4:]
+        if self.base_domain and domain != self.base_domain:
+            return None
+        
+        # 🔥 NORMALIZAÇÃO ANTI-DUPLICAÇÃO
+        return self._deep_normalize_url(parsed)
+    
+    def clear_normalize_cache(self):
+        """Descarta normalizações memoizadas (ex.: ao trocar o domínio base)"""
+        self._normalize_cached.cache_clear()
+        self._last_base = (None, None, None)
+    
+    def get_normalize_cache_stats(self):
+        info = self._normalize_cached.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'size': info.currsize,
+            'max_size': info.maxsize,
+            'hit_rate': round(info.hits / lookups * 100, 2) if lookups else 0
+        }
+    
     def _deep_normalize_url(self, parsed):
         """🔥 Normalização profunda para evitar duplicados"""
         
@@ -141,59 +208,12 @@ class URLManager:
         if not url:
             return False
         
-        url_lower = url.lower()
-        
-        # 🔥 PADRÕES E-COMMERCE BLOQUEADOS
-        padroes_ecommerce_bloquear = [
-            '/checkout/cart/add/',
-            '/checkout/cart/',
-            '/customer/account/',
-            '/customer/section/load/',
-            '/wishlist/index/add/',
-            '/review/product/post/',
-            '/newsletter/subscriber/',
-            '/sales/order/',
-            '/downloadable/download/',
-            '/paypal/',
-            '/rest/V1/',
-            '/graphql',
-            '/admin/',
-        ]
-        
-        for padrao in padroes_ecommerce_bloquear:
-            if padrao in url_lower:
-                self._log_filter('ECOMMERCE_ENDPOINT', url, f'E-commerce endpoint: {padrao}')
-                return False
-        
-        # Extensões excluídas
-        extensoes_excluir = {
-            '.js', '.css', '.json', '.xml', '.txt', '.ico',
-            '.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.svg',
-            '.pdf', '.doc', '.docx', '.xls', '.xlsx',
-            '.zip', '.rar', '.7z', '.mp3', '.mp4', '.avi',
-            '.woff', '.woff2', '.ttf', '.eot', '.map'
-        }
-        
-        for ext in extensoes_excluir:
-            if url_lower.endswith(ext):
-                self._log_filter('FILE_EXTENSION', url, f'Extensão de arquivo: {ext}')
-                return False
-        
-        # Padrões técnicos bloqueados
-        padroes_tecnicos_bloquear = [
-            '/wp-content/uploads/', '/wp-content/themes/', '/wp-content/plugins/',
-            '/wp-includes/', '/wp-admin/', '/wp-json/',
-            '/assets/', '/static/', '/media/', '/images/',
-            '/node_modules/', '/vendor/', '/_next/', '/dist/',
-            '/api/', '/ajax/', '/cron/', '/cache/',
-            'google-analytics', 'googleapis.com', 'facebook.com',
-            'cloudflare', 'jquery', 'bootstrap', 'fontawesome'
-        ]
-        
-        for padrao in padroes_tecnicos_bloquear:
-            if padrao in url_lower:
-                self._log_filter('TECHNICAL_PATTERN', url, f'Padrão técnico: {padrao}')
-                return False
+        # 🔥 Regras compiladas da config (e-commerce, extensões, técnicos)
+        blocked = self.url_filter.match(url)
+        if blocked:
+            reason, details = blocked
+            self._log_filter(reason, url, details)
+            return False
         
         return True
     
@@ -204,59 +224,72 @@ class URLManager:
         if not normalized_url:
             return False
         
-        # 🔥 VERIFICAÇÃO ANTI-DUPLICAÇÃO
-        if self._is_duplicate(normalized_url):
-            self.stats['total_duplicates'] += 1
-            return False
+        return self._add_normalized(normalized_url, depth, url_fingerprint(normalized_url))
+    
+    def add_link(self, url, depth=0, base_url=None):
+        """Link extraído de uma página: None se a URL já foi processada, senão o mesmo que ``add_url``
         
-        if not self.is_url_relevant(normalized_url):
+        Substitui ``is_processed`` + ``add_url`` com um único fingerprint por link.
+        """
+        normalized_url = self.normalize_url(url, base_url)
+        
+        if not normalized_url:
             return False
         
-        # Adiciona às estruturas de controle
-        self._register_url(normalized_url)
+        fingerprint = url_fingerprint(normalized_url)
+        if self.seen_urls.get_state(fingerprint) == URL_PROCESSED:
+            return None
         
-        self.urls_to_process.append((normalized_url, depth))
-        self.stats['total_found'] += 1
-        return True
+        return self._add_normalized(normalized_url, depth, fingerprint)
     
-    def _is_duplicate(self, normalized_url):
-        """🔥 Verifica se URL é duplicada usando múltiplas estratégias"""
+    def _add_normalized(self, normalized_url, depth, fingerprint, priority=False):
+        """🔥 Deduplicação + relevância com uma única sondagem do fingerprint
         
-        # 1. Verificação direta na URL normalizada
-        if normalized_url in self.normalized_urls:
-            return True
+        A relevância (filtros) só é avaliada para URLs nunca vistas, antes de
+        registrá-las; URLs filtradas não entram no store.
+        """
+        previous = self.seen_urls.check_and_add(
+            fingerprint, URL_DISCOVERED, admit=lambda: self.is_url_relevant(normalized_url)
+        )
         
-        # 2. Verificação na lista de processadas
-        if normalized_url in self.processed_urls:
-            return True
+        if previous is None:
+            return False
         
-        # 3. Verificação por hash (para casos edge)
-        url_hash = hashlib.md5(normalized_url.encode()).hexdigest()
-        if url_hash in self.url_hashes:
-            return True
+        # 🔥 VERIFICAÇÃO ANTI-DUPLICAÇÃO
+        if previous:
+            self.stats['total_duplicates'] += 1
+            return False
         
-        return False
+        self._enqueue(normalized_url, depth, priority)
+        self.stats['total_found'] += 1
+        return True
     
-    def _register_url(self, normalized_url):
-        """Registra URL nas estruturas de controle"""
-        self.normalized_urls.add(normalized_url)
+    def _enqueue(self, normalized_url, depth, priority=False):
+        self.urls_to_process.append((normalized_url, depth))
+    
+    def _is_duplicate(self, normalized_url):
+        """🔥 URL já descoberta ou processada (um lookup de fingerprint)"""
+        return url_fingerprint(normalized_url) in self.seen_urls
+    
+    def _claim_url(self, url):
+        """Marca URL como processada; False se já tinha sido processada"""
+        fingerprint = url_fingerprint(url)
+        if self.seen_urls.get_state(fingerprint) == URL_PROCESSED:
+            return False
         
-        # Adiciona hash para detecção extra
-        url_hash = hashlib.md5(normalized_url.encode()).hexdigest()
-        self.url_hashes.add(url_hash)
+        self.seen_urls.set_state(fingerprint, URL_PROCESSED)
+        self.processed_count += 1
+        return True
     
     def get_next_url(self):
         """🔥 CORREÇÃO: Pega próxima URL com verificação final"""
-        if self.urls_to_process:
+        while self.urls_to_process:
             url, depth = self.urls_to_process.popleft()
             
             # Verificação final antes de processar
-            if url in self.processed_urls:
-                return self.get_next_url()  # Recursiva para pegar próxima
-            
-            self.processed_urls.add(url)
-            self.stats['total_processed'] += 1
-            return url, depth
+            if self._claim_url(url):
+                self.stats['total_processed'] += 1
+                return url, depth
         return None, None
     
     def has_urls_to_process(self):
@@ -267,13 +300,24 @@ class URLManager:
         """Marca URL como processada"""
         normalized_url = self.normalize_url(url)
         if normalized_url:
-            self.processed_urls.add(normalized_url)
+            self._claim_url(normalized_url)
+    
+    def restore_processed(self, url):
+        """♻️ Registra URL concluída num crawl anterior (resume pelo journal)"""
+        normalized_url = self.normalize_url(url)
+        if not normalized_url:
+            return
+        
+        if not self._is_duplicate(normalized_url):
+            self.stats['total_found'] += 1
+        if self._claim_url(normalized_url):
+            self.stats['total_processed'] += 1
     
     def is_processed(self, url):
         """Verifica se URL já foi processada"""
         normalized_url = self.normalize_url(url)
         if normalized_url:
-            return normalized_url in self.processed_urls
+            return self.seen_urls.get_state(url_fingerprint(normalized_url)) == URL_PROCESSED
         return False
     
     def get_queue_size(self):
@@ -282,7 +326,7 @@ class URLManager:
     
     def get_processed_count(self):
         """Retorna número de URLs processadas"""
-        return len(self.processed_urls)
+        return self.processed_count
     
     def _log_filter(self, reason, url, details):
         """Registra URL filtrada"""
@@ -311,10 +355,12 @@ class URLManager:
                 self.stats['total_processed'] / max(self.stats['total_found'], 1) * 100
             ),
             'deduplication_info': {  # 🆕 Info de deduplicação
-                'normalized_urls': len(self.normalized_urls),
-                'processed_urls': len(self.processed_urls),
-                'url_hashes': len(self.url_hashes)
-            }
+                'fingerprints': len(self.seen_urls),
+                'processed_urls': self.processed_count,
+                'memory_bytes': self.seen_urls.memory_bytes(),
+                'bloom_filter': self.seen_urls.bloom is not None
+            },
+            'normalize_cache': self.get_normalize_cache_stats()
         }
     
     def get_filtered_urls(self, reason=None):
@@ -329,9 +375,9 @@ class URLManager:
     
     def reset(self):
         """🔥 Reset completo incluindo estruturas de deduplicação"""
-        self.processed_urls.clear()
-        self.normalized_urls.clear()
-        self.url_hashes.clear()
+        self.seen_urls.clear()
+        self.processed_count = 0
+        self.clear_normalize_cache()
         self.urls_to_process.clear()
         self.filtered_urls.clear()
         self.stats = {
@@ -349,8 +395,8 @@ class SmartURLManager(URLManager):
     def __init__(self, base_domain=None, config=None):
         super().__init__(base_domain, config)
         self.priority_patterns = config.get('priority_patterns', []) if config else []
-        self.priority_queue = deque()
-        self.normal_queue = deque()
+        self.priority_queue = self._create_frontier()
+        self.normal_queue = self._create_frontier()
     
     def add_url(self, url, depth=0, base_url=None, priority=False):
         """Adiciona URL com sistema de prioridade"""
@@ -359,45 +405,33 @@ class SmartURLManager(URLManager):
         if not normalized_url:
             return False
         
-        if self._is_duplicate(normalized_url):
-            self.stats['total_duplicates'] += 1
-            return False
-        
-        if not self.is_url_relevant(normalized_url):
-            return False
-        
+        return self._add_normalized(normalized_url, depth, url_fingerprint(normalized_url), priority)
+    
+    def _enqueue(self, normalized_url, depth, priority=False):
         # Determina prioridade
         if not priority and self.priority_patterns:
             priority = any(pattern in normalized_url.lower() 
                           for pattern in self.priority_patterns)
         
-        # Registra URL
-        self._register_url(normalized_url)
-        
         # Adiciona na fila apropriada
         if priority:
             self.priority_queue.append((normalized_url, depth))
         else:
             self.normal_queue.append((normalized_url, depth))
-        
-        self.stats['total_found'] += 1
-        return True
     
     def get_next_url(self):
         """Pega próxima URL priorizando fila de prioridade"""
         # Primeiro, verifica fila de prioridade
         if self.priority_queue:
             url, depth = self.priority_queue.popleft()
-            if url not in self.processed_urls:
-                self.processed_urls.add(url)
+            if self._claim_url(url):
                 self.stats['total_processed'] += 1
                 return url, depth
         
         # Depois, fila normal
         if self.normal_queue:
             url, depth = self.normal_queue.popleft()
-            if url not in self.processed_urls:
-                self.processed_urls.add(url)
+            if self._claim_url(url):
                 self.stats['total_processed'] += 1
                 return url, depth
         
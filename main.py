@@ -13,6 +13,7 @@ Integra TODOS os analyzers:
     python main.py                    # URL padrão
     python main.py --url https://exemplo.com
     python main.py --max-urls 500     # Análise rápida
+    python main.py --crawler async --concurrency 300   # Sites grandes
 """
 
 import argparse
@@ -22,12 +23,19 @@ from urllib.parse import urlparse
 from datetime import datetime
 
 # Imports dos módulos modularizados
-from config.settings import get_config, DEFAULT_URL, MAX_URLS_DEFAULT, MAX_THREADS_DEFAULT
+from config.settings import (
+    get_config, DEFAULT_URL, MAX_URLS_DEFAULT, MAX_THREADS_DEFAULT, MAX_CONCURRENCY_DEFAULT,
+    HTTP_CACHE_TTL_HOURS, CONNECTION_TIMEOUT, READ_TIMEOUT, MAX_BODY_MB
+)
 from core.crawler import create_crawler
+from core.parser_backend import PARSER_BACKENDS, DEFAULT_PARSER_BACKEND
+from core.result_sink import PYARROW_AVAILABLE
 from analyzers.metatags_analyzer import MetatagsAnalyzer
 from analyzers.headings_analyzer import HeadingsAnalyzer
 from analyzers.status_analyzer import StatusAnalyzer
 from reports.excel_generator import create_report_generator
+from utils.stats import StatsCollector
+from utils.dom_visitor import visit_once
 from utils.constants import (
     MSG_CRAWLER_START, MSG_ANALYSIS_START, MSG_ANALYSIS_COMPLETE,
     MSG_CORRECTIONS_IMPLEMENTED, MSG_IMPROVEMENTS, MSG_NEW_CONSOLIDATED_TAB
@@ -37,6 +45,9 @@ from utils.constants import (
 class IntegratedAnalyzer:
     """🔥 Analyzer integrado que combina todos os analyzers"""
     
+    # O crawler entrega o response original junto com o soup
+    receives_response = True
+    
     def __init__(self, config=None):
         self.config = config or {}
         
@@ -45,14 +56,41 @@ class IntegratedAnalyzer:
         self.headings_analyzer = HeadingsAnalyzer(self.config)
         self.status_analyzer = StatusAnalyzer(self.config)
         
-        self.stats = {
-            'urls_processadas': 0,
-            'urls_com_erro': 0
-        }
+        self.stats = StatsCollector(['urls_processadas', 'urls_com_erro'])
     
     def analyze(self, soup, url, response=None):
         """🎯 Análise integrada completa"""
+        return self.finalize(self.analyze_page(soup, url, response), url)
+    
+    def analyze_page(self, soup, url, response=None):
+        """📄 Parte por página (sem estado): pode rodar num worker de outro processo"""
+        return visit_once(soup, lambda visitor: self.visit_page(visitor, url, response))
+    
+    def visit_page(self, visitor, url, response=None):
+        """🚶 Metatags e status inscritos no mesmo visitor: uma passada pelo DOM para os dois"""
+        finish_metatags = self.metatags_analyzer.visit_page(
+            visitor, url, head_only=getattr(response, 'body_partial', False)
+        )
+        finish_status = self.status_analyzer.visit_page(visitor, url, response)
+        
+        def finish():
+            try:
+                return {
+                    'metatags': finish_metatags(),
+                    'status': finish_status()
+                }
+            
+            except Exception as e:
+                return {'error': str(e)}
+        
+        return finish
+    
+    def finalize(self, page_data, url):
+        """🔗 Parte com estado (duplicados, stats): roda no processo principal"""
         try:
+            if 'error' in page_data:
+                raise Exception(page_data['error'])
+            
             # Resultado base
             resultado = {
                 'url': url,
@@ -60,23 +98,25 @@ class IntegratedAnalyzer:
             }
             
             # 1. ANÁLISE DE METATAGS (inclui headings internamente)
-            metatags_data = self.metatags_analyzer.analyze(soup, url)
+            metatags_data = page_data['metatags']
+            if metatags_data.get('processed'):
+                metatags_data = self.metatags_analyzer.finalize(metatags_data, url)
             resultado.update(metatags_data)
             
             # 2. ANÁLISE DE STATUS E MIXED CONTENT
-            status_data = self.status_analyzer.analyze(soup, url, response)
+            status_data = self.status_analyzer.finalize(page_data['status'], url)
             resultado.update(status_data)
             
             # 3. CONSOLIDAÇÃO FINAL
             resultado = self._consolidate_results(resultado)
             
-            self.stats['urls_processadas'] += 1
+            self.stats.incr('urls_processadas')
             
             return resultado
             
         except Exception as e:
             print(f"Erro na análise integrada de {url}: {e}")
-            self.stats['urls_com_erro'] += 1
+            self.stats.incr('urls_com_erro')
             
             return {
                 'url': url,
@@ -161,71 +201,52 @@ class IntegratedAnalyzer:
         
         return resultado
     
+    def restore(self, resultado):
+        """♻️ Reconstrói duplicados/estatísticas a partir de um resultado do journal"""
+        if 'processed' not in resultado:
+            return  # Página sem análise (erro HTTP ou não-HTML)
+        
+        if not resultado['processed']:
+            self.stats.incr('urls_com_erro')
+            return
+        
+        self.metatags_analyzer.restore(resultado)
+        self.status_analyzer.finalize(resultado, resultado['url'])
+        self.stats.incr('urls_processadas')
+    
     def get_stats(self):
         """📊 Estatísticas consolidadas"""
         metatags_stats = self.metatags_analyzer.get_stats()
         status_stats = self.status_analyzer.get_stats()
         
+        counters = self.stats.counters()
+        
         return {
-            'integrated': self.stats.copy(),
+            'integrated': counters,
             'metatags': metatags_stats,
             'status': status_stats,
             'summary': {
-                'total_urls_processadas': self.stats['urls_processadas'],
-                'total_urls_com_erro': self.stats['urls_com_erro'],
-                'success_rate': (self.stats['urls_processadas'] / max(self.stats['urls_processadas'] + self.stats['urls_com_erro'], 1)) * 100
+                'total_urls_processadas': counters['urls_processadas'],
+                'total_urls_com_erro': counters['urls_com_erro'],
+                'success_rate': (counters['urls_processadas'] / max(counters['urls_processadas'] + counters['urls_com_erro'], 1)) * 100
             }
         }
 
 
 class ModifiedCrawler:
-    """🔧 Wrapper do crawler para passar response para analyzers"""
+    """🔧 Wrapper do crawler para passar response para analyzers
+    
+    Usa o hook ``receives_response`` do SEOCrawler: o response e o soup da
+    requisição original são entregues ao IntegratedAnalyzer, sem GET/parse extra.
+    """
     
     def __init__(self, crawler, integrated_analyzer):
         self.crawler = crawler
         self.integrated_analyzer = integrated_analyzer
     
     def crawl(self, start_url, max_urls=None, analyzers=None):
-        """🔥 Crawl modificado que passa response para analyzers"""
-        
-        # Substitui o método _process_single_url do crawler
-        original_process = self.crawler._process_single_url
-        
-        def modified_process_single_url(url, depth, analyzers_ignored):
-            # Chama o processo original para obter response
-            result = original_process(url, depth, [])  # Sem analyzers no original
-            
-            # Se foi bem-sucedido, faz nossa análise integrada
-            if result.get('status_code') == 200 and 'text/html' in result.get('content_type', '').lower():
-                try:
-                    # Faz nova requisição para obter soup
-                    response = self.crawler.session_manager.get(url)
-                    
-                    if response.status_code == 200:
-                        from bs4 import BeautifulSoup
-                        soup = BeautifulSoup(response.text, 'html.parser')
-                        
-                        # Análise integrada com soup, url E response
-                        analysis_result = self.integrated_analyzer.analyze(soup, url, response)
-                        
-                        # Merge com resultado original
-                        result.update(analysis_result)
-                
-                except Exception as e:
-                    print(f"Erro na análise integrada de {url}: {e}")
-                    result['analysis_error'] = str(e)
-            
-            return result
-        
-        # Substitui método temporariamente
-        self.crawler._process_single_url = modified_process_single_url
-        
-        # Executa crawl
-        try:
-            return self.crawler.crawl(start_url, max_urls, [])  # Sem analyzers externos
-        finally:
-            # Restaura método original
-            self.crawler._process_single_url = original_process
+        """🔥 Crawl com análise integrada sobre o response original"""
+        return self.crawler.crawl(start_url, max_urls, [self.integrated_analyzer])
 
 
 def parse_arguments():
@@ -280,11 +301,178 @@ def parse_arguments():
         help=f'Número de threads para crawling (padrão: {MAX_THREADS_DEFAULT})'
     )
     
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=MAX_CONCURRENCY_DEFAULT,
+        help=f'Requisições simultâneas no crawler async (padrão: {MAX_CONCURRENCY_DEFAULT})'
+    )
+    
+    parser.add_argument(
+        '--parse-processes',
+        type=int,
+        default=0,
+        help='Processos para parse/análise separados das threads de rede (padrão: 0 = desativado)'
+    )
+    
+    parser.add_argument(
+        '--frontier-memory',
+        type=int,
+        default=0,
+        help='URLs da fila mantidas em memória; o excedente vai para disco (padrão: 0 = tudo em memória)'
+    )
+    
+    parser.add_argument(
+        '--journal',
+        type=str,
+        default=None,
+        help='Arquivo de journal do crawl (checkpoint), permite retomar com --resume'
+    )
+    
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Retoma o crawl interrompido a partir do arquivo de --journal'
+    )
+    
+    parser.add_argument(
+        '--sink',
+        choices=['memory', 'jsonl', 'sqlite', 'parquet'],
+        default='memory',
+        help='Onde guardar os resultados durante o crawl (padrão: memory; os demais gravam em disco). O relatório Excel ainda carrega todos os resultados'
+    )
+    
+    parser.add_argument(
+        '--sink-path',
+        type=str,
+        default=None,
+        help='Arquivo do sink de resultados (padrão: <output>/crawl_results_<timestamp>.<ext>)'
+    )
+    
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='Usa o cache HTTP em disco: páginas já baixadas não tocam a rede (reexecutar relatórios/regras)'
+    )
+    
+    parser.add_argument(
+        '--cache-ttl',
+        type=float,
+        default=HTTP_CACHE_TTL_HOURS,
+        help=f'Validade das páginas no cache, em horas (padrão: {HTTP_CACHE_TTL_HOURS})'
+    )
+    
+    parser.add_argument(
+        '--revalidate',
+        action='store_true',
+        help='GET condicional (ETag/Last-Modified): páginas inalteradas desde o último crawl reaproveitam a análise'
+    )
+    
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Recrawl incremental: páginas com o mesmo hash de conteúdo do último crawl não são re-analisadas'
+    )
+    
+    parser.add_argument(
+        '--retries',
+        type=int,
+        default=3,
+        help='Novas tentativas por URL em timeout/erro de conexão/429/5xx, com backoff (padrão: 3)'
+    )
+    
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=15,
+        help='Prazo total de cada página, conexão + download do corpo, em segundos (padrão: 15)'
+    )
+    
+    parser.add_argument(
+        '--connect-timeout',
+        type=float,
+        default=CONNECTION_TIMEOUT,
+        help=f'Timeout de conexão em segundos (padrão: {CONNECTION_TIMEOUT})'
+    )
+    
+    parser.add_argument(
+        '--read-timeout',
+        type=float,
+        default=READ_TIMEOUT,
+        help=f'Silêncio máximo entre dois blocos do corpo, em segundos (padrão: {READ_TIMEOUT}, limitado a --timeout)'
+    )
+    
+    parser.add_argument(
+        '--max-body-mb',
+        type=float,
+        default=MAX_BODY_MB,
+        help=f'Tamanho máximo baixado de cada página HTML, em MB; o excedente é truncado (padrão: {MAX_BODY_MB}, 0 = sem limite)'
+    )
+    
+    parser.add_argument(
+        '--parser',
+        choices=PARSER_BACKENDS,
+        default=DEFAULT_PARSER_BACKEND,
+        help=f'Backend de parse do HTML; se não estiver instalado usa o próximo disponível (padrão: {DEFAULT_PARSER_BACKEND})'
+    )
+    
+    parser.add_argument(
+        '--stream-parse',
+        action='store_true',
+        help='Monta a árvore do HTML enquanto o corpo chega; links e análise continuam após o download (não vale para --crawler async)'
+    )
+    
+    parser.add_argument(
+        '--head-only',
+        action='store_true',
+        help='Auditoria rápida de metadados: baixa cada página só até </head> e o primeiro H1 '
+             '(sem mixed content nem hierarquia de headings; links só do trecho baixado)'
+    )
+    
+    parser.add_argument(
+        '--probe',
+        action='store_true',
+        help='Sonda HEAD em URLs sem extensão que costumam servir arquivos: não-HTML não é baixado por GET'
+    )
+    
+    parser.add_argument(
+        '--time-budget',
+        type=float,
+        default=0,
+        help='Duração máxima do crawl em segundos: depois disso não agenda novas URLs e gera o relatório do que terminou (padrão: sem limite)'
+    )
+    
+    parser.add_argument(
+        '--circuit-breaker',
+        action='store_true',
+        help='Circuit breaker por host: após falhas seguidas, URLs do host falham na hora até uma prova passar'
+    )
+    
+    parser.add_argument(
+        '--rate',
+        type=float,
+        default=0,
+        help='Limite de requisições por segundo por host, com token bucket (padrão: sem limite)'
+    )
+    
+    parser.add_argument(
+        '--burst',
+        type=int,
+        default=None,
+        help='Rajada máxima do token bucket (padrão: igual a --rate)'
+    )
+    
+    parser.add_argument(
+        '--adaptive',
+        action='store_true',
+        help='Concorrência adaptativa (AIMD): ajusta as requisições em voo conforme latência e erros do servidor'
+    )
+    
     parser.add_argument(
         '--crawler',
-        choices=['default', 'smart', 'batch'],
+        choices=['default', 'smart', 'batch', 'async'],
         default='smart',
-        help='Tipo de crawler a usar (padrão: smart)'
+        help='Tipo de crawler a usar (padrão: smart; async = aiohttp, centenas de requisições)'
     )
     
     parser.add_argument(
@@ -329,6 +517,45 @@ def validate_arguments(args):
     if args.threads <= 0 or args.threads > 50:
         errors.append("❌ threads deve estar entre 1 e 50")
     
+    if args.concurrency <= 0 or args.concurrency > 2000:
+        errors.append("❌ concurrency deve estar entre 1 e 2000")
+    
+    if args.parse_processes < 0:
+        errors.append("❌ parse-processes não pode ser negativo")
+    
+    if args.frontier_memory < 0:
+        errors.append("❌ frontier-memory não pode ser negativo")
+    
+    if args.sink == 'parquet' and not PYARROW_AVAILABLE:
+        errors.append("❌ --sink parquet exige pyarrow (pip install pyarrow)")
+    
+    if args.retries < 0:
+        errors.append("❌ retries não pode ser negativo")
+    
+    if args.timeout <= 0 or args.connect_timeout <= 0 or args.read_timeout <= 0:
+        errors.append("❌ timeouts devem ser maiores que 0")
+    
+    if args.max_body_mb < 0:
+        errors.append("❌ max-body-mb não pode ser negativo")
+    
+    if args.time_budget < 0:
+        errors.append("❌ time-budget não pode ser negativo")
+    
+    if args.rate < 0:
+        errors.append("❌ rate não pode ser negativo")
+    
+    if args.burst is not None and args.burst < 1:
+        errors.append("❌ burst deve ser pelo menos 1")
+    
+    if args.cache_ttl <= 0:
+        errors.append("❌ cache-ttl deve ser maior que 0")
+    
+    if args.resume and not args.journal:
+        errors.append("❌ --resume exige --journal com o arquivo do crawl interrompido")
+    
+    if args.stream_parse and args.crawler == 'async':
+        errors.append("❌ --stream-parse não é suportado com --crawler async")
+    
     return errors
 
 
@@ -350,7 +577,31 @@ def create_config_from_args(args):
         'max_urls': args.max_urls,
         'max_depth': args.max_depth,
         'max_threads': args.threads,
-        'timeout': 15
+        'max_concurrency': args.concurrency,
+        'parse_processes': args.parse_processes,
+        'frontier_memory_urls': args.frontier_memory,
+        'journal_file': args.journal,
+        'resume': args.resume,
+        'result_sink': args.sink,
+        'result_sink_path': args.sink_path,
+        'http_cache': args.cache,
+        'http_cache_ttl_hours': args.cache_ttl,
+        'revalidate': args.revalidate,
+        'incremental': args.incremental,
+        'adaptive_concurrency': args.adaptive,
+        'max_retries': args.retries,
+        'circuit_breaker': args.circuit_breaker,
+        'requests_per_second': args.rate,
+        'rate_burst': args.burst,
+        'timeout': args.timeout,
+        'connect_timeout': args.connect_timeout,
+        'read_timeout': args.read_timeout,
+        'time_budget': args.time_budget,
+        'max_body_bytes': int(args.max_body_mb * 1024 * 1024),
+        'content_probe': args.probe,
+        'head_only': args.head_only,
+        'parser_backend': args.parser,
+        'stream_parse': args.stream_parse
     })
     
     # Configurações de saída
@@ -385,6 +636,38 @@ def print_startup_info(args):
     print(f"   📈 Max URLs: {args.max_urls:,}")
     print(f"   📏 Max profundidade: {args.max_depth}")
     print(f"   ⚡ Threads: {args.threads}")
+    if args.crawler == 'async':
+        print(f"   🌐 Concorrência async: {args.concurrency}")
+    if args.parse_processes:
+        print(f"   🧠 Processos de parse/análise: {args.parse_processes}")
+    if args.frontier_memory:
+        print(f"   🗂️ Fila em memória: {args.frontier_memory:,} URLs (excedente em disco)")
+    if args.sink != 'memory':
+        print(f"   💾 Resultados gravados em disco: {args.sink}")
+    if args.cache:
+        print(f"   🗄️ Cache HTTP em disco: ligado (validade {args.cache_ttl:g}h)")
+    if args.time_budget:
+        print(f"   ⏱️ Tempo máximo de crawl: {args.time_budget:g}s")
+    if args.parser != DEFAULT_PARSER_BACKEND:
+        print(f"   🧩 Backend de parse: {args.parser}")
+    if args.stream_parse:
+        print(f"   🌊 Árvore do HTML montada durante o download: ligado")
+    if args.head_only:
+        print(f"   ⚡ Modo head-only: só <head> e primeiro H1 de cada página")
+    if args.probe:
+        print(f"   🔎 Sonda de content-type (HEAD) em URLs ambíguas: ligada")
+    if args.circuit_breaker:
+        print(f"   ⚡ Circuit breaker por host: ligado")
+    if args.rate:
+        print(f"   🪣 Rate limit: {args.rate:g} req/s por host (burst {args.burst or max(int(args.rate), 1)})")
+    if args.adaptive:
+        print(f"   📶 Concorrência adaptativa: ligada (até {args.concurrency if args.crawler == 'async' else args.threads} em voo)")
+    if args.revalidate:
+        print(f"   🔁 Revalidação condicional: ligada (páginas 304 reaproveitam a análise)")
+    if args.incremental:
+        print(f"   🧮 Recrawl incremental: ligado (só páginas alteradas são re-analisadas)")
+    if args.journal:
+        print(f"   📒 Journal: {args.journal}{' (retomando)' if args.resume else ''}")
     print(f"   🕷️ Tipo de crawler: {args.crawler}")
     print(f"   📁 Pasta de saída: {args.output}")
     
@@ -394,6 +677,7 @@ def print_startup_info(args):
 
 def main():
     """🚀 Função principal CORRIGIDA"""
+    args = None
     try:
         # 1. Parse e validação de argumentos
         args = parse_arguments()
@@ -542,6 +826,12 @@ def main():
             if mixed_col:
                 mixed_content = len(df_principal[df_principal[mixed_col] == 'SIM'])
                 print(f"   URLs com mixed content: {mixed_content}")
+            
+            # Recrawl incremental / revalidação
+            if 'changed_since_last_run' in df_principal.columns:
+                alteradas = int((df_principal['changed_since_last_run'] == True).sum())
+                inalteradas = int((df_principal['changed_since_last_run'] == False).sum())
+                print(f"   Alteradas desde o último crawl: {alteradas} (inalteradas: {inalteradas})")
         
         # 10. Informações finais
         print("\n🎯 ANÁLISE INTEGRADA CONCLUÍDA COM SUCESSO!")
@@ -558,6 +848,8 @@ def main():
         
     except KeyboardInterrupt:
         print("\n⚠️ Análise interrompida pelo usuário")
+        if args and args.journal:
+            print(f"   📒 Para continuar: --journal {args.journal} --resume")
         sys.exit(0)
         
     except Exception as e:
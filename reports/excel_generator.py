@@ -7,6 +7,11 @@ import os
 from utils.constants import MSG_REPORT_GENERATED, MSG_NO_RESULTS, MSG_ERROR_EXCEL
 
 
+# Resultados convertidos por vez ao ler de um result sink em disco (a leitura é
+# em blocos, mas o DataFrame final tem todas as páginas: ver _build_dataframe)
+REPORT_CHUNK_SIZE = 5000
+
+
 class ExcelReportGenerator:
     """🔥 Gerador Excel CORRIGIDO - resolve bug do Excel vazio"""
     
@@ -25,7 +30,7 @@ class ExcelReportGenerator:
 
         # 🔥 CORREÇÃO 1: Converte resultados para DataFrame ANTES do ExcelWriter
         try:
-            df_main = pd.DataFrame(results)
+            df_main = self._build_dataframe(results)
             print(f"✅ DataFrame criado com {len(df_main)} linhas e {len(df_main.columns)} colunas")
             
             # Debug: mostra primeiras colunas
@@ -149,6 +154,14 @@ class ExcelReportGenerator:
                     abas_criadas += 1
                     print(f"✅ Aba resumo: {len(aba_resumo)} linhas")
                 
+                # Aba de páginas alteradas desde o último crawl (recrawl incremental)
+                aba_alteracoes = self._aba_alteracoes(df_main)
+                if not aba_alteracoes.empty:
+                    aba_alteracoes.to_excel(writer, sheet_name="🆕_Alteradas_Ultimo_Crawl", index=False)
+                    self._ajustar_colunas(writer, aba_alteracoes, "🆕_Alteradas_Ultimo_Crawl")
+                    abas_criadas += 1
+                    print(f"✅ Aba alteradas desde o último crawl: {len(aba_alteracoes)} linhas")
+                
                 # Aba mixed content (se disponível)
                 if 'mixed_content_resources' in df_main.columns or 'Has_Mixed_Content' in df_main.columns:
                     aba_mixed = self._aba_mixed(df_main)
@@ -191,6 +204,31 @@ class ExcelReportGenerator:
             
             return None, None
 
+    def _build_dataframe(self, results):
+        """DataFrame principal; sinks em disco são lidos em blocos (sem lista de dicts inteira)
+        
+        A memória do relatório continua O(N): os blocos são concatenados num
+        DataFrame com todas as páginas, porque as abas de duplicados, ranking
+        e resumo comparam páginas entre si. O sink só evita a lista de dicts
+        do crawl ao lado dele.
+        """
+        if isinstance(results, list):
+            return pd.DataFrame(results)
+        
+        chunks = []
+        chunk = []
+        for result in results:
+            chunk.append(result)
+            if len(chunk) >= REPORT_CHUNK_SIZE:
+                chunks.append(pd.DataFrame(chunk))
+                chunk = []
+        if chunk:
+            chunks.append(pd.DataFrame(chunk))
+        
+        if not chunks:
+            return pd.DataFrame()
+        return pd.concat(chunks, ignore_index=True, sort=False)
+    
     def _ajustar_colunas(self, writer, df, aba_nome):
         """🔧 Ajusta largura das colunas automaticamente"""
         try:
@@ -660,6 +698,13 @@ class ExcelReportGenerator:
                 for level, count in df['risk_level'].value_counts().items():
                     resumo_data.append({'📊 Métrica': f'URLs risco {level}', 'Valor': int(count)})
             
+            # Recrawl incremental / revalidação
+            if 'changed_since_last_run' in df.columns:
+                alteradas = int((df['changed_since_last_run'] == True).sum())
+                inalteradas = int((df['changed_since_last_run'] == False).sum())
+                resumo_data.append({'📊 Métrica': 'URLs alteradas desde o último crawl', 'Valor': alteradas})
+                resumo_data.append({'📊 Métrica': 'URLs inalteradas (análise reaproveitada)', 'Valor': inalteradas})
+            
             # Score médio
             if 'Metatags_Score' in df.columns:
                 score_medio = df['Metatags_Score'].mean()
@@ -671,6 +716,29 @@ class ExcelReportGenerator:
             print(f"⚠️ Erro gerando aba resumo: {e}")
             return pd.DataFrame()
 
+    def _aba_alteracoes(self, df):
+        """🆕 Gera aba de URLs alteradas desde o último crawl (só com --incremental/--revalidate)"""
+        try:
+            if 'changed_since_last_run' not in df.columns:
+                return pd.DataFrame()
+            
+            alteradas = df[df['changed_since_last_run'] == True]
+            
+            colunas_alteracoes = ['URL', 'Status_Code', 'Title', 'Metatags_Score', 'content_hash']
+            colunas_existentes = [col for col in colunas_alteracoes if col in df.columns]
+            
+            return alteradas[colunas_existentes].rename(columns={
+                'URL': '🔗 URL',
+                'Status_Code': 'Status',
+                'Title': 'Title',
+                'Metatags_Score': '🎯 Score',
+                'content_hash': 'Hash do Conteúdo'
+            })
+            
+        except Exception as e:
+            print(f"⚠️ Erro gerando aba alteradas: {e}")
+            return pd.DataFrame()
+
     def _aba_mixed(self, df):
         """🔒 Gera aba de mixed content"""
         try:
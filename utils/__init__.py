@@ -8,6 +8,8 @@ from .constants import (
     GRAVITY_CRITICAL, GRAVITY_MEDIUM, GRAVITY_LOW,
     PROBLEM_TYPE_EMPTY, PROBLEM_TYPE_HIDDEN
 )
+from .stats import StatsCollector
+from .dom_visitor import DOMVisitor, visit_once
 
 __all__ = [
     'SHEET_NAMES',
@@ -28,5 +30,8 @@ __all__ = [
     'GRAVITY_MEDIUM',
     'GRAVITY_LOW',
     'PROBLEM_TYPE_EMPTY',
-    'PROBLEM_TYPE_HIDDEN'
+    'PROBLEM_TYPE_HIDDEN',
+    'StatsCollector',
+    'DOMVisitor',
+    'visit_once'
 ]
\ No newline at end of file
@@ -8,6 +8,9 @@
 MSG_CRAWLER_START = "🎯 Crawler ULTRA CORRIGIDO iniciado para: {domain}"
 MSG_ANALYSIS_START = "🏷️ Analisador ULTRA de metatags CORRIGIDO iniciado para: {domain}"
 MSG_PROCESSING_BATCH = "🔄 Processando {batch_size} URLs... (total: {current}/{max_urls})"
+MSG_CRAWL_PROGRESS = "🔄 Processadas {current}/{max_urls} URLs ({in_flight} em andamento, fila: {queue})"
+MSG_JOURNAL_RESUMED = "♻️ Retomando crawl do journal {path}: {done} URLs já concluídas, {pending} na fila"
+MSG_TIME_BUDGET_EXHAUSTED = "⏱️ Tempo de crawl esgotado ({budget:g}s): {done} URLs concluídas, {queue} ficam na fila - terminando as em andamento"
 
 # Mensagens de conclusão
 MSG_CRAWL_COMPLETE = "✅ Crawl ULTRA concluído: {total_urls} URLs encontradas"
@@ -0,0 +1,126 @@
+# utils/dom_visitor.py - Uma única passada pelo DOM para todos os analyzers
+
+"""
+🚶 Visitor de passada única sobre o soup
+
+Cada ``find``/``find_all`` do BeautifulSoup percorre a árvore inteira; somando
+headings, metatags, mixed content e links eram ~20 passadas por página. Com o
+visitor, cada interessado registra os elementos que quer (nomes de tag e/ou
+atributos) antes da passada, ``walk`` percorre o documento uma vez e entrega
+a cada inscrição só os elementos que casam com ela, em ordem do documento.
+
+A semântica de uma inscrição é a de ``find_all``:
+- ``tags``: nome do elemento em ``tags`` (``find_all(['h1', 'h2'])``)
+- ``attrs``: elemento com algum desses atributos (``find_all(style=True)``)
+- os dois juntos: nome e atributo (``find_all('img', src=True)``)
+
+Uso:
+    visitor = DOMVisitor()
+    images = visitor.collect(tags=('img',), attrs=('src',))
+    visitor.subscribe(handler, tags=('h1',))
+    visitor.walk(soup)
+"""
+
+from bs4 import Tag
+
+
+class DOMVisitor:
+    """Distribui os elementos do soup às inscrições numa única passada"""
+
+    def __init__(self):
+        self._by_tag = {}          # nome -> [(attrs, handler)]
+        self._any_tag = []         # [(attrs, handler)] inscrições só por atributo
+
+    def subscribe(self, handler, tags=None, attrs=None):
+        """``handler(element)`` para cada elemento que casa com ``tags``/``attrs``"""
+        if not tags and not attrs:
+            raise ValueError("Inscrição precisa de tags e/ou atributos")
+
+        attrs = frozenset(attrs) if attrs else None
+        if not tags:
+            self._any_tag.append((attrs, handler))
+            return
+
+        for name in tags:
+            self._by_tag.setdefault(name, []).append((attrs, handler))
+
+    def collect(self, tags=None, attrs=None):
+        """Lista preenchida por ``walk`` com os elementos que casam, em ordem do documento"""
+        elements = []
+        self.subscribe(elements.append, tags, attrs)
+        return elements
+
+    def walk(self, root):
+        by_tag = self._by_tag
+        any_tag = self._any_tag
+
+        for element in root.descendants:
+            if not isinstance(element, Tag):
+                continue
+
+            for attrs, handler in by_tag.get(element.name, ()):
+                if attrs is None or not attrs.isdisjoint(element.attrs):
+                    handler(element)
+
+            if any_tag and element.attrs:
+                for attrs, handler in any_tag:
+                    if not attrs.isdisjoint(element.attrs):
+                        handler(element)
+
+
+def visit_once(soup, register):
+    """Passada só para um analyzer: ``register(visitor)`` devolve a função que monta o resultado"""
+    visitor = DOMVisitor()
+    finish = register(visitor)
+    visitor.walk(soup)
+    return finish()
+
+
+def attr_matches(element, attr, value):
+    """Mesmo critério de ``find(attrs={attr: value})`` (atributos multivalorados como ``rel``)"""
+    current = element.get(attr)
+    if isinstance(current, list):
+        return value in current or ' '.join(current) == value
+    return current == value
+
+
+def first_with_attr(elements, attr, value):
+    """Primeiro elemento coletado com ``attr == value``, ou None"""
+    for element in elements:
+        if attr_matches(element, attr, value):
+            return element
+    return None
+
+
+def test_dom_visitor():
+    """🧪 Uma passada deve coletar o mesmo que os find_all equivalentes"""
+    from core.parser_backend import parse_html, resolve_parser_backend
+
+    print("🧪 Testando DOMVisitor...")
+    html = ('<html><head><title>T</title><link rel="canonical stylesheet" href="/c">'
+            '<meta name="description" content="d"></head><body style="x">'
+            '<h1>A</h1><img src="a.png"><img alt="sem src"><h2 style="color:red">B</h2>'
+            '<a href="/1">1</a><a>sem href</a><div><a href="/2" style="y">2</a></div></body></html>')
+    soup = parse_html(html, resolve_parser_backend())
+
+    visitor = DOMVisitor()
+    headings = visitor.collect(tags=('h1', 'h2'))
+    images = visitor.collect(tags=('img',), attrs=('src',))
+    styled = visitor.collect(attrs=('style',))
+    anchors = visitor.collect(tags=('a',), attrs=('href',))
+    links = visitor.collect(tags=('link',))
+    visitor.walk(soup)
+
+    same = (
+        headings == soup.find_all(['h1', 'h2']) and
+        images == soup.find_all('img', src=True) and
+        styled == soup.find_all(style=True) and
+        anchors == soup.find_all('a', href=True) and
+        first_with_attr(links, 'rel', 'canonical') is soup.find('link', attrs={'rel': 'canonical'})
+    )
+    print(f"  headings: {len(headings)} | imgs com src: {len(images)} | style: {len(styled)} | links: {len(anchors)}")
+    print(f"  {'✅ OK' if same else '❌ diferente de find_all'}")
+
+
+if __name__ == "__main__":
+    test_dom_visitor()
@@ -0,0 +1,205 @@
+# utils/stats.py - Estatísticas thread-safe sem lock no caminho quente
+
+"""
+📊 Contadores, gauges e histogramas de latência para uso com muitas threads
+
+Cada thread escreve só no seu próprio shard (sem lock, sem disputa); a
+leitura soma os shards. O lock só é usado quando uma thread nova cria seu
+shard, então ``incr``/``observe`` custam o mesmo que um ``+=`` num dict.
+
+Uso:
+    stats = StatsCollector(['requests_made', 'failed_requests'])
+    stats.incr('requests_made')
+    stats.observe('response_time_ms', 123.4)
+    stats['requests_made']                     # valor consolidado
+    stats.histogram('response_time_ms')        # count, avg, p50, p90, p99...
+"""
+
+import threading
+from bisect import bisect_left
+
+
+# Limites superiores (ms) dos buckets dos histogramas de latência
+LATENCY_BUCKETS_MS = [
+    1, 2, 5, 10, 20, 50, 100, 200, 300, 500, 750,
+    1000, 1500, 2000, 3000, 5000, 10000, 15000, 30000, 60000
+]
+
+
+class StatsCollector:
+    """Contadores/gauges/histogramas com shards por thread, consolidados na leitura"""
+
+    def __init__(self, counters=None, buckets=None):
+        self.counter_names = list(counters or [])
+        self.buckets = buckets or LATENCY_BUCKETS_MS
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._generation = 0
+        self._shards = []
+        self._gauges = {}
+
+    def __getstate__(self):
+        """Pickle (ex.: analyzers enviados aos processos de parse): sem lock nem thread-local"""
+        state = self.__dict__.copy()
+        del state['_lock'], state['_local']
+        state['_shards'] = self._current_shards()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None or shard['generation'] != self._generation:
+            shard = {
+                'generation': self._generation,
+                'counters': dict.fromkeys(self.counter_names, 0),
+                'histograms': {}
+            }
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    # ========================
+    # ✍️ ESCRITA (caminho quente)
+    # ========================
+
+    def incr(self, name, value=1):
+        counters = self._shard()['counters']
+        counters[name] = counters.get(name, 0) + value
+
+    def observe(self, name, value):
+        """Registra uma amostra (ex.: latência em ms) no histograma ``name``"""
+        histograms = self._shard()['histograms']
+        hist = histograms.get(name)
+        if hist is None:
+            hist = {
+                'count': 0, 'sum': 0.0, 'min': value, 'max': value,
+                'buckets': [0] * (len(self.buckets) + 1)
+            }
+            histograms[name] = hist
+
+        hist['buckets'][bisect_left(self.buckets, value)] += 1
+        hist['count'] += 1
+        hist['sum'] += value
+        if value < hist['min']:
+            hist['min'] = value
+        if value > hist['max']:
+            hist['max'] = value
+
+    def set_gauge(self, name, value):
+        # Atribuição simples: o último valor escrito vale
+        self._gauges[name] = value
+
+    # ========================
+    # 📖 LEITURA (consolida os shards)
+    # ========================
+
+    def _current_shards(self):
+        with self._lock:
+            return [s for s in self._shards if s['generation'] == self._generation]
+
+    def __getitem__(self, name):
+        if name in self._gauges:
+            return self._gauges[name]
+        return sum(shard['counters'].get(name, 0) for shard in self._current_shards())
+
+    def get(self, name, default=0):
+        return self.copy().get(name, default)
+
+    def counters(self):
+        merged = dict.fromkeys(self.counter_names, 0)
+        for shard in self._current_shards():
+            # dict.copy() é atômico no CPython: não quebra se o dono escrever ao mesmo tempo
+            for name, value in shard['counters'].copy().items():
+                merged[name] = merged.get(name, 0) + value
+        return merged
+
+    def gauges(self):
+        return self._gauges.copy()
+
+    def copy(self):
+        """Snapshot plano (contadores + gauges), compatível com o antigo ``stats.copy()``"""
+        snapshot = self.counters()
+        snapshot.update(self._gauges)
+        return snapshot
+
+    def histogram(self, name):
+        """Resumo do histograma: count, avg, min, max e percentis (limite do bucket)"""
+        count = 0
+        total = 0.0
+        minimum = None
+        maximum = None
+        buckets = [0] * (len(self.buckets) + 1)
+
+        for shard in self._current_shards():
+            hist = shard['histograms'].get(name)
+            if not hist:
+                continue
+            hist = dict(hist, buckets=list(hist['buckets']))
+            count += hist['count']
+            total += hist['sum']
+            minimum = hist['min'] if minimum is None else min(minimum, hist['min'])
+            maximum = hist['max'] if maximum is None else max(maximum, hist['max'])
+            for i, bucket_count in enumerate(hist['buckets']):
+                buckets[i] += bucket_count
+
+        summary = {
+            'count': count,
+            'sum': round(total, 2),
+            'avg': round(total / count, 2) if count else 0,
+            'min': round(minimum, 2) if minimum is not None else 0,
+            'max': round(maximum, 2) if maximum is not None else 0
+        }
+        for label, percentile in (('p50', 0.50), ('p90', 0.90), ('p99', 0.99)):
+            summary[label] = self._percentile(buckets, count, percentile, maximum)
+
+        return summary
+
+    def _percentile(self, buckets, count, percentile, maximum):
+        if not count:
+            return 0
+
+        target = percentile * count
+        seen = 0
+        for i, bucket_count in enumerate(buckets):
+            seen += bucket_count
+            if seen >= target:
+                upper = self.buckets[i] if i < len(self.buckets) else maximum
+                return round(min(upper, maximum), 2)
+        return round(maximum, 2)
+
+    def reset(self):
+        with self._lock:
+            self._generation += 1
+            self._shards = []
+        self._gauges = {}
+
+
+def test_stats_collector(threads=25, increments=20000):
+    """🧪 Verifica que contadores não perdem incrementos com muitas threads"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    print(f"🧪 Testando StatsCollector com {threads} threads...")
+    stats = StatsCollector(['hits'])
+
+    def work(worker_id):
+        for i in range(increments):
+            stats.incr('hits')
+            stats.observe('latency_ms', (i % 500) + worker_id)
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(work, range(threads)))
+
+    expected = threads * increments
+    print(f"  hits: {stats['hits']} (esperado: {expected})")
+    print(f"  latency_ms: {stats.histogram('latency_ms')}")
+    print(f"  {'✅ OK' if stats['hits'] == expected else '❌ contagem incorreta'}")
+
+
+if __name__ == "__main__":
+    test_stats_collector()